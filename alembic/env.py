@@ -43,6 +43,16 @@ if config.config_file_name is not None:
 # The metadata object from your Base (for autogenerate)
 target_metadata = Base.metadata
 
+# Database-managed objects that are intentionally not mapped on the models;
+# without this, autogenerate would emit drops for them.
+UNMAPPED_OBJECTS = {"search_vector", "ix_offerings_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if reflected and compare_to is None and name in UNMAPPED_OBJECTS:
+        return False
+    return True
+
 # --------------------------------------------------------
 # Offline migrations
 # --------------------------------------------------------
@@ -54,6 +64,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -74,6 +85,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""add name keyset indexes
+
+Revision ID: a6d1c5e9b284
+Revises: f3b9d2e6a017
+Create Date: 2025-12-03 10:21:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d1c5e9b284'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d2e6a017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_offerings_name', 'offerings', ['offering_name', 'offering_id'], unique=False)
+    op.create_index('ix_offerings_product_name', 'offerings', ['product_id', 'offering_name', 'offering_id'], unique=False)
+    op.create_index('ix_products_name', 'products', ['product_name', 'product_id'], unique=False)
+    op.create_index('ix_products_brand_name', 'products', ['brand_id', 'product_name', 'product_id'], unique=False)
+    op.create_index('ix_activities_name', 'activities', ['activity_name', 'activity_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_activities_name', table_name='activities')
+    op.drop_index('ix_products_brand_name', table_name='products')
+    op.drop_index('ix_products_name', table_name='products')
+    op.drop_index('ix_offerings_product_name', table_name='offerings')
+    op.drop_index('ix_offerings_name', table_name='offerings')
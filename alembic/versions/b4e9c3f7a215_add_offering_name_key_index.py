@@ -0,0 +1,33 @@
+"""add offering name key index
+
+Revision ID: b4e9c3f7a215
+Revises: e5c1a7b93d24
+Create Date: 2025-12-12 11:27:04.316952
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e9c3f7a215'
+down_revision: Union[str, Sequence[str], None] = 'e5c1a7b93d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset for search results sorted by name; must match _name_key in app/crud/offering.py
+    if op.get_bind().dialect.name == "postgresql":
+        name_key = sa.text('lower(offering_name) COLLATE "C"')
+    else:
+        name_key = sa.text('lower(offering_name)')
+    op.create_index('ix_offerings_name_key', 'offerings', [name_key, 'offering_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_offerings_name_key', table_name='offerings')
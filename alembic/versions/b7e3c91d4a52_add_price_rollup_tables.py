@@ -0,0 +1,49 @@
+"""add price rollup tables
+
+Revision ID: b7e3c91d4a52
+Revises: 70de9e06c549
+Create Date: 2025-11-24 10:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c91d4a52'
+down_revision: Union[str, Sequence[str], None] = '70de9e06c549'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('activity_price_rollups',
+    sa.Column('activity_id', sa.UUID(), nullable=False),
+    sa.Column('total_hours', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('total_sale_price', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('unpriced_rows', sa.Integer(), nullable=False),
+    sa.Column('updated_on', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['activity_id'], ['activities.activity_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('activity_id')
+    )
+    op.create_table('offering_price_rollups',
+    sa.Column('offering_id', sa.UUID(), nullable=False),
+    sa.Column('total_hours', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('total_sale_price', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.Column('unpriced_rows', sa.Integer(), nullable=False),
+    sa.Column('updated_on', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['offering_id'], ['offerings.offering_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('offering_id')
+    )
+    # Rollups are populated by POST /admin/pricing-rollups/rebuild after upgrading
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('offering_price_rollups')
+    op.drop_table('activity_price_rollups')
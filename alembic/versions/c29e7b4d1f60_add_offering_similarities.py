@@ -0,0 +1,40 @@
+"""add offering similarities
+
+Revision ID: c29e7b4d1f60
+Revises: a6d1c5e9b284
+Create Date: 2025-12-05 11:48:03.264930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c29e7b4d1f60'
+down_revision: Union[str, Sequence[str], None] = 'a6d1c5e9b284'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('offering_similarities',
+    sa.Column('offering_id', sa.UUID(), nullable=False),
+    sa.Column('similar_offering_id', sa.UUID(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('updated_on', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['offering_id'], ['offerings.offering_id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['similar_offering_id'], ['offerings.offering_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('offering_id', 'similar_offering_id')
+    )
+    op.create_index('ix_offering_similarities_rank', 'offering_similarities', ['offering_id', 'rank'], unique=False)
+    # Populated by POST /admin/similarity-jobs after upgrading
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_offering_similarities_rank', table_name='offering_similarities')
+    op.drop_table('offering_similarities')
@@ -0,0 +1,28 @@
+"""add staffing rate key index
+
+Revision ID: d41a8f6e2c19
+Revises: b7e3c91d4a52
+Create Date: 2025-11-25 09:41:07.226513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a8f6e2c19'
+down_revision: Union[str, Sequence[str], None] = 'b7e3c91d4a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_staffing_details_rate_key', 'staffing_details', ['country', 'role', 'band'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_staffing_details_rate_key', table_name='staffing_details')
@@ -0,0 +1,40 @@
+"""add offering rollup activity count
+
+Revision ID: d8a4f2c6e913
+Revises: c29e7b4d1f60
+Create Date: 2025-12-08 14:22:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4f2c6e913'
+down_revision: Union[str, Sequence[str], None] = 'c29e7b4d1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('offering_price_rollups', sa.Column('activity_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE offering_price_rollups SET activity_count = ("
+        "SELECT count(*) FROM offering_activities "
+        "WHERE offering_activities.offering_id = offering_price_rollups.offering_id)"
+    )
+    op.create_index('ix_offering_price_rollups_sale_price', 'offering_price_rollups', ['total_sale_price', 'offering_id'], unique=False)
+    op.create_index('ix_offering_price_rollups_hours', 'offering_price_rollups', ['total_hours', 'offering_id'], unique=False)
+    op.create_index('ix_offering_price_rollups_activity_count', 'offering_price_rollups', ['activity_count', 'offering_id'], unique=False)
+    # Offerings without a rollup row are added by POST /admin/pricing-rollups/rebuild
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_offering_price_rollups_activity_count', table_name='offering_price_rollups')
+    op.drop_index('ix_offering_price_rollups_hours', table_name='offering_price_rollups')
+    op.drop_index('ix_offering_price_rollups_sale_price', table_name='offering_price_rollups')
+    op.drop_column('offering_price_rollups', 'activity_count')
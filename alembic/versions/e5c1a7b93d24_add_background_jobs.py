@@ -0,0 +1,43 @@
+"""add background jobs
+
+Revision ID: e5c1a7b93d24
+Revises: d8a4f2c6e913
+Create Date: 2025-12-10 09:41:15.802317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1a7b93d24'
+down_revision: Union[str, Sequence[str], None] = 'd8a4f2c6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('background_jobs',
+    sa.Column('job_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(length=100), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('submitted_on', sa.TIMESTAMP(), nullable=False),
+    sa.Column('started_on', sa.TIMESTAMP(), nullable=True),
+    sa.Column('finished_on', sa.TIMESTAMP(), nullable=True),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_background_jobs_submitted_on', 'background_jobs', ['submitted_on'], unique=False)
+    op.create_index('ix_background_jobs_kind_submitted_on', 'background_jobs', ['kind', 'submitted_on'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_background_jobs_kind_submitted_on', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_submitted_on', table_name='background_jobs')
+    op.drop_table('background_jobs')
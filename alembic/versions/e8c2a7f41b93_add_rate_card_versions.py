@@ -0,0 +1,48 @@
+"""add rate card versions
+
+Revision ID: e8c2a7f41b93
+Revises: d41a8f6e2c19
+Create Date: 2025-11-27 09:41:05.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c2a7f41b93'
+down_revision: Union[str, Sequence[str], None] = 'd41a8f6e2c19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rate_card_versions',
+    sa.Column('version', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('effective_date', sa.Date(), nullable=False),
+    sa.Column('note', sa.String(length=255), nullable=True),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('created_on', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('version')
+    )
+    op.create_index(op.f('ix_rate_card_versions_effective_date'), 'rate_card_versions', ['effective_date'], unique=False)
+    op.create_table('rate_card_version_entries',
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('country', sa.String(length=50), nullable=False),
+    sa.Column('role', sa.String(length=100), nullable=False),
+    sa.Column('band', sa.Integer(), nullable=False),
+    sa.Column('cost', sa.DECIMAL(precision=12, scale=2), nullable=True),
+    sa.Column('sale_price', sa.DECIMAL(precision=12, scale=2), nullable=True),
+    sa.ForeignKeyConstraint(['version'], ['rate_card_versions.version'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('version', 'country', 'role', 'band')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rate_card_version_entries')
+    op.drop_index(op.f('ix_rate_card_versions_effective_date'), table_name='rate_card_versions')
+    op.drop_table('rate_card_versions')
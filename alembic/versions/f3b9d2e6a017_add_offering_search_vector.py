@@ -0,0 +1,81 @@
+"""add offering search vector
+
+Revision ID: f3b9d2e6a017
+Revises: e8c2a7f41b93
+Create Date: 2025-12-01 14:06:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2e6a017'
+down_revision: Union[str, Sequence[str], None] = 'e8c2a7f41b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Indexed columns, in the order of WEIGHTED_FIELDS in app/crud/offering_search.py
+FTS_FIELDS = ("offering_name", "tag_line", "offering_tags", "offering_summary", "elevator_pitch")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        _create_sqlite_fts()
+        return
+
+    # Generated by the database and not mapped on the Offering model
+    # (see app/crud/offering_search.py); keep in sync with WEIGHTED_FIELDS there.
+    op.execute("""
+        ALTER TABLE offerings ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(offering_name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(tag_line, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(offering_tags, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(offering_summary, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(elevator_pitch, '')), 'D')
+        ) STORED
+    """)
+    op.create_index('ix_offerings_search_vector', 'offerings', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("offerings_fts_ai", "offerings_fts_ad", "offerings_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS offerings_fts")
+        return
+
+    op.drop_index('ix_offerings_search_vector', table_name='offerings', postgresql_using='gin')
+    op.drop_column('offerings', 'search_vector')
+
+
+def _create_sqlite_fts() -> None:
+    """FTS5 external-content table over offerings, kept in sync by triggers"""
+    columns = ", ".join(FTS_FIELDS)
+    new_values = ", ".join(f"new.{name}" for name in FTS_FIELDS)
+    old_values = ", ".join(f"old.{name}" for name in FTS_FIELDS)
+    op.execute(f"CREATE VIRTUAL TABLE offerings_fts USING fts5({columns}, content='offerings', content_rowid='rowid')")
+    op.execute(f"""
+        CREATE TRIGGER offerings_fts_ai AFTER INSERT ON offerings BEGIN
+            INSERT INTO offerings_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER offerings_fts_ad AFTER DELETE ON offerings BEGIN
+            INSERT INTO offerings_fts(offerings_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER offerings_fts_au AFTER UPDATE ON offerings BEGIN
+            INSERT INTO offerings_fts(offerings_fts, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO offerings_fts(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END
+    """)
+    # Index the offerings that already exist
+    op.execute("INSERT INTO offerings_fts(offerings_fts) VALUES ('rebuild')")
@@ -9,7 +9,9 @@ from app.api.v1.endpoints import (
     staffing,
     pricing,
     wbs,
-    admin_stats
+    admin_stats,
+    jobs,
+    suggest
 )
 
 api_router = APIRouter()
@@ -22,8 +24,10 @@ api_router.include_router(countries.router, tags=["countries"])
 api_router.include_router(brands.router, tags=["brands"])
 api_router.include_router(products.router, tags=["products"])
 api_router.include_router(offerings.router, tags=["offerings"])
+api_router.include_router(suggest.router, tags=["search"])
 api_router.include_router(activities.router, tags=["activities"])
 api_router.include_router(staffing.router, tags=["staffing"])
 api_router.include_router(pricing.router, tags=["pricing"])
 api_router.include_router(wbs.router, tags=["wbs"])
-api_router.include_router(admin_stats.router, tags=["admin"])
\ No newline at end of file
+api_router.include_router(admin_stats.router, tags=["admin"])
+api_router.include_router(jobs.router, tags=["admin"])
\ No newline at end of file
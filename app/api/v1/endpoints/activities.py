@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
+from app.api.v1.pagination import cursor_params, page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.activity import (
     Activity,
     ActivityCreate,
     ActivityUpdate,
     ActivityWithRelation,
     ActivityWithOfferings,
+    ActivitySearchHit,
     OfferingActivityCreate,
     OfferingActivityUpdate
 )
@@ -23,26 +26,60 @@ router = APIRouter()
 
 @router.get("/library", response_model=List[Activity])
 async def get_activity_library(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    page: PageRequest = Depends(cursor_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
     """
     Get all activities in the library (not filtered by offering)
     This is the activity catalog that can be used across offerings
+
+    ``skip`` still works; ``cursor`` (from X-Next-Cursor) is cheaper for deep pages.
     """
-    activities = crud_activity.get_all_activities(db, skip=skip, limit=limit)
-    return activities
+    page.limit, page.offset = limit, skip
+    return paged(response, lambda: crud_activity.get_all_activities(db, page=page))
 
 @router.get("/library/unassigned", response_model=List[Activity])
 async def get_unassigned_activities(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
     """Get activities that are not assigned to any offering"""
-    activities = crud_activity.get_unassigned_activities(db)
-    return activities
+    return paged(response, lambda: crud_activity.get_unassigned_activities(db, page))
+
+@router.get("/library/search", response_model=List[ActivitySearchHit])
+async def search_activity_library(
+    response: Response,
+    query: Optional[str] = Query(None, max_length=200, description="Words to find in the activity name and text fields"),
+    brand: Optional[str] = Query(None, description="Filter by brand"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    product_name: Optional[str] = Query(None, description="Filter by product name"),
+    page: Optional[PageRequest] = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)  # All authenticated users
+):
+    """
+    Search the activity library by name, description, deliverables,
+    assumptions, client/IBM responsibilities and completion criteria
+
+    Each word of ``query`` is matched as a word prefix; results are ranked by
+    relevance (``sort=name`` orders them by name). Instead of the full text,
+    each hit has ``highlights``: snippets of the matching fields with the
+    matched words wrapped in ``<mark>``.
+    """
+    return paged(response, lambda: crud_activity.search_activities(
+        db,
+        query=query,
+        brand=brand,
+        category=category,
+        product_name=product_name,
+        page=page
+    ))
 
 @router.get("/library/{activity_id}", response_model=ActivityWithOfferings)
 async def get_activity_detail(
@@ -87,7 +124,9 @@ async def get_activity_detail(
 
 @router.get("/activities", response_model=List[ActivityWithRelation])
 async def get_activities_for_offering(
+    response: Response,
     offering_id: str = Query(..., description="Offering ID to get activities for"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)  # All authenticated users
 ):
@@ -100,8 +139,7 @@ async def get_activities_for_offering(
     if not offering:
         raise HTTPException(status_code=404, detail="Offering not found")
     
-    activities = crud_activity.get_activities_by_offering(db, offering_id)
-    return activities
+    return paged(response, lambda: crud_activity.get_activities_by_offering(db, offering_id, page))
 
 # ==================== ADMIN ONLY - Modify Activity Library ====================
 
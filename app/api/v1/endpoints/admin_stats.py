@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import Dict
@@ -15,6 +15,13 @@ from app.models.activity import Activity
 from app.models.pricing import PricingDetail
 from app.models.staffing import StaffingDetail
 from app.models.wbs import WBS
+from app.crud.rate_card_cache import rate_card_cache
+from app.crud.search_index import catalog_index
+from app.crud.offering_attributes import offering_attribute_cache
+from app.crud.offering_similarity import model as similarity_model
+from app.bluegroups_auth import breaker as bluegroups_breaker, membership_cache
+from app.crud import pricing_rollup as crud_pricing_rollup
+from app.crud import rate_card_coverage as crud_rate_card_coverage
 
 router = APIRouter()
 
@@ -112,3 +119,76 @@ async def get_detailed_admin_stats(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching detailed admin statistics: {str(e)}"
         )
+
+
+@router.get("/admin/stats/cache", response_model=Dict[str, Dict])
+async def get_cache_stats(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get hit/miss/reload counters for the in-process caches - **Requires Administrator access**
+    
+    Counters are per worker process and reset on restart.
+    """
+    return {
+        "rateCard": rate_card_cache.stats(),
+        "searchIndex": catalog_index.stats(),
+        "offeringAttributes": offering_attribute_cache.stats(),
+        "offeringSimilarity": similarity_model.stats(),
+        "blueGroups": membership_cache.stats(),
+        "blueGroupsBreaker": bluegroups_breaker.stats()
+    }
+
+
+
+@router.post("/admin/pricing-rollups/rebuild", response_model=Dict[str, int])
+async def rebuild_pricing_rollups(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Recompute every activity and offering price rollup from scratch - **Requires Administrator access**
+    
+    Run once after the rollup tables are created, or to repair drift.
+    """
+    try:
+        return crud_pricing_rollup.rebuild_all(db)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error rebuilding pricing rollups: {str(e)}"
+        )
+
+
+@router.get("/admin/pricing-rollups/drift", response_model=Dict)
+async def check_pricing_rollup_drift(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Compare stored price rollups with a from-scratch recomputation - **Requires Administrator access**
+    """
+    return crud_pricing_rollup.check_drift(db)
+
+
+@router.get("/admin/pricing/coverage", response_model=Dict)
+async def get_rate_card_coverage(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List staffing rows whose (country, role, band) has no pricing - **Requires Administrator access**
+    
+    These rows currently price as zero. Missing keys are summarized in full;
+    the affected staffing rows are paged with skip/limit.
+    """
+    try:
+        return crud_rate_card_coverage.get_coverage_report(db, skip=skip, limit=limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error building rate card coverage report: {str(e)}"
+        )
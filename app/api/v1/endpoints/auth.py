@@ -3,6 +3,7 @@ from fastapi.responses import RedirectResponse, JSONResponse
 from typing import Dict
 import logging
 from app.config import settings
+from app.auth.permissions import resolve_session_groups
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -123,6 +124,10 @@ async def auth_callback(request: Request):
             'is_admin': True,  # All users are admin
         }
         
+        # Resolve every BlueGroup once, up front; require_admin and friends read
+        # the answers from the session until they expire
+        await resolve_session_groups(request.session['user'])
+        
         # Store token for API calls
         request.session['token'] = {
             'access_token': token.get('access_token'),
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.api.v1.pagination import page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.brand import Brand, BrandCreate, BrandUpdate
 from app.crud import brand as crud_brand
 from app.auth.dependencies import get_current_active_user
@@ -12,11 +14,13 @@ router = APIRouter()
 # READ - Available to all authenticated users
 @router.get("/brands", response_model=List[Brand])
 async def get_brands(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get list of all brands - Available to all authenticated users"""
-    return crud_brand.get_brands(db)
+    return paged(response, lambda: crud_brand.get_brands(db, page))
 
 @router.get("/brands/{brand_id}", response_model=Brand)
 async def get_brand(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.api.v1.pagination import page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.country import Country, CountryCreate, CountryUpdate
 from app.crud import country as crud_country
 from app.auth.dependencies import get_current_active_user
@@ -12,11 +14,13 @@ router = APIRouter()
 # READ - Available to all authenticated users
 @router.get("/countries", response_model=List[Country])
 async def get_countries(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get list of all countries - Available to all authenticated users"""
-    return crud_country.get_countries(db)
+    return paged(response, lambda: crud_country.get_countries(db, page))
 
 @router.get("/countries/{country_id}", response_model=Country)
 async def get_country(
@@ -0,0 +1,92 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Dict, List, Optional
+from app.jobs import jobs
+from app.schemas.pricing import RepricingJobRequest
+from app.crud import repricing as crud_repricing
+from app.crud import offering_similarity as crud_offering_similarity
+from app.crud import activity_duplicates as crud_activity_duplicates
+from app.auth.permissions import require_admin
+
+router = APIRouter()
+
+# ADMIN ONLY - Background jobs
+
+@router.get("/admin/jobs", response_model=List[Dict])
+async def list_jobs(
+    kind: Optional[str] = Query(None, description="Filter by job kind, e.g. repricing"),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    List recent background jobs of every worker, newest first - **Requires Administrator access**
+    """
+    return [job.to_dict(include_result=False) for job in jobs.list(kind)]
+
+
+@router.get("/admin/jobs/{job_id}", response_model=Dict)
+async def get_job(
+    job_id: str,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get the status and result of a background job - **Requires Administrator access**
+    
+    Job state is stored in the database, so any worker can answer the poll.
+    """
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@router.post("/admin/repricing-jobs", response_model=Dict, status_code=status.HTTP_202_ACCEPTED)
+async def create_repricing_job(
+    request: RepricingJobRequest,
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Reprice the offerings affected by the given rate card keys - **Requires Administrator access**
+    
+    Omit ``rate_keys`` to reprice the whole portfolio. Returns immediately;
+    poll /admin/jobs/{job_id} for the before/after deltas.
+    """
+    rate_keys = None
+    if request.rate_keys is not None:
+        rate_keys = [(key.country, key.role, key.band) for key in request.rate_keys]
+    
+    job = crud_repricing.submit_repricing(rate_keys)
+    return job.to_dict(include_result=False)
+
+
+@router.post("/admin/similarity-jobs", response_model=Dict, status_code=status.HTTP_202_ACCEPTED)
+async def create_similarity_job(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Rebuild the precomputed "similar offerings" table - **Requires Administrator access**
+    
+    Offering writes keep the table current incrementally; run this after
+    upgrading, after bulk imports, or to refresh drifted scores. Returns
+    immediately; poll /admin/jobs/{job_id} for the result.
+    """
+    job = crud_offering_similarity.submit_rebuild()
+    return job.to_dict(include_result=False)
+
+
+@router.post("/admin/activity-duplicate-jobs", response_model=Dict, status_code=status.HTTP_202_ACCEPTED)
+async def create_activity_duplicate_job(
+    threshold: float = Query(
+        crud_activity_duplicates.DEFAULT_THRESHOLD, ge=0.6, le=1.0,
+        description="Minimum estimated Jaccard similarity of the activity text"
+    ),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Find clusters of near-duplicate activities in the library - **Requires Administrator access**
+    
+    Activities are compared by MinHash signatures of their text with an LSH
+    index, so the scan is near-linear in the library size. Returns
+    immediately; poll /admin/jobs/{job_id} for the clusters, each listing
+    its activities with their linked offerings and staffing/WBS row counts.
+    """
+    job = crud_activity_duplicates.submit_duplicate_scan(threshold)
+    return job.to_dict(include_result=False)
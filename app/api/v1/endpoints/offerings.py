@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from app.database import get_db
-from app.schemas.offering import Offering, OfferingCreate, OfferingUpdate
+from app.api.v1.pagination import page_params, paged, unwrap_page
+from app.crud.pagination import PageRequest
+from app.schemas.offering import Offering, OfferingCreate, OfferingUpdate, OfferingSearchResults, SimilarOffering, AttributeValueCount
 from app.crud import offering as crud_offering
+from app.crud import offering_similarity as crud_offering_similarity
+from app.crud import offering_attributes as crud_offering_attributes
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
@@ -12,13 +17,32 @@ router = APIRouter()
 # READ - Available to all authenticated users
 @router.get("/offerings", response_model=List[Offering])
 async def get_offerings(
+    response: Response,
     product_id: str = Query(..., description="Product ID to filter offerings"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get offerings by product ID - Available to all authenticated users"""
-    offerings = crud_offering.get_offerings_by_product(db, product_id)
-    return offerings
+    return paged(response, lambda: crud_offering.get_offerings_by_product(db, product_id, page))
+
+@router.get("/offerings/attribute-values/{column}", response_model=List[AttributeValueCount])
+async def get_offering_attribute_values(
+    column: str = Path(..., description="Offering column, e.g. saas_type or industry"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Distinct values of an offering column with their counts, for filter dropdowns - Available to all authenticated users
+    
+    Only the categorical columns (saas_type, industry, client_type, framework_category,
+    client_journey_stage, ibm_sales_play, ...) are allowed. Results are cached and
+    refreshed when offerings change.
+    """
+    try:
+        return crud_offering_attributes.get_attribute_values(db, column)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
 @router.get("/offerings/{offering_id}", response_model=Offering)
 async def get_offering_by_id(
@@ -32,26 +56,95 @@ async def get_offering_by_id(
         raise HTTPException(status_code=404, detail="Offering not found")
     return offering
 
-@router.get("/offerings/search/", response_model=List[Offering])
+@router.get("/offerings/{offering_id}/similar", response_model=List[SimilarOffering])
+async def get_similar_offerings(
+    offering_id: str = Path(..., description="Offering ID"),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Offerings related to this one, most similar first - Available to all authenticated users
+    
+    Similarity is the cosine of TF-IDF vectors over the summary, value,
+    outcomes, tags and industry. Neighbours are precomputed by a background
+    job, so at most the stored top SIMILAR_OFFERINGS_TOP_K are returned.
+    """
+    similar = crud_offering_similarity.get_similar_offerings(db, offering_id, limit)
+    if not similar and not crud_offering.get_offering_by_id(db, offering_id):
+        raise HTTPException(status_code=404, detail="Offering not found")
+    return [
+        {**Offering.model_validate(offering).model_dump(), "similarity": round(score, 4)}
+        for offering, score in similar
+    ]
+
+@router.get("/offerings/search/", response_model=Union[List[Offering], OfferingSearchResults])
 async def search_offerings(
+    response: Response,
     query: Optional[str] = Query(None, description="Search query"),
     saas_type: Optional[str] = Query(None, description="Filter by SaaS type"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     client_type: Optional[str] = Query(None, description="Filter by client type"),
     framework_category: Optional[str] = Query(None, description="Filter by framework category"),
+    min_sale_price: Optional[Decimal] = Query(None, ge=0, description="Minimum total sale price"),
+    max_sale_price: Optional[Decimal] = Query(None, ge=0, description="Maximum total sale price"),
+    min_hours: Optional[int] = Query(None, ge=0, description="Minimum total hours"),
+    max_hours: Optional[int] = Query(None, ge=0, description="Maximum total hours"),
+    min_activities: Optional[int] = Query(None, ge=0, description="Minimum number of activities"),
+    max_activities: Optional[int] = Query(None, ge=0, description="Maximum number of activities"),
+    include_facets: bool = Query(False, description="Return {results, facets} with per-value counts of the filter columns"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
-    """Search offerings with multiple filters - Available to all authenticated users"""
-    offerings = crud_offering.search_offerings(
+    """
+    Search offerings with multiple filters - Available to all authenticated users
+    
+    With ``include_facets`` the response is ``{"results": [...], "facets": {...}}``.
+    Each facet is counted under the query and every other active filter, so
+    the counts show how many offerings each alternative value would return.
+
+    Results are ordered by relevance when there is a query (``sort=name``
+    orders them by name); ``limit``/``cursor`` page through them.
+
+    The sale price, hours and activity count ranges filter on the stored
+    price rollups, and ``sort`` also accepts ``price``, ``hours`` and
+    ``activities`` (``-`` prefix for descending).
+    """
+    if include_facets:
+        searched = paged(response, lambda: crud_offering.search_offerings_with_facets(
+            db=db,
+            query=query,
+            saas_type=saas_type,
+            industry=industry,
+            client_type=client_type,
+            framework_category=framework_category,
+            min_sale_price=min_sale_price,
+            max_sale_price=max_sale_price,
+            min_hours=min_hours,
+            max_hours=max_hours,
+            min_activities=min_activities,
+            max_activities=max_activities,
+            page=page
+        ))
+        searched["results"] = unwrap_page(response, searched["results"])
+        return searched
+    
+    return paged(response, lambda: crud_offering.search_offerings(
         db=db,
         query=query,
         saas_type=saas_type,
         industry=industry,
         client_type=client_type,
-        framework_category=framework_category
-    )
-    return offerings
+        framework_category=framework_category,
+        min_sale_price=min_sale_price,
+        max_sale_price=max_sale_price,
+        min_hours=min_hours,
+        max_hours=max_hours,
+        min_activities=min_activities,
+        max_activities=max_activities,
+        page=page
+    ))
 
 # WRITE - Administrator only
 @router.post("/offerings", response_model=Offering, status_code=status.HTTP_201_CREATED)
@@ -1,20 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response, status
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
-from decimal import Decimal
+from datetime import date
 from app.database import get_db
-from app.schemas.pricing import PricingDetail, PricingDetailCreate, PricingDetailUpdate
+from app.api.v1.pagination import page_params, paged
+from app.crud.pagination import PageRequest
+from app.config import settings
+from app.schemas.pricing import (
+    PricingDetail,
+    PricingDetailCreate,
+    PricingDetailUpdate,
+    OfferingTotalsBatchRequest,
+    PricingSimulationRequest,
+    RateCardVersion,
+    RateCardVersionCreate,
+    RateCardVersionDetail
+)
 from app.crud import pricing as crud_pricing
-from app.crud import staffing as crud_staffing
+from app.crud import offering as crud_offering
+from app.crud import pricing_rollup as crud_pricing_rollup
+from app.crud import repricing as crud_repricing
 from app.auth.dependencies import get_current_active_user
 from app.auth.permissions import require_admin
 
 router = APIRouter()
 
+REPRICING_JOB_HEADER = "X-Repricing-Job-Id"
+
+
+def _resolve_rate_card_version(db: Session, version: Optional[int], as_of: Optional[date]) -> Optional[int]:
+    """Map the version/as_of query parameters to a rate card version number (None = live rate card)"""
+    if version is None and as_of is None:
+        return None
+    if version is not None and as_of is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify either version or as_of, not both"
+        )
+    
+    rate_card_version = crud_pricing.resolve_rate_card_version(db, version=version, as_of=as_of)
+    if not rate_card_version:
+        detail = f"Rate card version {version} not found" if version is not None \
+            else f"No rate card version is in effect on {as_of}"
+        raise HTTPException(status_code=404, detail=detail)
+    return rate_card_version.version
+
 # READ - Available to all authenticated users
 
 @router.get("/pricing/all", response_model=List[PricingDetail])
 async def get_all_pricing(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
@@ -22,15 +58,16 @@ async def get_all_pricing(
     Get all pricing details
     Available to all authenticated users
     """
-    pricing_list = crud_pricing.get_all_pricing(db)
-    return pricing_list
+    return paged(response, lambda: crud_pricing.get_all_pricing(db, page))
 
 
 @router.get("/pricing/search", response_model=List[PricingDetail])
 async def search_pricing(
+    response: Response,
     country: Optional[str] = Query(None, description="Country"),
     role: Optional[str] = Query(None, description="Role"),
     band: Optional[int] = Query(None, description="Band"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
@@ -38,8 +75,7 @@ async def search_pricing(
     Search pricing details by country, role, and/or band
     Available to all authenticated users
     """
-    pricing_list = crud_pricing.search_pricing(db, country=country, role=role, band=band)
-    return pricing_list
+    return paged(response, lambda: crud_pricing.search_pricing(db, country=country, role=role, band=band, page=page))
 
 
 @router.get("/pricingDetails", response_model=PricingDetail)
@@ -70,95 +106,217 @@ async def get_pricing_detail(
 @router.get("/totalHoursAndPrices/{offering_id}")
 async def get_total_hours_and_prices(
     offering_id: str = Path(..., description="Offering ID"),
+    version: Optional[int] = Query(None, description="Rate card version to price with"),
+    as_of: Optional[date] = Query(None, description="Price with the rate card version in effect on this date"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """
     Calculate total hours and prices for an offering
     Available to all authenticated users
+
+    Staffing rows without a matching pricing entry are listed under
+    ``unpriced_staffing``; their hours are still included in ``total_hours``.
+    Pass ``version`` or ``as_of`` to price with a rate card version instead of
+    the live rate card; the version used is returned as ``rate_card_version``.
     """
-    
-    staffing_details = crud_staffing.get_staffing_by_offering(db, offering_id)
-    
-    if not staffing_details:
+    rate_card_version = _resolve_rate_card_version(db, version, as_of)
+    return crud_pricing.calculate_offering_totals(db, offering_id, rate_card_version)
+
+
+@router.get("/totalHoursAndPrices/{offering_id}/summary")
+async def get_total_hours_and_prices_summary(
+    offering_id: str = Path(..., description="Offering ID"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Get an offering's stored totals (no breakdown) from the price rollup table
+    Available to all authenticated users
+    """
+    rollup = crud_pricing_rollup.get_offering_rollup(db, offering_id)
+    if not rollup:
+        offering = crud_offering.get_offering_by_id(db, offering_id)
+        if not offering:
+            raise HTTPException(status_code=404, detail="Offering not found")
         return {
             "offering_id": offering_id,
             "total_hours": 0,
             "total_cost": 0,
             "total_sale_price": 0,
-            "breakdown": []
+            "unpriced_rows": 0,
+            "updated_on": None
         }
     
-    total_hours = 0
-    total_cost = Decimal(0)
-    total_sale_price = Decimal(0)
-    breakdown = []
+    return {
+        "offering_id": rollup.offering_id,
+        "total_hours": rollup.total_hours,
+        "total_cost": float(rollup.total_cost),
+        "total_sale_price": float(rollup.total_sale_price),
+        "unpriced_rows": rollup.unpriced_rows,
+        "updated_on": rollup.updated_on
+    }
+
+
+@router.get("/totalHoursAndPrices/{offering_id}/countries")
+async def compare_total_hours_and_prices_by_country(
+    offering_id: str = Path(..., description="Offering ID"),
+    version: Optional[int] = Query(None, description="Rate card version to price with"),
+    as_of: Optional[date] = Query(None, description="Price with the rate card version in effect on this date"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Price an offering as if all of its staffing were delivered from each country in the rate card
+    Available to all authenticated users
+
+    Hours are grouped by (role, band); ``missing_rate_count`` is the number of
+    (role, band) combinations that have no rate in that country.
+    """
+    rate_card_version = _resolve_rate_card_version(db, version, as_of)
+    offering = crud_offering.get_offering_by_id(db, offering_id)
+    if not offering:
+        raise HTTPException(status_code=404, detail="Offering not found")
     
-    for staffing in staffing_details:
-        pricing = crud_pricing.get_pricing_details(
-            db=db,
-            country=staffing.country,
-            role=staffing.role,
-            band=staffing.band
+    return crud_pricing.compare_offering_across_countries(db, offering_id, rate_card_version)
+
+
+@router.post("/totalHoursAndPrices/batch")
+async def get_total_hours_and_prices_batch(
+    request: OfferingTotalsBatchRequest,
+    version: Optional[int] = Query(None, description="Rate card version to price with"),
+    as_of: Optional[date] = Query(None, description="Price with the rate card version in effect on this date"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Calculate total hours and prices for several offerings in one call
+    Available to all authenticated users
+
+    Each result has the same shape as /totalHoursAndPrices/{offering_id};
+    results follow the order of the requested IDs (duplicates are dropped).
+    """
+    offering_ids = list(dict.fromkeys(request.offering_ids))
+    if len(offering_ids) > settings.PRICING_BATCH_MAX_OFFERINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRICING_BATCH_MAX_OFFERINGS} offerings can be priced per batch"
         )
-        
-        hours = staffing.hours or 0
-        total_hours += hours
-        
-        if pricing:
-            cost = (pricing.cost or Decimal(0)) * Decimal(hours)
-            sale_price = (pricing.sale_price or Decimal(0)) * Decimal(hours)
-            total_cost += cost
-            total_sale_price += sale_price
-            
-            breakdown.append({
-                "staffing_id": staffing.staffing_id,
-                "country": staffing.country,
-                "role": staffing.role,
-                "band": staffing.band,
-                "hours": hours,
-                "cost_per_hour": float(pricing.cost) if pricing.cost else 0,
-                "sale_price_per_hour": float(pricing.sale_price) if pricing.sale_price else 0,
-                "total_cost": float(cost),
-                "total_sale_price": float(sale_price)
-            })
     
-    return {
-        "offering_id": offering_id,
-        "total_hours": total_hours,
-        "total_cost": float(total_cost),
-        "total_sale_price": float(total_sale_price),
-        "breakdown": breakdown
-    }
+    rate_card_version = _resolve_rate_card_version(db, version, as_of)
+    return {"results": crud_pricing.calculate_totals_for_offerings(db, offering_ids, rate_card_version)}
+
+@router.post("/totalHoursAndPrices/{offering_id}/simulate")
+async def simulate_total_hours_and_prices(
+    simulation: PricingSimulationRequest,
+    offering_id: str = Path(..., description="Offering ID"),
+    version: Optional[int] = Query(None, description="Rate card version to price with"),
+    as_of: Optional[date] = Query(None, description="Price with the rate card version in effect on this date"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Recompute an offering's cost and sale price under what-if staffing substitutions
+    Available to all authenticated users
+
+    Example substitution moving all US Band 7 hours to India Band 6:
+    ``{"match": {"country": "US", "band": 7}, "replace": {"country": "India", "band": 6}}``.
+    Nothing is written; each scenario is priced against the current rate card,
+    or the rate card version selected by ``version`` / ``as_of``.
+    """
+    if len(simulation.scenarios) > settings.PRICING_SIMULATION_MAX_SCENARIOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRICING_SIMULATION_MAX_SCENARIOS} scenarios can be simulated per request"
+        )
+    
+    rate_card_version = _resolve_rate_card_version(db, version, as_of)
+    offering = crud_offering.get_offering_by_id(db, offering_id)
+    if not offering:
+        raise HTTPException(status_code=404, detail="Offering not found")
+    
+    return crud_pricing.simulate_offering_pricing(db, offering_id, simulation.scenarios, rate_card_version)
+
+
+@router.get("/pricing/versions", response_model=List[RateCardVersion])
+async def get_rate_card_versions(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    List rate card versions, newest first
+    Available to all authenticated users
+    """
+    return paged(response, lambda: crud_pricing.get_rate_card_versions(db, page))
+
+
+@router.get("/pricing/versions/{version}", response_model=RateCardVersionDetail)
+async def get_rate_card_version(
+    version: int = Path(..., description="Rate card version"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Get a rate card version with all of its rates
+    Available to all authenticated users
+    """
+    rate_card_version = crud_pricing.get_rate_card_version(db, version)
+    if not rate_card_version:
+        raise HTTPException(status_code=404, detail=f"Rate card version {version} not found")
+    return rate_card_version
 
 # WRITE - Administrator only
 
+@router.post("/pricing/versions", response_model=RateCardVersion, status_code=status.HTTP_201_CREATED)
+async def create_rate_card_version(
+    version: RateCardVersionCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Snapshot the current rate card as a new version - **Requires Administrator access**
+    
+    Versions are immutable and numbered in creation order. Prices computed
+    with ``version`` or ``as_of`` never change when pricing details are edited.
+    """
+    return crud_pricing.create_rate_card_version(db, version, created_by=current_user.get("email"))
+
+
 @router.post("/pricingDetails", response_model=PricingDetail, status_code=status.HTTP_201_CREATED)
 async def create_pricing(
     pricing: PricingDetailCreate,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_admin)
 ):
-    """Create new pricing details - **Requires Administrator access**"""
-    # Check if pricing already exists for this combination
-    existing = crud_pricing.get_pricing_details(
-        db=db,
-        country=pricing.country,
-        role=pricing.role,
-        band=pricing.band
-    )
+    """
+    Create new pricing details - **Requires Administrator access**
     
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Pricing already exists for this country, role, and band combination"
-        )
+    Offerings staffing this key are repriced in the background; the job ID
+    is returned in the X-Repricing-Job-Id header.
+    """
+    conflict = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Pricing already exists for this country, role, and band combination"
+    )
+
+    # Check if pricing already exists for this combination
+    if crud_pricing.pricing_exists(db, pricing.country, pricing.role, pricing.band):
+        raise conflict
     
-    return crud_pricing.create_pricing(db, pricing)
+    created_pricing = crud_pricing.create_pricing(db, pricing)
+    if created_pricing is None:
+        raise conflict
+    job = crud_repricing.submit_repricing([(pricing.country, pricing.role, pricing.band)])
+    response.headers[REPRICING_JOB_HEADER] = job.job_id
+    return created_pricing
 
 
 @router.put("/pricingDetails/{country}/{role}/{band}", response_model=PricingDetail)
 async def update_pricing(
+    response: Response,
     country: str = Path(..., description="Country"),
     role: str = Path(..., description="Role"),
     band: int = Path(..., description="Band"),
@@ -166,23 +324,41 @@ async def update_pricing(
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_admin)
 ):
-    """Update pricing details - **Requires Administrator access**"""
+    """
+    Update pricing details - **Requires Administrator access**
+    
+    Offerings staffing the old or new key are repriced in the background; the
+    job ID is returned in the X-Repricing-Job-Id header.
+    """
     updated_pricing = crud_pricing.update_pricing(db, country, role, band, pricing_update)
     if not updated_pricing:
         raise HTTPException(status_code=404, detail="Pricing details not found")
+    job = crud_repricing.submit_repricing([
+        (country, role, band),
+        (updated_pricing.country, updated_pricing.role, updated_pricing.band)
+    ])
+    response.headers[REPRICING_JOB_HEADER] = job.job_id
     return updated_pricing
 
 
 @router.delete("/pricingDetails/{country}/{role}/{band}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pricing(
+    response: Response,
     country: str = Path(..., description="Country"),
     role: str = Path(..., description="Role"),
     band: int = Path(..., description="Band"),
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_admin)
 ):
-    """Delete pricing details - **Requires Administrator access**"""
+    """
+    Delete pricing details - **Requires Administrator access**
+    
+    Offerings staffing this key are repriced in the background; the job ID
+    is returned in the X-Repricing-Job-Id header.
+    """
     success = crud_pricing.delete_pricing(db, country, role, band)
     if not success:
         raise HTTPException(status_code=404, detail="Pricing details not found")
+    job = crud_repricing.submit_repricing([(country, role, band)])
+    response.headers[REPRICING_JOB_HEADER] = job.job_id
     return None
\ No newline at end of file
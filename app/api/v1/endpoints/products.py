@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.api.v1.pagination import page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.product import Product, ProductCreate, ProductUpdate
 from app.crud import product as crud_product
 from app.auth.dependencies import get_current_active_user
@@ -12,22 +14,24 @@ router = APIRouter()
 # READ - Available to all authenticated users
 @router.get("/products/all", response_model=List[Product])
 async def get_all_products(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all products - Available to all authenticated users"""
-    products = crud_product.get_all_products(db)
-    return products
+    return paged(response, lambda: crud_product.get_all_products(db, page))
 
 @router.get("/products", response_model=List[Product])
 async def get_products(
+    response: Response,
     brand_id: str = Query(..., description="Brand ID to filter products"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get products by brand ID - Available to all authenticated users"""
-    products = crud_product.get_products_by_brand(db, brand_id)
-    return products
+    return paged(response, lambda: crud_product.get_products_by_brand(db, brand_id, page))
 
 @router.get("/products/{product_id}", response_model=Product)
 async def get_product(
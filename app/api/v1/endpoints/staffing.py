@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Path, HTTPException, status
+from fastapi import APIRouter, Depends, Path, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
+from app.api.v1.pagination import page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.staffing import StaffingDetail, StaffingDetailCreate, StaffingDetailUpdate
 from app.crud import staffing as crud_staffing
 from app.auth.dependencies import get_current_active_user
@@ -11,33 +13,36 @@ router = APIRouter()
 
 @router.get("/staffingDetails/all", response_model=List[StaffingDetail])
 async def get_all_staffing_details(
+    response: Response,
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all staffing details - Available to all authenticated users"""
-    staffing_details = crud_staffing.get_all_staffing(db)
-    return staffing_details
+    return paged(response, lambda: crud_staffing.get_all_staffing(db, page))
 
 @router.get("/staffingDetails/activity/{activity_id}", response_model=List[StaffingDetail])
 async def get_staffing_by_activity(
+    response: Response,
     activity_id: str = Path(..., description="Activity ID"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get staffing details by activity ID - Available to all authenticated users"""
-    staffing_details = crud_staffing.get_staffing_by_activity(db, activity_id)
-    return staffing_details
+    return paged(response, lambda: crud_staffing.get_staffing_by_activity(db, activity_id, page))
 
 # READ - Available to all authenticated users
 @router.get("/staffingDetails/{offering_id}", response_model=List[StaffingDetail])
 async def get_staffing_details(
+    response: Response,
     offering_id: str = Path(..., description="Offering ID"),
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get staffing details by offering ID - Available to all authenticated users"""
-    staffing_details = crud_staffing.get_staffing_by_offering(db, offering_id)
-    return staffing_details
+    return paged(response, lambda: crud_staffing.get_staffing_by_offering(db, offering_id, page))
 
 @router.get("/staffingDetails/detail/{staffing_id}", response_model=StaffingDetail)
 async def get_staffing_detail(
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from app.database import get_db
+from app.crud.search_index import catalog_index
+from app.auth.dependencies import get_current_active_user
+
+router = APIRouter()
+
+SuggestionType = Literal["offering", "activity", "product", "brand"]
+
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    types: Optional[List[SuggestionType]] = Query(None, description="Restrict to these name types"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_active_user)
+):
+    """
+    Typeahead name completions - Available to all authenticated users
+    
+    Matches offering, activity, product and brand names with a word starting
+    with ``q``; names that start with ``q`` rank first, then shorter names.
+    Served from the in-memory catalog index.
+    """
+    return {"suggestions": catalog_index.suggest(db, q, limit=limit, kinds=types)}
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
+from app.api.v1.pagination import cursor_params, page_params, paged
+from app.crud.pagination import PageRequest
 from app.schemas.wbs import WBSCreate, WBSUpdate, WBSResponse, ActivityWBSCreate
 from app.crud import wbs as crud_wbs
 from app.auth.dependencies import get_current_active_user
@@ -14,13 +16,16 @@ router = APIRouter(prefix="/wbs", tags=["WBS"])
 # READ operations - Available to all authenticated users
 @router.get("/", response_model=List[WBSResponse])
 def get_all_wbs(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    page: PageRequest = Depends(cursor_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all WBS items (catalog access)"""
-    return crud_wbs.get_all_wbs(db, skip, limit)
+    page.limit, page.offset = limit, skip
+    return paged(response, lambda: crud_wbs.get_all_wbs(db, page=page))
 
 @router.get("/{wbs_id}", response_model=WBSResponse)
 def get_wbs(
@@ -36,12 +41,14 @@ def get_wbs(
 
 @router.get("/activity/{activity_id}/wbs", response_model=List[WBSResponse])
 def get_wbs_for_activity(
+    response: Response,
     activity_id: UUID, 
+    page: Optional[PageRequest] = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_active_user)
 ):
     """Get all WBS items for an activity (catalog access)"""
-    return crud_wbs.get_wbs_for_activity(db, activity_id)
+    return paged(response, lambda: crud_wbs.get_wbs_for_activity(db, activity_id, page))
 
 # WRITE operations - ADMIN ONLY
 @router.post("/", response_model=WBSResponse)
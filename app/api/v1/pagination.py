@@ -0,0 +1,59 @@
+"""
+Query parameters and response headers for cursor-paginated list endpoints.
+
+List endpoints keep returning a plain JSON array so existing clients are
+unaffected. Paging is opt-in: a client sends ``limit`` (and ``sort``),
+reads the ``X-Next-Cursor`` header and passes it back as ``cursor`` until
+the header is absent. ``include_total=true`` adds ``X-Total-Estimate``.
+"""
+from typing import Any, Callable, Optional
+from fastapi import HTTPException, Query, Response
+from app.config import settings
+from app.crud.pagination import InvalidPageRequest, Page, PageRequest
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Estimate"
+
+
+def cursor_params(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    sort: Optional[str] = Query(None, description="Sort order, e.g. name or -name"),
+    include_total: bool = Query(False, description="Return an estimate of the total row count in X-Total-Estimate")
+) -> PageRequest:
+    """Cursor parameters for endpoints that already page with their own skip/limit"""
+    return PageRequest(cursor=cursor, sort=sort, with_total=include_total)
+
+
+def page_params(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.PAGINATION_MAX_LIMIT, description="Page size; omit for the full list"),
+    sort: Optional[str] = Query(None, description="Sort order, e.g. name or -name"),
+    include_total: bool = Query(False, description="Return an estimate of the total row count in X-Total-Estimate")
+) -> Optional[PageRequest]:
+    """Paging parameters; None when the client sent none of them"""
+    if cursor is None and limit is None and sort is None and not include_total:
+        return None
+    return PageRequest(cursor=cursor, limit=limit, sort=sort, with_total=include_total)
+
+
+def paged(response: Response, fetch: Callable[[], Any]) -> Any:
+    """
+    Run a CRUD list call and unwrap its ``Page`` (see ``unwrap_page``),
+    turning a bad cursor or sort into a 400.
+    """
+    try:
+        result = fetch()
+    except InvalidPageRequest as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return unwrap_page(response, result)
+
+
+def unwrap_page(response: Response, result: Any) -> Any:
+    """The items of a ``Page`` become the body, its cursor and total estimate become headers"""
+    if not isinstance(result, Page):
+        return result
+    if result.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = result.next_cursor
+    if result.total_estimate is not None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(result.total_estimate)
+    return result.items
@@ -1,7 +1,9 @@
+import asyncio
+import time
 import httpx
 from fastapi import HTTPException, status
-from jose import jwt, JWTError
-from typing import Dict, Optional
+from jose import jwk, jwt, JWTError
+from typing import Any, Dict, Optional
 from app.config import settings
 import logging
 
@@ -16,6 +18,23 @@ class IBMAuth:
         self.oauth_server_url = settings.IBM_OAUTH_SERVER_URL
         self._jwks_cache: Optional[Dict] = None
         self._discovery_cache: Optional[Dict] = None
+        # kid -> key object built once from the JWKS, so tokens are not re-parsed into RSA keys
+        self._signing_keys: Dict[str, Any] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        """One pooled client for every call to the identity provider, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=10)
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled client (application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def get_discovery_document(self) -> Dict:
         """Fetch the OpenID Connect discovery document"""
@@ -23,11 +42,10 @@ class IBMAuth:
             return self._discovery_cache
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.discovery_endpoint)
-                response.raise_for_status()
-                self._discovery_cache = response.json()
-                return self._discovery_cache
+            response = await self.get_client().get(self.discovery_endpoint)
+            response.raise_for_status()
+            self._discovery_cache = response.json()
+            return self._discovery_cache
         except Exception as e:
             logger.error(f"Failed to fetch discovery document: {e}")
             raise HTTPException(
@@ -35,20 +53,18 @@ class IBMAuth:
                 detail="Authentication service unavailable"
             )
 
-    async def get_jwks(self) -> Dict:
+    async def get_jwks(self, refresh: bool = False) -> Dict:
         """Fetch JSON Web Key Set for token validation"""
-        if self._jwks_cache:
+        if self._jwks_cache and not refresh:
             return self._jwks_cache
         
         try:
             discovery = await self.get_discovery_document()
             jwks_uri = discovery.get("jwks_uri")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_uri)
-                response.raise_for_status()
-                self._jwks_cache = response.json()
-                return self._jwks_cache
+            response = await self.get_client().get(jwks_uri)
+            response.raise_for_status()
+            jwks = response.json()
         except Exception as e:
             logger.error(f"Failed to fetch JWKS: {e}")
             raise HTTPException(
@@ -56,6 +72,39 @@ class IBMAuth:
                 detail="Authentication service unavailable"
             )
 
+        signing_keys = {}
+        for key in jwks.get("keys", []):
+            if not key.get("kid"):
+                continue
+            try:
+                signing_keys[key["kid"]] = jwk.construct(key, algorithm="RS256")
+            except Exception as e:
+                logger.warning(f"Skipping unusable JWKS key {key.get('kid')}: {e}")
+        self._jwks_cache = jwks
+        self._signing_keys = signing_keys
+        self._jwks_fetched_at = time.monotonic()
+        return jwks
+
+    async def get_signing_key(self, kid: Optional[str]) -> Optional[Any]:
+        """
+        The key for ``kid``. The JWKS is refetched only for an unknown kid (a
+        key rotation), at most once per JWKS_MIN_REFRESH_SECONDS, and
+        concurrent misses wait for the same fetch.
+        """
+        key = self._signing_keys.get(kid)
+        if key is not None:
+            return key
+
+        async with self._jwks_lock:
+            key = self._signing_keys.get(kid)
+            if key is not None:
+                return key
+            if self._jwks_cache and time.monotonic() - self._jwks_fetched_at < settings.JWKS_MIN_REFRESH_SECONDS:
+                return None
+            logger.info(f"Fetching JWKS for unknown key id {kid}")
+            await self.get_jwks(refresh=True)
+            return self._signing_keys.get(kid)
+
     async def verify_token(self, token: str) -> Dict:
         """Verify and decode the IBM AppID token"""
         try:
@@ -66,23 +115,10 @@ class IBMAuth:
             # Decode without verification first to get the header
             unverified_header = jwt.get_unverified_header(token)
             
-            # Get JWKS
-            jwks = await self.get_jwks()
-            
-            # Find the right key
-            rsa_key = {}
-            for key in jwks.get("keys", []):
-                if key.get("kid") == unverified_header.get("kid"):
-                    rsa_key = {
-                        "kty": key.get("kty"),
-                        "kid": key.get("kid"),
-                        "use": key.get("use"),
-                        "n": key.get("n"),
-                        "e": key.get("e")
-                    }
-                    break
+            # Find the right key (refetching the JWKS if the key has rotated)
+            rsa_key = await self.get_signing_key(unverified_header.get("kid"))
             
-            if not rsa_key:
+            if rsa_key is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Unable to find appropriate key"
@@ -119,25 +155,24 @@ class IBMAuth:
             discovery = await self.get_discovery_document()
             introspection_endpoint = discovery.get("introspection_endpoint")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    introspection_endpoint,
-                    data={
-                        "token": token,
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret
-                    }
+            response = await self.get_client().post(
+                introspection_endpoint,
+                data={
+                    "token": token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+            
+            if not result.get("active"):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token is not active"
                 )
-                response.raise_for_status()
-                result = response.json()
-                
-                if not result.get("active"):
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token is not active"
-                    )
-                
-                return result
+            
+            return result
                 
         except HTTPException:
             raise
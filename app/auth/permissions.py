@@ -1,7 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from app.auth.dependencies import get_current_active_user
-from app.bluegroups_auth import is_user_in_group
+from app.bluegroups_auth import resolve_groups
+from typing import Dict
 import logging
+import time
 from app.config import settings
 
 # ADMIN_GROUP = "Admiin"
@@ -13,6 +15,29 @@ logger = logging.getLogger(__name__)
 
 # BlueGroup names - Update these with your actual BlueGroup names
 
+
+async def resolve_session_groups(user: dict) -> Dict[str, bool]:
+    """
+    Look up every configured BlueGroup for the user (concurrently) and store
+    the answers in the session user with an expiry.
+    """
+    groups = await resolve_groups(user.get("email"), (ADMIN_GROUP, SOLUTION_ARCHITECT_GROUP))
+    # A denied (or failed) lookup is retried sooner than a full session TTL, so
+    # a user added to a group does not have to wait out the session
+    ttl = settings.BLUEGROUPS_SESSION_TTL_SECONDS if all(groups.values()) else settings.BLUEGROUPS_NEGATIVE_TTL_SECONDS
+    user["groups"] = groups
+    user["groups_expires_at"] = time.time() + ttl
+    return groups
+
+
+async def get_session_groups(user: dict) -> Dict[str, bool]:
+    """Group answers from the session, re-resolved only once they have expired"""
+    groups = user.get("groups")
+    if groups is None or user.get("groups_expires_at", 0) <= time.time():
+        groups = await resolve_session_groups(user)
+    return groups
+
+
 async def require_admin(current_user: dict = Depends(get_current_active_user)):
     """
     Require user to be in Administrators BlueGroup.
@@ -25,7 +50,8 @@ async def require_admin(current_user: dict = Depends(get_current_active_user)):
             detail="Email not found in user profile"
         )
     
-    if not is_user_in_group(email, ADMIN_GROUP):
+    groups = await get_session_groups(current_user)
+    if not groups.get(ADMIN_GROUP):
         logger.warning(f"User {email} attempted admin action without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -49,11 +75,12 @@ async def require_solution_architect(current_user: dict = Depends(get_current_ac
         )
     
     # Admins have all permissions including solution architect
-    if is_user_in_group(email, ADMIN_GROUP):
+    groups = await get_session_groups(current_user)
+    if groups.get(ADMIN_GROUP):
         logger.info(f"Solution Architect access granted to {email} (via Admin role)")
         return current_user
     
-    if not is_user_in_group(email, SOLUTION_ARCHITECT_GROUP):
+    if not groups.get(SOLUTION_ARCHITECT_GROUP):
         logger.warning(f"User {email} attempted solution architect action without permission")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -79,7 +106,7 @@ async def get_user_roles(current_user: dict = Depends(get_current_active_user)):
     
     # is_admin = is_user_in_group(email, ADMIN_GROUP)
     is_admin = True
-    is_solution_architect = is_admin or is_user_in_group(email, SOLUTION_ARCHITECT_GROUP)
+    is_solution_architect = is_admin or (await get_session_groups(current_user)).get(SOLUTION_ARCHITECT_GROUP, False)
     
     
 
@@ -1,23 +1,429 @@
 import requests
-import xmltodict
+import httpx
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+from xml.etree.ElementTree import XMLPullParser
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+BLUEPAGES_GROUPS_URL = "https://bluepages.ibm.com/tools/groups/groupsxml.wss"
+
+# Shared by every async lookup so connections to bluepages are kept alive and reused
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _lookup_url(email: str, group_name: str) -> str:
+    return f"{BLUEPAGES_GROUPS_URL}?task=inAGroup&email={email}&group={group_name}"
+
+
+def _rc_parser() -> XMLPullParser:
+    return XMLPullParser(events=("end",))
+
+
+def _read_rc(parser: XMLPullParser, chunk: bytes) -> Optional[str]:
+    """Feed one chunk of the response; the text of <rc> once it has been parsed"""
+    parser.feed(chunk)
+    for _, element in parser.read_events():
+        if element.tag == "rc":
+            return (element.text or "").strip()
+    return None
+
+
+def _parse_rc(chunks: Iterable[bytes]) -> bool:
+    parser = _rc_parser()
+    for chunk in chunks:
+        rc_value = _read_rc(parser, chunk)
+        if rc_value is not None:
+            return rc_value == "0"
+    raise ValueError("No rc element in the bluepages response")
+
+
+async def _parse_rc_async(chunks: AsyncIterator[bytes]) -> bool:
+    parser = _rc_parser()
+    async for chunk in chunks:
+        rc_value = _read_rc(parser, chunk)
+        if rc_value is not None:
+            return rc_value == "0"
+    raise ValueError("No rc element in the bluepages response")
+
+
+def _lookup_membership(email: str, group_name: str) -> bool:
+    """Ask bluepages whether ``email`` is in ``group_name`` (raises if bluepages cannot answer)"""
+    with requests.get(_lookup_url(email, group_name), timeout=settings.BLUEGROUPS_TIMEOUT_SECONDS, stream=True) as response:
+        response.raise_for_status()
+        return _parse_rc(response.iter_content(chunk_size=1024))
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared bluepages client, created on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.BLUEGROUPS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.BLUEGROUPS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.BLUEGROUPS_HTTP_MAX_CONNECTIONS
+            )
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared bluepages client (application shutdown)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def _lookup_membership_async(email: str, group_name: str) -> bool:
+    """Non-blocking ``_lookup_membership``; stops reading once <rc> has been parsed"""
+    async with get_http_client().stream("GET", _lookup_url(email, group_name)) as response:
+        response.raise_for_status()
+        return await _parse_rc_async(response.aiter_bytes())
+
+
+async def _lookup_membership_hedged(email: str, group_name: str) -> bool:
+    """
+    ``_lookup_membership_async`` that sends a second request if the first has
+    not answered within BLUEGROUPS_HEDGE_AFTER_SECONDS; the first success wins.
+    """
+    first = asyncio.ensure_future(_lookup_membership_async(email, group_name))
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=settings.BLUEGROUPS_HEDGE_AFTER_SECONDS)
+        if done:
+            return first.result()
+
+        breaker.hedged += 1
+        pending.add(asyncio.ensure_future(_lookup_membership_async(email, group_name)))
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitOpenError(Exception):
+    """bluepages has been failing; the lookup was not attempted"""
+
+
+class CircuitBreaker:
+    """
+    Fails bluepages lookups fast while bluepages is failing.
+
+    After BLUEGROUPS_BREAKER_FAILURES consecutive failures the circuit opens
+    and lookups raise CircuitOpenError without a request. After
+    BLUEGROUPS_BREAKER_RESET_SECONDS one probe request is let through
+    (half-open); its success closes the circuit, its failure re-opens it.
+    A probe that is abandoned (cancelled) or has not reported back within
+    another BLUEGROUPS_BREAKER_RESET_SECONDS is replaced by a new one.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self.hedged = 0
+
+    def allow(self) -> bool:
+        """Whether a lookup may be sent now (claims the probe when half-open)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (
+                (self.state == self.OPEN and now - self._opened_at >= self.reset_seconds)
+                or (self.state == self.HALF_OPEN and now - self._probe_started_at >= self.reset_seconds)
+            ):
+                self.state = self.HALF_OPEN
+                self._probe_started_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def abandon(self) -> None:
+        """The lookup ended without an answer either way; free the probe for the next caller"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                logger.warning(f"[BlueGroups] Circuit opened after {self.consecutive_failures} consecutive failures")
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "trips": self.trips,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+            "hedged_requests": self.hedged,
+            "failure_threshold": self.failure_threshold,
+            "reset_seconds": self.reset_seconds,
+        }
+
+
+breaker = CircuitBreaker(
+    failure_threshold=settings.BLUEGROUPS_BREAKER_FAILURES,
+    reset_seconds=settings.BLUEGROUPS_BREAKER_RESET_SECONDS
+)
+
+
+class MembershipCache:
+    """
+    Bounded LRU of BlueGroups answers keyed by (email, group).
+
+    Members are cached for BLUEGROUPS_CACHE_TTL_SECONDS and non-members for
+    the shorter BLUEGROUPS_NEGATIVE_TTL_SECONDS. For BLUEGROUPS_STALE_SECONDS
+    after expiry the old answer is still served while a background thread
+    asks bluepages again; past that window the caller waits for the lookup.
+    Failed lookups are not cached: when bluepages fails (or the circuit is
+    open) the last known answer is served however old it is.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int, negative_ttl_seconds: int, stale_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._lock = threading.Lock()
+        # (email, group) -> (in_group, expires_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[bool, float]]" = OrderedDict()
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="bluegroups")
+        self._tasks = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.fallbacks = 0
+        self.evictions = 0
+
+    def _key(self, email: str, group_name: str) -> Tuple[str, str]:
+        return (email.strip().lower(), group_name)
+
+    def _store(self, key: Tuple[str, str], in_group: bool) -> None:
+        ttl = self.ttl_seconds if in_group else self.negative_ttl_seconds
+        with self._lock:
+            self._entries[key] = (in_group, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _fetch(self, key: Tuple[str, str], email: str, group_name: str) -> bool:
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError("bluepages circuit is open")
+            try:
+                in_group = _lookup_membership(email, group_name)
+            except Exception:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled (client gone, gather torn down): not a bluepages failure
+                breaker.abandon()
+                raise
+            breaker.record_success()
+        except Exception as e:
+            return self._fallback(key, e)
+        self._store(key, in_group)
+        return in_group
+
+    async def _fetch_async(self, key: Tuple[str, str], email: str, group_name: str) -> bool:
+        try:
+            if not breaker.allow():
+                raise CircuitOpenError("bluepages circuit is open")
+            try:
+                in_group = await _lookup_membership_hedged(email, group_name)
+            except Exception:
+                breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancelled (client gone, gather torn down): not a bluepages failure
+                breaker.abandon()
+                raise
+            breaker.record_success()
+        except Exception as e:
+            return self._fallback(key, e)
+        self._store(key, in_group)
+        return in_group
+
+    def _fallback(self, key: Tuple[str, str], error: Exception) -> bool:
+        """The last known answer however old, or re-raise the lookup error if there is none"""
+        with self._lock:
+            self.errors += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                raise error
+            self.fallbacks += 1
+            return entry[0]
+
+    def _refresh(self, key: Tuple[str, str], email: str, group_name: str) -> None:
+        try:
+            self._fetch(key, email, group_name)
+        except Exception as e:
+            # Keep serving the stale answer until it falls out of the stale window
+            logger.warning(f"Background BlueGroup refresh failed for {email} in '{group_name}': {e}")
+        finally:
+            self._refresh_done(key)
+
+    async def _refresh_async(self, key: Tuple[str, str], email: str, group_name: str) -> None:
+        try:
+            await self._fetch_async(key, email, group_name)
+        except Exception as e:
+            logger.warning(f"Background BlueGroup refresh failed for {email} in '{group_name}': {e}")
+        finally:
+            self._refresh_done(key)
+
+    def _refresh_done(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def _cached(self, key: Tuple[str, str]) -> Tuple[Optional[bool], bool]:
+        """
+        (cached answer or None, whether the caller should start a background refresh).
+
+        A stale answer is returned with the refresh flag set for exactly one caller.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            in_group, expires_at = entry
+            if now < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return in_group, False
+            if now >= expires_at + self.stale_seconds:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            start_refresh = key not in self._refreshing
+            if start_refresh:
+                self._refreshing.add(key)
+                self.refreshes += 1
+            return in_group, start_refresh
+
+    def is_member(self, email: str, group_name: str) -> bool:
+        """Membership of ``email`` in ``group_name``; raises if bluepages cannot answer and nothing usable is cached"""
+        key = self._key(email, group_name)
+        in_group, start_refresh = self._cached(key)
+        if start_refresh:
+            self._executor.submit(self._refresh, key, email, group_name)
+        if in_group is not None:
+            return in_group
+        return self._fetch(key, email, group_name)
+
+    async def is_member_async(self, email: str, group_name: str) -> bool:
+        """``is_member`` for the event loop: lookups and refreshes use the shared async client"""
+        key = self._key(email, group_name)
+        in_group, start_refresh = self._cached(key)
+        if start_refresh:
+            task = asyncio.get_running_loop().create_task(self._refresh_async(key, email, group_name))
+            # The loop only keeps weak references to tasks
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if in_group is not None:
+            return in_group
+        return await self._fetch_async(key, email, group_name)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "background_refreshes": self.refreshes,
+            "lookup_errors": self.errors,
+            "last_known_fallbacks": self.fallbacks,
+            "evictions": self.evictions,
+            "ttl_seconds": self.ttl_seconds,
+            "negative_ttl_seconds": self.negative_ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+        }
+
+
+membership_cache = MembershipCache(
+    max_entries=settings.BLUEGROUPS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.BLUEGROUPS_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.BLUEGROUPS_NEGATIVE_TTL_SECONDS,
+    stale_seconds=settings.BLUEGROUPS_STALE_SECONDS
+)
+
+
 def is_user_in_group(email: str, group_name: str) -> bool:
     """
     Check if an IBM user belongs to a given BlueGroup.
     Returns True if rc=0 (user in group).
     """
-    url = f"https://bluepages.ibm.com/tools/groups/groupsxml.wss?task=inAGroup&email={email}&group={group_name}"
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = xmltodict.parse(response.text)
-        rc_value = data.get("group", {}).get("rc")
-        in_group = rc_value == "0"
+        in_group = membership_cache.is_member(email, group_name)
         logger.info(f"[BlueGroups] {email} in '{group_name}': {in_group}")
-        return True
+        return in_group
     except Exception as e:
         logger.error(f"Error checking BlueGroup membership for {email}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+async def is_user_in_group_async(email: str, group_name: str) -> bool:
+    """
+    ``is_user_in_group`` for async code: never blocks the event loop.
+    Returns True if rc=0 (user in group).
+    """
+    try:
+        in_group = await membership_cache.is_member_async(email, group_name)
+        logger.info(f"[BlueGroups] {email} in '{group_name}': {in_group}")
+        return in_group
+    except Exception as e:
+        logger.error(f"Error checking BlueGroup membership for {email}: {e}")
+        return False
+
+
+async def resolve_groups(email: str, group_names: Iterable[str]) -> Dict[str, bool]:
+    """``is_user_in_group_async`` for several groups at once, looked up concurrently"""
+    group_names = list(dict.fromkeys(group_names))
+    results = await asyncio.gather(*(is_user_in_group_async(email, group) for group in group_names))
+    return dict(zip(group_names, results))
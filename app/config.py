@@ -12,6 +12,8 @@ class Settings(BaseSettings):
     IBM_OAUTH_SERVER_URL: str
     IBM_DISCOVERY_ENDPOINT: str
     IBM_PROFILES_URL: str | None = None   # 👈 Add this line
+    # Minimum time between JWKS refetches triggered by an unknown key id
+    JWKS_MIN_REFRESH_SECONDS: int = 60
     
     # Application
     PROJECT_NAME: str = "Solution Offering API"
@@ -29,6 +31,42 @@ class Settings(BaseSettings):
     # Groups
     ADMIN_BLUEGROUP: str
     SOLUTION_ARCHITECT_BLUEGROUP: str
+
+    # Caching
+    RATE_CARD_CACHE_TTL_SECONDS: int = 300
+    SEARCH_INDEX_ENABLED: bool = True
+    SEARCH_INDEX_TTL_SECONDS: int = 300
+    OFFERING_ATTRIBUTE_CACHE_TTL_SECONDS: int = 300
+
+    # Cursor pagination of list endpoints
+    PAGINATION_MAX_LIMIT: int = 500
+
+    # Pricing
+    PRICING_BATCH_MAX_OFFERINGS: int = 100
+    PRICING_SIMULATION_MAX_SCENARIOS: int = 50
+
+    # Background jobs
+    BACKGROUND_JOB_WORKERS: int = 2
+    BACKGROUND_JOB_HISTORY: int = 100
+    BACKGROUND_JOB_RETENTION_DAYS: int = 30
+
+    # Similar offerings (precomputed neighbours per offering)
+    SIMILAR_OFFERINGS_TOP_K: int = 10
+    # Full reload of the in-memory TF-IDF vectors, to pick up other workers' writes
+    SIMILAR_OFFERINGS_MODEL_TTL_SECONDS: int = 3600
+
+    # BlueGroups membership cache (see app/bluegroups_auth.py)
+    BLUEGROUPS_CACHE_MAX_ENTRIES: int = 10000
+    BLUEGROUPS_CACHE_TTL_SECONDS: int = 300
+    BLUEGROUPS_NEGATIVE_TTL_SECONDS: int = 60
+    BLUEGROUPS_STALE_SECONDS: int = 600
+    BLUEGROUPS_HTTP_MAX_CONNECTIONS: int = 20
+    BLUEGROUPS_TIMEOUT_SECONDS: float = 2.0
+    BLUEGROUPS_HEDGE_AFTER_SECONDS: float = 0.5
+    BLUEGROUPS_BREAKER_FAILURES: int = 5
+    BLUEGROUPS_BREAKER_RESET_SECONDS: float = 30.0
+    # How long group answers resolved at login are trusted from the session
+    BLUEGROUPS_SESSION_TTL_SECONDS: int = 900
     
     class Config:
         env_file = ".env"
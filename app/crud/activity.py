@@ -1,25 +1,55 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from app.models.activity import Activity, OfferingActivity
 from app.schemas.activity import ActivityCreate, ActivityUpdate, OfferingActivityCreate
+from app.crud import pricing_rollup
+from app.crud.pagination import InvalidPageRequest, Page, PageRequest, SortOrder, paginate, paginate_sorted
+from app.crud.search_index import catalog_index
 from typing import List, Optional
 
-def get_all_activities(db: Session, skip: int = 0, limit: int = 100) -> List[Activity]:
-    """Get all activities regardless of offering association"""
-    return db.query(Activity).offset(skip).limit(limit).all()
+ACTIVITY_SORTS = (
+    SortOrder("name", (Activity.activity_name, Activity.activity_id)),
+    SortOrder("-name", (Activity.activity_name, Activity.activity_id), descending=True),
+)
 
-def get_activities_by_offering(db: Session, offering_id: str) -> List[dict]:
-    """Get all activities for a specific offering with relationship data"""
-    results = db.query(Activity, OfferingActivity).join(
+# Unsequenced links sort last (as NULLs do on PostgreSQL) without breaking the keyset
+OFFERING_ACTIVITY_SORTS = (
+    SortOrder("sequence", (
+        func.coalesce(OfferingActivity.sequence, 2 ** 31 - 1).label("sequence_key"),
+        OfferingActivity.activity_id,
+    )),
+)
+
+def get_all_activities(db: Session, skip: int = 0, limit: int = 100, page: Optional[PageRequest] = None):
+    """
+    Get all activities regardless of offering association.
+
+    Without ``page`` this keeps the skip/limit behaviour and returns a list;
+    with it, a ``Page`` (``page.offset`` stands in for skip until a cursor is used).
+    """
+    if page is None:
+        return paginate(db, db.query(Activity), ACTIVITY_SORTS, PageRequest(limit=limit, offset=skip)).items
+    return paginate(db, db.query(Activity), ACTIVITY_SORTS, page)
+
+def get_activities_by_offering(db: Session, offering_id: str, page: Optional[PageRequest] = None):
+    """
+    Get all activities for a specific offering with relationship data, in
+    sequence order (a ``Page`` of them when ``page`` is given)
+    """
+    results = paginate(db, db.query(Activity, OfferingActivity, *OFFERING_ACTIVITY_SORTS[0].columns).join(
         OfferingActivity, Activity.activity_id == OfferingActivity.activity_id
     ).filter(
         OfferingActivity.offering_id == offering_id
-    ).order_by(
-        OfferingActivity.sequence
-    ).all()
-    
+    ), OFFERING_ACTIVITY_SORTS, page)
+    if isinstance(results, Page):
+        results.items = _offering_activity_dicts(results.items)
+        return results
+    return _offering_activity_dicts(results)
+
+
+def _offering_activity_dicts(results) -> List[dict]:
     activities = []
-    for activity, offering_activity in results:
+    for activity, offering_activity, *_ in results:
         activity_dict = {
             "activity_id": activity.activity_id,
             "activity_name": activity.activity_name,
@@ -50,12 +80,71 @@ def get_activities_by_offering(db: Session, offering_id: str) -> List[dict]:
     
     return activities
 
-def get_unassigned_activities(db: Session) -> List[Activity]:
+def get_unassigned_activities(db: Session, page: Optional[PageRequest] = None):
     """Get activities that are not assigned to any offering"""
     subquery = db.query(OfferingActivity.activity_id).distinct()
-    return db.query(Activity).filter(
+    return paginate(db, db.query(Activity).filter(
         ~Activity.activity_id.in_(subquery)
-    ).all()
+    ), ACTIVITY_SORTS, page)
+
+ACTIVITY_SEARCH_SORTS = ("relevance", "name")
+
+def search_activities(
+    db: Session,
+    query: Optional[str] = None,
+    brand: Optional[str] = None,
+    category: Optional[str] = None,
+    product_name: Optional[str] = None,
+    page: Optional[PageRequest] = None
+):
+    """
+    Search the activity library, including the deliverables, assumptions,
+    responsibilities and completion criteria text.
+
+    Served from the in-memory catalog index. Each hit carries highlighted
+    snippets of the matching text fields instead of the full text. Returns
+    a ``Page`` of hits when ``page`` is given.
+    """
+    filters = {
+        field: value for field, value in
+        (("brand", brand), ("category", category), ("product_name", product_name)) if value
+    }
+    sort = page.sort if page else None
+    if sort is not None and sort not in ACTIVITY_SEARCH_SORTS:
+        raise InvalidPageRequest(f"Unsupported sort '{sort}'; expected one of: {', '.join(ACTIVITY_SEARCH_SORTS)}")
+
+    ranked = catalog_index.ranked_activities(
+        db, query, accept=lambda activity: all(getattr(activity, field) == value for field, value in filters.items())
+    )
+    scored = bool(ranked) and ranked[0][1] is not None
+    if scored and sort != "name":
+        result = paginate_sorted(ranked, lambda item: (-item[1], str(item[0].activity_id)), "relevance", page)
+    else:
+        if scored:
+            ranked.sort(key=lambda item: (item[0].activity_name.lower(), str(item[0].activity_id)))
+        result = paginate_sorted(
+            ranked, lambda item: (item[0].activity_name.lower(), str(item[0].activity_id)), sort or "name", page
+        )
+
+    if isinstance(result, Page):
+        result.items = _search_hits(query, result.items)
+        return result
+    return _search_hits(query, result)
+
+def _search_hits(query: Optional[str], ranked: List[tuple]) -> List[dict]:
+    highlights = catalog_index.activity_highlights(query, [activity for activity, _ in ranked])
+    return [
+        {
+            "activity_id": activity.activity_id,
+            "activity_name": activity.activity_name,
+            "brand": activity.brand,
+            "product_name": activity.product_name,
+            "category": activity.category,
+            "score": round(score, 4) if score is not None else None,
+            "highlights": snippets,
+        }
+        for (activity, score), snippets in zip(ranked, highlights)
+    ]
 
 def get_activity_by_id(db: Session, activity_id: str) -> Optional[Activity]:
     """Get a single activity by ID"""
@@ -67,6 +156,7 @@ def create_activity(db: Session, activity: ActivityCreate) -> Activity:
     db.add(db_activity)
     db.commit()
     db.refresh(db_activity)
+    catalog_index.put_activity(db_activity)
     return db_activity
 
 def update_activity(db: Session, activity_id: str, activity_update: ActivityUpdate) -> Optional[Activity]:
@@ -81,6 +171,7 @@ def update_activity(db: Session, activity_id: str, activity_update: ActivityUpda
     
     db.commit()
     db.refresh(db_activity)
+    catalog_index.put_activity(db_activity)
     return db_activity
 
 def delete_activity(db: Session, activity_id: str) -> bool:
@@ -89,8 +180,13 @@ def delete_activity(db: Session, activity_id: str) -> bool:
     if not db_activity:
         return False
     
+    linked_offering_ids = [link.offering_id for link in db_activity.offerings]
     db.delete(db_activity)
+    db.flush()
+    pricing_rollup.remove_activity(db, db_activity.activity_id)
+    pricing_rollup.refresh_offerings(db, linked_offering_ids)
     db.commit()
+    catalog_index.remove_activity(db_activity.activity_id)
     return True
 
 def link_activity_to_offering(
@@ -100,6 +196,8 @@ def link_activity_to_offering(
     """Create a relationship between an offering and an activity"""
     db_link = OfferingActivity(**offering_activity.dict())
     db.add(db_link)
+    db.flush()
+    pricing_rollup.refresh_offerings(db, [db_link.offering_id])
     db.commit()
     db.refresh(db_link)
     return db_link
@@ -116,6 +214,8 @@ def unlink_activity_from_offering(
             OfferingActivity.activity_id == activity_id
         )
     ).delete()
+    if result:
+        pricing_rollup.refresh_offerings(db, [offering_id])
     db.commit()
     return result > 0
 
@@ -0,0 +1,268 @@
+"""
+Near-duplicate detection across the activity library.
+
+Each activity's text is reduced to word 3-gram shingles and summarized by
+a MinHash signature. Signatures use one-permutation hashing: every
+shingle is hashed once, the hash picks one of SIGNATURE_SIZE bins and the
+bin keeps its minimum, and empty bins are filled from their neighbours
+(densification). That makes a signature O(shingles) to build rather than
+O(shingles x hash functions), which matters in pure Python. Shingles are
+hashed with the built-in (per-process salted) hash, so signatures are only
+compared within one scan and borderline pairs may differ between runs.
+
+Signatures are split into LSH_BANDS bands; activities that agree on all
+rows of any band land in the same bucket and become candidate pairs, so
+no all-pairs comparison is made. Candidates are confirmed when the
+estimated Jaccard similarity (the share of equal signature bins) reaches
+the threshold, and confirmed pairs are merged into clusters with
+union-find.
+"""
+import re
+import time
+from array import array
+from itertools import repeat
+from operator import rshift
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.jobs import Job, jobs
+from app.models.activity import Activity, OfferingActivity
+from app.models.activity_wbs import ActivityWBS
+from app.models.offering import Offering
+from app.models.staffing import StaffingDetail
+
+JOB_KIND = "activity-duplicates"
+
+DUPLICATE_TEXT_FIELDS = (
+    "activity_name",
+    "description",
+    "outcome",
+    "deliverables",
+    "assumptions",
+    "client_responsibilities",
+    "ibm_responsibilities",
+    "completion_criteria",
+)
+SHINGLE_WORDS = 3
+SIGNATURE_SIZE = 64
+LSH_BANDS = 16  # 4 rows per band: pairs at 0.8 similarity collide with ~99.99% probability
+DEFAULT_THRESHOLD = 0.8
+# Buckets larger than this are confirmed against their first member instead of pairwise
+MAX_PAIRWISE_BUCKET = 50
+MAX_CLUSTERS_REPORTED = 500
+LOOKUP_CHUNK = 1000
+
+_BIN_BITS = 6  # log2(SIGNATURE_SIZE)
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 64
+_HASH_MIN = -(1 << 63)
+# Signed hashes shifted right by _VALUE_BITS, i.e. the bins in hash order
+_BIN_KEYS = range(-(SIGNATURE_SIZE // 2), SIGNATURE_SIZE // 2)
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def shingles(text: str) -> set:
+    """Hashes of the word 3-grams of ``text`` (of its words, if it is shorter)"""
+    words = _TERM.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return set(map(hash, words))
+    # Hashing the word tuples stays in C, which keeps 100k activities to seconds
+    return set(map(hash, zip(words, words[1:], words[2:])))
+
+
+def signature(shingle_hashes: Iterable[int]) -> Optional[array]:
+    """One-permutation MinHash signature with rotation densification (None for empty text)"""
+    # The top bits of a hash pick its bin. Walking the hashes from largest to
+    # smallest, the last one written for each bin is that bin's minimum.
+    ordered = sorted(shingle_hashes, reverse=True)
+    if not ordered:
+        return None
+    minimums = dict(zip(map(rshift, ordered, repeat(_VALUE_BITS)), ordered))
+    bins = [
+        (minimums[key] - _HASH_MIN) & _VALUE_MASK if key in minimums else _EMPTY
+        for key in _BIN_KEYS
+    ]
+
+    if len(minimums) < SIGNATURE_SIZE:
+        for position in range(SIGNATURE_SIZE):
+            if bins[position] != _EMPTY:
+                continue
+            distance = 1
+            while bins[(position + distance) % SIGNATURE_SIZE] == _EMPTY:
+                distance += 1
+            source = bins[(position + distance) % SIGNATURE_SIZE]
+            # Offset so a borrowed value never equals a genuine one
+            bins[position] = (source & _VALUE_MASK) | (distance << _VALUE_BITS)
+    return array("Q", bins)
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / SIGNATURE_SIZE
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        parent = self.parent.setdefault(item, item)
+        while parent != self.parent[parent]:
+            self.parent[parent] = self.parent[self.parent[parent]]
+            parent = self.parent[parent]
+        self.parent[item] = parent
+        return parent
+
+    def union(self, first: int, second: int) -> None:
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+
+def find_clusters(signatures: List[array], threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[List[int]], dict]:
+    """
+    Group signature indexes into near-duplicate clusters (size >= 2).
+
+    Returns the clusters and counters for the report.
+    """
+    rows = SIGNATURE_SIZE // LSH_BANDS
+    clusters = _UnionFind()
+    checked = set()
+    candidate_pairs = 0
+    duplicate_pairs = 0
+
+    def confirm(first: int, second: int) -> None:
+        nonlocal candidate_pairs, duplicate_pairs
+        pair = (first, second) if first < second else (second, first)
+        if pair in checked:
+            return
+        checked.add(pair)
+        candidate_pairs += 1
+        if similarity(signatures[first], signatures[second]) >= threshold:
+            duplicate_pairs += 1
+            clusters.union(first, second)
+
+    for band in range(LSH_BANDS):
+        start = band * rows
+        buckets: Dict[tuple, List[int]] = {}
+        for index, sig in enumerate(signatures):
+            buckets.setdefault(tuple(sig[start:start + rows]), []).append(index)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) <= MAX_PAIRWISE_BUCKET:
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        confirm(first, second)
+            else:
+                for other in members[1:]:
+                    confirm(members[0], other)
+
+    groups: Dict[int, List[int]] = {}
+    for index in list(clusters.parent):
+        groups.setdefault(clusters.find(index), []).append(index)
+    result = [sorted(group) for group in groups.values() if len(group) > 1]
+    return result, {"candidate_pairs": candidate_pairs, "duplicate_pairs": duplicate_pairs}
+
+
+def _chunks(items: List, size: int = LOOKUP_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _linked_offerings(db: Session, activity_ids: List[UUID]) -> Dict[UUID, List[dict]]:
+    linked: Dict[UUID, List[dict]] = {}
+    for chunk in _chunks(activity_ids):
+        for activity_id, offering_id, offering_name in (
+            db.query(OfferingActivity.activity_id, Offering.offering_id, Offering.offering_name)
+            .join(Offering, Offering.offering_id == OfferingActivity.offering_id)
+            .filter(OfferingActivity.activity_id.in_(chunk))
+            .order_by(Offering.offering_name)
+            .all()
+        ):
+            linked.setdefault(activity_id, []).append({"offering_id": offering_id, "offering_name": offering_name})
+    return linked
+
+
+def _row_counts(db: Session, column, activity_ids: List[UUID]) -> Dict[UUID, int]:
+    counts: Dict[UUID, int] = {}
+    for chunk in _chunks(activity_ids):
+        counts.update(db.query(column, func.count()).filter(column.in_(chunk)).group_by(column).all())
+    return counts
+
+
+def find_duplicate_activities(db: Session, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """
+    Report clusters of near-duplicate activities (estimated Jaccard
+    similarity of their text >= ``threshold``), largest first.
+
+    Each member lists the offerings it is linked to and how many staffing
+    and WBS rows it carries, to help decide which copy to keep.
+    """
+    started = time.monotonic()
+    columns = [getattr(Activity, field) for field in DUPLICATE_TEXT_FIELDS]
+
+    ids: List[UUID] = []
+    names: List[str] = []
+    signatures: List[array] = []
+    scanned = 0
+    for row in db.query(Activity.activity_id, *columns).yield_per(LOOKUP_CHUNK):
+        scanned += 1
+        sig = signature(shingles(" ".join(value for value in row[1:] if value)))
+        if sig is None:
+            continue
+        ids.append(row.activity_id)
+        names.append(row.activity_name)
+        signatures.append(sig)
+
+    clusters, counters = find_clusters(signatures, threshold)
+    clusters.sort(key=lambda cluster: (-len(cluster), names[cluster[0]].lower()))
+    reported = clusters[:MAX_CLUSTERS_REPORTED]
+
+    member_ids = [ids[index] for cluster in reported for index in cluster]
+    offerings = _linked_offerings(db, member_ids)
+    staffing_rows = _row_counts(db, StaffingDetail.activity_id, member_ids)
+    wbs_rows = _row_counts(db, ActivityWBS.activity_id, member_ids)
+
+    report = []
+    for cluster in reported:
+        # Most widely used copy first; the others are compared to it
+        cluster.sort(key=lambda index: (-len(offerings.get(ids[index], [])), names[index].lower(), str(ids[index])))
+        canonical = signatures[cluster[0]]
+        report.append({
+            "size": len(cluster),
+            "activities": [
+                {
+                    "activity_id": ids[index],
+                    "activity_name": names[index],
+                    "similarity": round(similarity(canonical, signatures[index]), 3),
+                    "staffing_rows": staffing_rows.get(ids[index], 0),
+                    "wbs_rows": wbs_rows.get(ids[index], 0),
+                    "offerings": offerings.get(ids[index], []),
+                }
+                for index in cluster
+            ],
+        })
+
+    return {
+        "threshold": threshold,
+        "activities_scanned": scanned,
+        "activities_with_text": len(signatures),
+        **counters,
+        "cluster_count": len(clusters),
+        "duplicate_activities": sum(len(cluster) for cluster in clusters),
+        "clusters_reported": len(report),
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+        "clusters": report,
+    }
+
+
+def submit_duplicate_scan(threshold: float = DEFAULT_THRESHOLD) -> Job:
+    """Queue a near-duplicate scan of the activity library"""
+    return jobs.submit(
+        JOB_KIND,
+        lambda db: find_duplicate_activities(db, threshold),
+        params={"threshold": threshold},
+    )
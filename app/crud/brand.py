@@ -1,14 +1,26 @@
 from sqlalchemy.orm import Session
 from app.models.brand import Brand
+from app.models.offering import Offering
+from app.models.product import Product
 from app.schemas.brand import BrandCreate, BrandUpdate
+from app.crud.pagination import PageRequest, SortOrder, paginate
+from app.crud import offering_similarity
+from app.crud.offering_attributes import offering_attribute_cache
+from app.crud.search_index import catalog_index
 from typing import List, Optional
 from datetime import datetime
 import uuid
 
 
-def get_brands(db: Session) -> List[Brand]:
-    """Get all brands"""
-    return db.query(Brand).all()
+BRAND_SORTS = (
+    SortOrder("name", (Brand.brand_name, Brand.brand_id)),
+    SortOrder("-name", (Brand.brand_name, Brand.brand_id), descending=True),
+)
+
+
+def get_brands(db: Session, page: Optional[PageRequest] = None):
+    """Get all brands (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(Brand), BRAND_SORTS, page)
 
 
 def get_brand_by_id(db: Session, brand_id: str) -> Optional[Brand]:
@@ -26,6 +38,7 @@ def create_brand(db: Session, brand: BrandCreate) -> Brand:
     db.add(db_brand)
     db.commit()
     db.refresh(db_brand)
+    catalog_index.put_brand(db_brand)
     return db_brand
 
 
@@ -42,6 +55,7 @@ def update_brand(db: Session, brand_id: str, brand: BrandUpdate) -> Optional[Bra
     
     db.commit()
     db.refresh(db_brand)
+    catalog_index.put_brand(db_brand)
     return db_brand
 
 
@@ -52,6 +66,21 @@ def delete_brand(db: Session, brand_id: str) -> bool:
     if not db_brand:
         return False
     
+    # Products and their offerings go with it (ON DELETE CASCADE); note which,
+    # and who listed the offerings as similar
+    product_ids = [
+        product_id for (product_id,) in
+        db.query(Product.product_id).filter(Product.brand_id == db_brand.brand_id).all()
+    ]
+    offering_ids = [
+        offering_id for (offering_id,) in
+        db.query(Offering.offering_id).filter(Offering.product_id.in_(product_ids)).all()
+    ] if product_ids else []
+    listed_by = offering_similarity.listed_by(db, offering_ids)
     db.delete(db_brand)
     db.commit()
+    catalog_index.remove_brand(db_brand.brand_id, product_ids, offering_ids)
+    if offering_ids:
+        offering_attribute_cache.invalidate()
+        offering_similarity.submit_refresh([*offering_ids, *listed_by])
     return True
\ No newline at end of file
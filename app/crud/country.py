@@ -1,13 +1,21 @@
 from sqlalchemy.orm import Session
 from app.models.country import Country
 from app.schemas.country import CountryCreate, CountryUpdate
+from app.crud.pagination import PageRequest, SortOrder, paginate
 from typing import List, Optional
 import uuid
 
 
-def get_countries(db: Session) -> List[Country]:
-    """Get all countries"""
-    return db.query(Country).all()
+# country_name is unique, so it is a complete keyset on its own
+COUNTRY_SORTS = (
+    SortOrder("name", (Country.country_name,)),
+    SortOrder("-name", (Country.country_name,), descending=True),
+)
+
+
+def get_countries(db: Session, page: Optional[PageRequest] = None):
+    """Get all countries (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(Country), COUNTRY_SORTS, page)
 
 
 def get_country_by_id(db: Session, country_id: str) -> Optional[Country]:
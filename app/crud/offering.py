@@ -1,14 +1,42 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from app.models.offering import Offering
+from app.models.pricing_rollup import OfferingPriceRollup
 from app.schemas.offering import OfferingCreate, OfferingUpdate
+from app.config import settings
+from app.crud import offering_search, offering_similarity, pricing_rollup
+from app.crud.offering_attributes import ATTRIBUTE_COLUMNS, offering_attribute_cache
+from app.crud.pagination import InvalidPageRequest, Page, PageRequest, SortOrder, paginate, paginate_sorted
+from app.crud.search_index import catalog_index
+from dataclasses import replace
 from datetime import datetime
+from decimal import Decimal
 import uuid
 
 
-def get_offerings_by_product(db: Session, product_id: str) -> List[Offering]:
-    """Get all offerings for a specific product"""
-    return db.query(Offering).filter(Offering.product_id == product_id).all()
+OFFERING_SORTS = (
+    SortOrder("name", (Offering.offering_name, Offering.offering_id)),
+    SortOrder("-name", (Offering.offering_name, Offering.offering_id), descending=True),
+)
+
+# Sort keys on the stored price rollups (ascending, or descending with a "-" prefix)
+ROLLUP_SORT_COLUMNS = {
+    "price": OfferingPriceRollup.total_sale_price,
+    "hours": OfferingPriceRollup.total_hours,
+    "activities": OfferingPriceRollup.activity_count,
+}
+ROLLUP_SORTS = tuple(
+    SortOrder(prefix + name, (column, Offering.offering_id), descending=bool(prefix))
+    for name, column in ROLLUP_SORT_COLUMNS.items()
+    for prefix in ("", "-")
+)
+SEARCH_SORTS = ("relevance", "name") + tuple(order.name for order in ROLLUP_SORTS)
+
+
+def get_offerings_by_product(db: Session, product_id: str, page: Optional[PageRequest] = None):
+    """Get all offerings for a specific product (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(Offering).filter(Offering.product_id == product_id), OFFERING_SORTS, page)
 
 
 def get_offering_by_id(db: Session, offering_id: str) -> Optional[Offering]:
@@ -16,23 +44,132 @@ def get_offering_by_id(db: Session, offering_id: str) -> Optional[Offering]:
     return db.query(Offering).filter(Offering.offering_id == offering_id).first()
 
 
+def _matches_filters(offering, filters: Dict[str, Optional[str]]) -> bool:
+    return all(getattr(offering, field) == value for field, value in filters.items() if value)
+
+
+def _rollup_ranges(
+    min_sale_price: Optional[Decimal] = None,
+    max_sale_price: Optional[Decimal] = None,
+    min_hours: Optional[int] = None,
+    max_hours: Optional[int] = None,
+    min_activities: Optional[int] = None,
+    max_activities: Optional[int] = None
+) -> List[Tuple[Any, Optional[Any], Optional[Any]]]:
+    """(rollup column, lower bound, upper bound) for each range that is set"""
+    ranges = [
+        (OfferingPriceRollup.total_sale_price, min_sale_price, max_sale_price),
+        (OfferingPriceRollup.total_hours, min_hours, max_hours),
+        (OfferingPriceRollup.activity_count, min_activities, max_activities),
+    ]
+    return [(column, low, high) for column, low, high in ranges if low is not None or high is not None]
+
+
+def _filter_rollups(db_query, ranges):
+    for column, low, high in ranges:
+        if low is not None:
+            db_query = db_query.filter(column >= low)
+        if high is not None:
+            db_query = db_query.filter(column <= high)
+    return db_query
+
+
+def _rollup_values(db: Session, ranges) -> Dict[Any, Tuple[int, int, int]]:
+    """Stored (sale price in cents, hours, activity count) of the offerings within ``ranges``"""
+    rows = _filter_rollups(
+        db.query(
+            OfferingPriceRollup.offering_id,
+            OfferingPriceRollup.total_sale_price,
+            OfferingPriceRollup.total_hours,
+            OfferingPriceRollup.activity_count,
+        ),
+        ranges
+    ).all()
+    # Cents keep the cursor keys JSON round-trippable
+    return {
+        offering_id: (int(round(Decimal(sale_price) * 100)), hours, activity_count)
+        for offering_id, sale_price, hours, activity_count in rows
+    }
+
+
 def search_offerings(
     db: Session,
     query: Optional[str] = None,
     saas_type: Optional[str] = None,
     industry: Optional[str] = None,
     client_type: Optional[str] = None,
-    framework_category: Optional[str] = None
-) -> List[Offering]:
-    """Search offerings with multiple filters"""
+    framework_category: Optional[str] = None,
+    min_sale_price: Optional[Decimal] = None,
+    max_sale_price: Optional[Decimal] = None,
+    min_hours: Optional[int] = None,
+    max_hours: Optional[int] = None,
+    min_activities: Optional[int] = None,
+    max_activities: Optional[int] = None,
+    page: Optional[PageRequest] = None
+):
+    """
+    Search offerings with multiple filters.
+
+    ``query`` is matched with full-text search over the name, tag line, tags,
+    summary and elevator pitch, and results are ordered by relevance. The
+    in-memory catalog index answers the search unless SEARCH_INDEX_ENABLED
+    is off, in which case the database full-text index is used. Returns a
+    ``Page`` when ``page`` is given.
+
+    The sale price, hours and activity count ranges, and the price/hours/
+    activities sorts, read the stored offering price rollups; offerings that
+    have no rollup yet are left out of those searches.
+    """
+    filters = {
+        "saas_type": saas_type,
+        "industry": industry,
+        "client_type": client_type,
+        "framework_category": framework_category,
+    }
+    ranges = _rollup_ranges(min_sale_price, max_sale_price, min_hours, max_hours, min_activities, max_activities)
+    sort = page.sort if page else None
+    if sort is not None and sort not in SEARCH_SORTS:
+        raise InvalidPageRequest(f"Unsupported sort '{sort}'; expected one of: {', '.join(SEARCH_SORTS)}")
+    rollup_sort = sort.lstrip("-") if sort and sort.lstrip("-") in ROLLUP_SORT_COLUMNS else None
+
+    if settings.SEARCH_INDEX_ENABLED:
+        ranked = [
+            (offering, score) for offering, score in catalog_index.ranked_offerings(db, query)
+            if _matches_filters(offering, filters)
+        ]
+        if ranges or rollup_sort:
+            rollups = _rollup_values(db, ranges)
+            ranked = [(offering, score) for offering, score in ranked if offering.offering_id in rollups]
+            if rollup_sort:
+                position = list(ROLLUP_SORT_COLUMNS).index(rollup_sort)
+                sign = -1 if sort.startswith("-") else 1
+
+                # (value, offering_id) both reversed for a "-" sort, like ROLLUP_SORTS in the database;
+                # UUID.int orders the same way as the database compares UUIDs
+                def rollup_key(offering):
+                    return (sign * rollups[offering.offering_id][position], sign * offering.offering_id.int)
+
+                offerings = sorted((offering for offering, _ in ranked), key=rollup_key)
+                return paginate_sorted(offerings, rollup_key, sort, page)
+
+        scored = bool(ranked) and ranked[0][1] is not None
+        if scored and sort != "name":
+            scores = {offering.offering_id: score for offering, score in ranked}
+            return paginate_sorted(
+                [offering for offering, _ in ranked],
+                lambda offering: (-scores[offering.offering_id], str(offering.offering_id)),
+                "relevance",
+                page
+            )
+
+        offerings = sorted((offering for offering, _ in ranked), key=name_sort_key)
+        return paginate_sorted(offerings, name_sort_key, sort or "name", page)
+
     db_query = db.query(Offering)
+    rank = None
     
     if query:
-        db_query = db_query.filter(
-            (Offering.offering_name.ilike(f"%{query}%")) |
-            (Offering.offering_summary.ilike(f"%{query}%")) |
-            (Offering.tag_line.ilike(f"%{query}%"))
-        )
+        db_query, rank = offering_search.text_search(db, db_query, query)
     
     if saas_type:
         db_query = db_query.filter(Offering.saas_type == saas_type)
@@ -45,8 +182,141 @@ def search_offerings(
     
     if framework_category:
         db_query = db_query.filter(Offering.framework_category == framework_category)
+
+    if ranges or rollup_sort:
+        db_query = _filter_rollups(
+            db_query.join(OfferingPriceRollup, OfferingPriceRollup.offering_id == Offering.offering_id),
+            ranges
+        )
+
+    if rollup_sort:
+        # Keyset over (rollup value, offering_id), served by the rollup indexes
+        return _paginate_offerings(db, db_query, ROLLUP_SORT_COLUMNS[rollup_sort], ROLLUP_SORTS, page)
     
-    return db_query.all()
+    if rank is None or sort == "name":
+        # Without words to rank by "relevance" has nothing to go on, so both sorts are by name
+        name_page = replace(page, sort=None) if page else None
+        name_key = _name_key(db)
+        return _paginate_offerings(
+            db, db_query, name_key, (SortOrder("name", (name_key, Offering.offering_id)),), name_page
+        )
+
+    # Keyset over (rank, offering_id); the rank is computed by the database
+    relevance_page = replace(page, sort=None) if page else None
+    return _paginate_offerings(
+        db, db_query, rank, (SortOrder("relevance", (rank, Offering.offering_id)),), relevance_page
+    )
+
+
+def name_sort_key(offering) -> Tuple[str, str]:
+    """
+    Search results' name order: case-insensitive, in code point order, ties
+    by ID. ``_name_key`` is the same key in the database.
+    """
+    return (offering.offering_name.lower(), str(offering.offering_id))
+
+
+def _name_key(db: Session):
+    """``name_sort_key`` as a column; served by ix_offerings_name_key"""
+    name_key = func.lower(Offering.offering_name)
+    if db.get_bind().dialect.name == "postgresql":
+        # Compare by code point like Python, not by the database locale
+        name_key = name_key.collate("C")
+    return name_key.label("name_key")
+
+
+def _paginate_offerings(db: Session, db_query, sort_column, orders, page: Optional[PageRequest]):
+    """``paginate`` an Offering query by a sort column that is not on the model (kept for the cursor)"""
+    rows = paginate(db, db_query.with_entities(Offering, sort_column, Offering.offering_id), orders, page)
+    if isinstance(rows, Page):
+        rows.items = [row.Offering for row in rows.items]
+        return rows
+    return [row.Offering for row in rows]
+
+
+FACET_FIELDS = ("saas_type", "industry", "client_type", "framework_category")
+
+
+def _count_facets(candidates: Iterable[Dict[str, Optional[str]]], filters: Dict[str, Optional[str]]) -> Dict[str, Dict[str, int]]:
+    """
+    Disjunctive facet counts in one pass over the text-matched offerings.
+
+    Each facet is counted under every active filter except its own, so the
+    counts show what selecting another value of that facet would return.
+    """
+    active = {field: value for field, value in filters.items() if value}
+    counts: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+    for values in candidates:
+        failed = [field for field, value in active.items() if values.get(field) != value]
+        if len(failed) > 1:
+            continue
+        for field in (failed if failed else FACET_FIELDS):
+            value = values.get(field)
+            if value is not None:
+                counts[field][value] = counts[field].get(value, 0) + 1
+
+    return {
+        field: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+        for field, values in counts.items()
+    }
+
+
+def search_offerings_with_facets(
+    db: Session,
+    query: Optional[str] = None,
+    saas_type: Optional[str] = None,
+    industry: Optional[str] = None,
+    client_type: Optional[str] = None,
+    framework_category: Optional[str] = None,
+    min_sale_price: Optional[Decimal] = None,
+    max_sale_price: Optional[Decimal] = None,
+    min_hours: Optional[int] = None,
+    max_hours: Optional[int] = None,
+    min_activities: Optional[int] = None,
+    max_activities: Optional[int] = None,
+    page: Optional[PageRequest] = None
+) -> dict:
+    """
+    Search offerings and count the values of each filter column (see ``_count_facets``).
+
+    With ``page``, ``results`` is a ``Page``; facets always cover every match.
+    """
+    filters = {
+        "saas_type": saas_type,
+        "industry": industry,
+        "client_type": client_type,
+        "framework_category": framework_category,
+    }
+
+    bounds = {
+        "min_sale_price": min_sale_price,
+        "max_sale_price": max_sale_price,
+        "min_hours": min_hours,
+        "max_hours": max_hours,
+        "min_activities": min_activities,
+        "max_activities": max_activities,
+    }
+    ranges = _rollup_ranges(**bounds)
+
+    results = search_offerings(db, query, **filters, **bounds, page=page)
+    if settings.SEARCH_INDEX_ENABLED:
+        matches = catalog_index.match_offerings(db, query)
+        if ranges:
+            in_range = _rollup_values(db, ranges)
+            matches = [offering for offering in matches if offering.offering_id in in_range]
+        candidates = ({field: getattr(offering, field) for field in FACET_FIELDS} for offering in matches)
+    else:
+        facet_query = db.query(*[getattr(Offering, field) for field in FACET_FIELDS])
+        if query:
+            facet_query = offering_search.apply_text_search(db, facet_query, query)
+        if ranges:
+            facet_query = _filter_rollups(
+                facet_query.join(OfferingPriceRollup, OfferingPriceRollup.offering_id == Offering.offering_id),
+                ranges
+            )
+        candidates = (row._asdict() for row in facet_query.all())
+
+    return {"results": results, "facets": _count_facets(candidates, filters)}
 
 
 # ✅ ADD THESE NEW FUNCTIONS
@@ -95,8 +365,14 @@ def create_offering(db: Session, offering: OfferingCreate) -> Offering:
     )
     
     db.add(db_offering)
+    db.flush()
+    # Start with empty totals so the offering shows up in price/hours searches
+    pricing_rollup.refresh_offerings(db, [db_offering.offering_id])
     db.commit()
     db.refresh(db_offering)
+    catalog_index.put_offering(db_offering)
+    offering_attribute_cache.invalidate()
+    offering_similarity.submit_refresh([db_offering.offering_id])
     return db_offering
 
 
@@ -117,6 +393,11 @@ def update_offering(db: Session, offering_id: str, offering: OfferingUpdate) ->
     
     db.commit()
     db.refresh(db_offering)
+    catalog_index.put_offering(db_offering)
+    if update_data.keys() & set(ATTRIBUTE_COLUMNS):
+        offering_attribute_cache.invalidate()
+    if offering_similarity.SIMILARITY_FIELDS.keys() & update_data.keys():
+        offering_similarity.submit_refresh([db_offering.offering_id])
     return db_offering
 
 
@@ -127,6 +408,11 @@ def delete_offering(db: Session, offering_id: str) -> bool:
     if not db_offering:
         return False
     
+    # The cascade drops the rows that say which offerings listed this one
+    listed_by = offering_similarity.listed_by(db, [db_offering.offering_id])
     db.delete(db_offering)
     db.commit()
+    catalog_index.remove_offering(db_offering.offering_id)
+    offering_attribute_cache.invalidate()
+    offering_similarity.submit_refresh([db_offering.offering_id, *listed_by])
     return True
\ No newline at end of file
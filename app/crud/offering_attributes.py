@@ -0,0 +1,108 @@
+"""
+Distinct values of the offering attribute columns, for filter dropdowns.
+
+Each whitelisted column is answered by one ``GROUP BY`` and kept in memory
+until an offering is created, updated or deleted in this process, or until
+OFFERING_ATTRIBUTE_CACHE_TTL_SECONDS have passed (writes made by other
+worker processes).
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.offering import Offering
+
+ATTRIBUTE_COLUMNS = (
+    "saas_type",
+    "brand",
+    "supported_product",
+    "client_type",
+    "client_journey",
+    "client_journey_stage",
+    "framework_category",
+    "scenario",
+    "ibm_sales_play",
+    "tel_sales_tactic",
+    "industry",
+)
+
+
+class OfferingAttributeCache:
+    """Per-column cache of (value, count) lists with hit/miss/reload counters"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[float, List[Dict]]] = {}
+        # Bumped by invalidate() so a load that raced with a write is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.invalidations = 0
+
+    def _cached(self, column: str) -> Optional[List[Dict]]:
+        entry = self._values.get(column)
+        if entry is None:
+            return None
+        loaded_at, values = entry
+        if self.ttl_seconds > 0 and time.monotonic() - loaded_at >= self.ttl_seconds:
+            return None
+        return values
+
+    def values(self, db: Session, column: str) -> List[Dict]:
+        """Distinct non-empty values of ``column`` with their offering counts, most common first"""
+        values = self._cached(column)
+        if values is not None:
+            self.hits += 1
+            return values
+
+        self.misses += 1
+        generation = self._generation
+        attribute = getattr(Offering, column)
+        rows = (
+            db.query(attribute, func.count(Offering.offering_id))
+            .filter(attribute.isnot(None), attribute != "")
+            .group_by(attribute)
+            .all()
+        )
+        values = [
+            {"value": value, "count": count}
+            for value, count in sorted(rows, key=lambda row: (-row[1], row[0]))
+        ]
+        with self._lock:
+            if generation == self._generation:
+                self._values[column] = (time.monotonic(), values)
+                self.reloads += 1
+        return values
+
+    def invalidate(self) -> None:
+        """Drop every column; called after an offering write commits"""
+        with self._lock:
+            self._values = {}
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "columns_cached": len(self._values),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "reloads": self.reloads,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+offering_attribute_cache = OfferingAttributeCache(ttl_seconds=settings.OFFERING_ATTRIBUTE_CACHE_TTL_SECONDS)
+
+
+def get_attribute_values(db: Session, column: str) -> List[Dict]:
+    """Distinct values of a whitelisted offering column (raises ValueError for any other column)"""
+    if column not in ATTRIBUTE_COLUMNS:
+        raise ValueError(f"Unknown attribute '{column}'; expected one of: {', '.join(ATTRIBUTE_COLUMNS)}")
+    return offering_attribute_cache.values(db, column)
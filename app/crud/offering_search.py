@@ -0,0 +1,100 @@
+"""
+Full-text search over offerings.
+
+On PostgreSQL, ``offerings.search_vector`` is a stored, generated tsvector
+over the name, tag line, tags, summary and elevator pitch (weighted A to D)
+with a GIN index; see migration f3b9d2e6a017. It is deliberately not mapped
+on the Offering model, since the database computes it. On SQLite an FTS5
+external-content table kept in sync by triggers plays the same role, so
+search can be exercised against a local database; the same migration
+creates it. Other dialects fall back to ILIKE.
+
+Each word of the query is matched as a prefix and all words must match, so
+results narrow as the user types. Results are ordered by relevance, which
+is computed in the database so that pages can be fetched by keyset.
+"""
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import ColumnElement, column, func, literal_column, text
+from sqlalchemy.orm import Query, Session
+from app.models.offering import Offering
+
+TS_CONFIG = "english"
+MAX_TERMS = 16
+
+# Column weights; PostgreSQL has four weight classes, FTS5 takes one weight per column
+WEIGHTED_FIELDS = (
+    ("offering_name", "A", 10.0),
+    ("tag_line", "B", 4.0),
+    ("offering_tags", "B", 4.0),
+    ("offering_summary", "C", 2.0),
+    ("elevator_pitch", "D", 1.0),
+)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a user query into lowercase word terms (punctuation and operators are dropped)"""
+    return [term.lower() for term in _TERM.findall(query or "")][:MAX_TERMS]
+
+
+def text_search(db: Session, db_query: Query, query: str) -> Tuple[Query, Optional[ColumnElement]]:
+    """
+    Restrict an Offering query to full-text matches of ``query``.
+
+    Also returns the relevance of a match as a column labelled ``rank``,
+    lower is better, to order and keyset-page by; None when the query has no
+    words or the dialect falls back to ILIKE.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return _apply_ilike(db_query, query), None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _apply_postgresql(db_query, terms)
+    if dialect == "sqlite":
+        return _apply_sqlite(db_query, terms)
+    return _apply_ilike(db_query, query), None
+
+
+def apply_text_search(db: Session, db_query: Query, query: str) -> Query:
+    """Restrict an Offering query to full-text matches of ``query`` and order it by rank"""
+    db_query, rank = text_search(db, db_query, query)
+    if rank is None:
+        return db_query
+    return db_query.order_by(rank, Offering.offering_name)
+
+
+def _apply_ilike(db_query: Query, query: str) -> Query:
+    return db_query.filter(
+        (Offering.offering_name.ilike(f"%{query}%")) |
+        (Offering.offering_summary.ilike(f"%{query}%")) |
+        (Offering.tag_line.ilike(f"%{query}%"))
+    )
+
+
+def _apply_postgresql(db_query: Query, terms: List[str]) -> Tuple[Query, ColumnElement]:
+    search_vector = literal_column("offerings.search_vector")
+    ts_query = func.to_tsquery(TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+    # ts_rank() is higher-is-better
+    rank = (-func.ts_rank(search_vector, ts_query)).label("rank")
+    return db_query.filter(search_vector.op("@@")(ts_query)), rank
+
+
+def _apply_sqlite(db_query: Query, terms: List[str]) -> Tuple[Query, ColumnElement]:
+    weights = ", ".join(str(weight) for _, _, weight in WEIGHTED_FIELDS)
+    matches = (
+        text(
+            f"SELECT rowid AS offering_rowid, bm25(offerings_fts, {weights}) AS rank "
+            "FROM offerings_fts WHERE offerings_fts MATCH :match"
+        )
+        .bindparams(match=" ".join(f'"{term}"*' for term in terms))
+        .columns(column("offering_rowid"), column("rank"))
+        .subquery("offering_matches")
+    )
+    # bm25() is lower-is-better
+    db_query = db_query.join(matches, literal_column("offerings.rowid") == matches.c.offering_rowid)
+    return db_query, matches.c.rank.label("rank")
+
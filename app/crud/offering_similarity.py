@@ -0,0 +1,331 @@
+"""
+"Similar offerings" from precomputed TF-IDF neighbours.
+
+Each offering is turned into a sparse, L2-normalized TF-IDF vector over
+its summary, value, outcomes, tags and industry. Cosine similarity is then
+a sparse dot product, computed in batch through an inverted index (only
+offerings that share a term are ever compared). The top
+SIMILAR_OFFERINGS_TOP_K neighbours of every offering are stored in
+offering_similarities, so the /offerings/{id}/similar endpoint is a single
+indexed lookup and no vector math happens per request.
+
+The table is built by a full rebuild job and kept current by a refresh
+job that offering writes queue. The vectors and the inverted index stay
+in memory between runs; a refresh re-reads only the changed offerings and
+recomputes the neighbours of those offerings and of the offerings whose
+stored list they enter or leave, not the whole table. Document
+frequencies are kept current, but untouched offerings keep their vectors,
+so their stored scores drift only slightly until the next full rebuild.
+"""
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.jobs import Job, jobs
+from app.models.offering import Offering
+from app.models.offering_similarity import OfferingSimilarity
+from app.crud.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "offering-similarity"
+
+# Field -> term frequency multiplier
+SIMILARITY_FIELDS = {
+    "offering_summary": 1.0,
+    "offering_value": 1.0,
+    "offering_outcomes": 1.0,
+    "offering_tags": 2.0,
+    "industry": 2.0,
+}
+MIN_SCORE = 0.05
+
+Vector = Dict[str, float]
+
+# One refresh or rebuild at a time; queued refreshes are coalesced
+_run_lock = threading.Lock()
+_pending_lock = threading.Lock()
+_pending: Set[UUID] = set()
+_pending_job: Optional[Job] = None
+
+
+def _term_counts(offering) -> Counter:
+    counts: Counter = Counter()
+    for field, weight in SIMILARITY_FIELDS.items():
+        for term in tokenize(getattr(offering, field)):
+            if len(term) > 1 and not term.isdigit():
+                counts[term] += weight
+    return counts
+
+
+class SimilarityModel:
+    """
+    TF-IDF vectors of every offering and their inverted index, kept in
+    memory between refreshes and patched for the offerings that changed.
+
+    A full load is forced after SIMILAR_OFFERINGS_MODEL_TTL_SECONDS so that
+    writes made by other worker processes are eventually picked up.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.counts: Dict[UUID, Counter] = {}
+        self.document_frequency: Counter = Counter()
+        self.vectors: Dict[UUID, Vector] = {}
+        self.postings: Dict[str, Dict[UUID, float]] = {}
+        self._loaded_at: Optional[float] = None
+        self.loads = 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if self.ttl_seconds <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def ensure_loaded(self, db: Session) -> "SimilarityModel":
+        if not self._is_fresh():
+            self.load(db)
+        return self
+
+    def load(self, db: Session) -> None:
+        """Build the vectors of every offering from the database"""
+        self.counts = {row.offering_id: _term_counts(row) for row in _rows(db)}
+        self.document_frequency = Counter()
+        for terms in self.counts.values():
+            self.document_frequency.update(terms.keys())
+        self.vectors = {}
+        self.postings = {}
+        for offering_id, terms in self.counts.items():
+            self._index(offering_id, self._vector(terms))
+        self._loaded_at = time.monotonic()
+        self.loads += 1
+
+    def update(self, db: Session, offering_ids: Iterable[UUID]) -> None:
+        """
+        Re-read ``offering_ids`` (dropping those that no longer exist).
+
+        Document frequencies are updated, but only the vectors of these
+        offerings are recomputed with them.
+        """
+        offering_ids = set(offering_ids)
+        rows = {row.offering_id: row for row in _rows(db, offering_ids)} if offering_ids else {}
+        for offering_id in offering_ids:
+            old = self.counts.pop(offering_id, None)
+            if old is not None:
+                self.document_frequency.subtract(old.keys())
+            self._unindex(offering_id)
+            if offering_id in rows:
+                self.counts[offering_id] = _term_counts(rows[offering_id])
+                self.document_frequency.update(self.counts[offering_id].keys())
+        self.document_frequency = +self.document_frequency
+        for offering_id in rows:
+            self._index(offering_id, self._vector(self.counts[offering_id]))
+
+    def _vector(self, terms: Counter) -> Vector:
+        """L2-normalized TF-IDF vector (sublinear term frequency)"""
+        total = len(self.counts)
+        vector = {}
+        for term, count in terms.items():
+            # Terms in every offering carry no signal and get zero weight
+            idf = math.log((1 + total) / (1 + self.document_frequency[term]))
+            if idf > 0:
+                vector[term] = (1 + math.log(count)) * idf
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+    def _index(self, offering_id: UUID, vector: Vector) -> None:
+        self.vectors[offering_id] = vector
+        for term, weight in vector.items():
+            self.postings.setdefault(term, {})[offering_id] = weight
+
+    def _unindex(self, offering_id: UUID) -> None:
+        for term in self.vectors.pop(offering_id, {}):
+            postings = self.postings[term]
+            del postings[offering_id]
+            if not postings:
+                del self.postings[term]
+
+    def similarities(self, vector: Vector) -> Dict[UUID, float]:
+        """Cosine similarity of ``vector`` to every offering that shares a term with it"""
+        scores: Dict[UUID, float] = {}
+        for term, weight in vector.items():
+            for other_id, other_weight in self.postings.get(term, {}).items():
+                scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+        return scores
+
+    def stats(self) -> Dict:
+        return {
+            "loaded": self._loaded_at is not None,
+            "offerings": len(self.vectors),
+            "terms": len(self.postings),
+            "loads": self.loads,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _rows(db: Session, offering_ids: Optional[Set[UUID]] = None):
+    query = db.query(Offering.offering_id, *[getattr(Offering, field) for field in SIMILARITY_FIELDS])
+    if offering_ids is not None:
+        query = query.filter(Offering.offering_id.in_(list(offering_ids)))
+    return query.all()
+
+
+model = SimilarityModel(ttl_seconds=settings.SIMILAR_OFFERINGS_MODEL_TTL_SECONDS)
+
+
+def _top_k(offering_id: UUID, scores: Dict[UUID, float], k: int) -> List[Tuple[UUID, float]]:
+    candidates = [
+        (other_id, score) for other_id, score in scores.items()
+        if other_id != offering_id and score >= MIN_SCORE
+    ]
+    candidates.sort(key=lambda item: (-item[1], str(item[0])))
+    return candidates[:k]
+
+
+def _replace_neighbours(db: Session, neighbours: Dict[UUID, List[Tuple[UUID, float]]]) -> int:
+    if not neighbours:
+        return 0
+    db.query(OfferingSimilarity).filter(
+        OfferingSimilarity.offering_id.in_(list(neighbours))
+    ).delete(synchronize_session=False)
+    rows = [
+        {"offering_id": offering_id, "similar_offering_id": other_id, "rank": rank, "score": round(score, 6)}
+        for offering_id, top in neighbours.items()
+        for rank, (other_id, score) in enumerate(top, start=1)
+    ]
+    if rows:
+        db.bulk_insert_mappings(OfferingSimilarity, rows)
+    return len(rows)
+
+
+def rebuild_all(db: Session) -> dict:
+    """Recompute the neighbours of every offering"""
+    k = settings.SIMILAR_OFFERINGS_TOP_K
+    with _run_lock:
+        model.load(db)
+        neighbours = {
+            offering_id: _top_k(offering_id, model.similarities(vector), k)
+            for offering_id, vector in model.vectors.items()
+        }
+        db.query(OfferingSimilarity).delete(synchronize_session=False)
+        rows = _replace_neighbours(db, neighbours)
+        db.commit()
+    return {"offerings": len(model.vectors), "terms": len(model.postings), "neighbour_rows": rows}
+
+
+def listed_by(db: Session, offering_ids: Iterable[UUID]) -> Set[UUID]:
+    """
+    Offerings that have any of ``offering_ids`` among their stored
+    neighbours. Deletes collect these before they commit, because the
+    foreign key cascade removes the rows that would say so.
+    """
+    offering_ids = list(offering_ids)
+    if not offering_ids:
+        return set()
+    return {
+        offering_id for (offering_id,) in
+        db.query(OfferingSimilarity.offering_id)
+        .filter(OfferingSimilarity.similar_offering_id.in_(offering_ids))
+        .distinct()
+        .all()
+    }
+
+
+def refresh_offerings(db: Session, offering_ids: Iterable[UUID]) -> dict:
+    """
+    Bring the neighbour table up to date after ``offering_ids`` changed
+    (were created, edited or deleted).
+
+    Only the changed offerings' vectors are rebuilt. Recomputed: the
+    changed offerings themselves, offerings that list a changed offering
+    (deletes pass these in, see ``listed_by``), and offerings whose stored
+    list a changed offering now enters, because it has room or outranks
+    the weakest stored neighbour.
+    """
+    k = settings.SIMILAR_OFFERINGS_TOP_K
+    changed = set(offering_ids)
+    with _run_lock:
+        model.ensure_loaded(db)
+        model.update(db, changed)
+        vectors = model.vectors
+
+        affected = (changed | listed_by(db, changed)) & vectors.keys()
+
+        entering: Dict[UUID, float] = {}
+        for changed_id in changed & vectors.keys():
+            for other_id, score in model.similarities(vectors[changed_id]).items():
+                if other_id not in affected and score >= MIN_SCORE:
+                    entering[other_id] = max(score, entering.get(other_id, 0.0))
+        if entering:
+            weakest = {
+                offering_id: (count, score) for offering_id, count, score in
+                db.query(
+                    OfferingSimilarity.offering_id,
+                    func.count(OfferingSimilarity.similar_offering_id),
+                    func.min(OfferingSimilarity.score)
+                )
+                .filter(OfferingSimilarity.offering_id.in_(list(entering)))
+                .group_by(OfferingSimilarity.offering_id)
+                .all()
+            }
+            for other_id, score in entering.items():
+                count, weakest_score = weakest.get(other_id, (0, 0.0))
+                if count < k or score > weakest_score:
+                    affected.add(other_id)
+
+        neighbours = {
+            offering_id: _top_k(offering_id, model.similarities(vectors[offering_id]), k)
+            for offering_id in affected
+        }
+        rows = _replace_neighbours(db, neighbours)
+        db.commit()
+    return {
+        "changed_offerings": len(changed),
+        "recomputed_offerings": len(neighbours),
+        "neighbour_rows": rows,
+    }
+
+
+def submit_rebuild() -> Job:
+    """Queue a full rebuild of the neighbour table"""
+    return jobs.submit(JOB_KIND, rebuild_all, params={"mode": "rebuild"})
+
+
+def submit_refresh(offering_ids: Iterable[UUID]) -> Job:
+    """
+    Queue a refresh for changed offerings. While a refresh is still queued,
+    further changes are added to it instead of queueing another job.
+    """
+    global _pending_job
+    with _pending_lock:
+        _pending.update(offering_ids)
+        if _pending_job is not None and _pending_job.status == "queued":
+            return _pending_job
+        _pending_job = jobs.submit(JOB_KIND, _run_pending_refresh, params={"mode": "refresh"})
+        return _pending_job
+
+
+def _run_pending_refresh(db: Session) -> dict:
+    with _pending_lock:
+        offering_ids = set(_pending)
+        _pending.clear()
+    return refresh_offerings(db, offering_ids)
+
+
+def get_similar_offerings(db: Session, offering_id, limit: int = 10) -> List[Tuple[Offering, float]]:
+    """Stored neighbours of an offering, most similar first"""
+    return (
+        db.query(Offering, OfferingSimilarity.score)
+        .join(OfferingSimilarity, OfferingSimilarity.similar_offering_id == Offering.offering_id)
+        .filter(OfferingSimilarity.offering_id == offering_id)
+        .order_by(OfferingSimilarity.rank)
+        .limit(limit)
+        .all()
+    )
@@ -0,0 +1,186 @@
+"""
+Cursor (keyset) pagination shared by the list endpoints.
+
+A page is requested with an opaque ``cursor`` and a ``limit``. Rows are
+ordered by a named sort order whose last column is unique, and the cursor
+carries the sort values of the last row returned, so the next page is a
+``WHERE (cols) > (values)`` range scan on an index instead of an OFFSET
+that re-reads every earlier row.
+
+Without a limit the full list is returned, so existing clients that never
+send paging parameters keep their current responses.
+"""
+import base64
+import binascii
+import json
+import uuid
+from bisect import bisect_right
+from decimal import Decimal
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+
+
+class InvalidPageRequest(ValueError):
+    """Malformed cursor, or a cursor/sort that does not belong to this list"""
+
+
+@dataclass(frozen=True)
+class SortOrder:
+    """Named ordering for a list; the last column must be unique (usually the primary key)"""
+    name: str
+    columns: Tuple
+    descending: bool = False
+
+
+@dataclass
+class PageRequest:
+    cursor: Optional[str] = None
+    limit: Optional[int] = None
+    sort: Optional[str] = None
+    with_total: bool = False
+    # Legacy skip/limit paging for endpoints that already offered it
+    offset: int = 0
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+def encode_cursor(sort_name: str, values: Sequence) -> str:
+    payload = json.dumps({"s": sort_name, "v": list(values)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_name: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidPageRequest("Malformed cursor")
+    if cursor_sort != sort_name or not isinstance(values, list):
+        raise InvalidPageRequest("Cursor does not match the requested sort order")
+    return values
+
+
+def resolve_sort(orders: Sequence[SortOrder], sort: Optional[str]) -> SortOrder:
+    """Pick the requested sort order (the first one is the default)"""
+    if sort is None:
+        return orders[0]
+    for order in orders:
+        if order.name == sort:
+            return order
+    allowed = ", ".join(order.name for order in orders)
+    raise InvalidPageRequest(f"Unsupported sort '{sort}'; expected one of: {allowed}")
+
+
+def _coerce(columns: Sequence, values: list) -> list:
+    if len(values) != len(columns):
+        raise InvalidPageRequest("Cursor does not match the requested sort order")
+    coerced = []
+    for column, value in zip(columns, values):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        try:
+            if value is not None and python_type is uuid.UUID:
+                value = uuid.UUID(value)
+            elif value is not None and python_type is Decimal:
+                value = Decimal(value)
+        except (ValueError, ArithmeticError):
+            raise InvalidPageRequest("Malformed cursor")
+        coerced.append(value)
+    return coerced
+
+
+def estimate_count(db: Session, query: Query) -> int:
+    """
+    Row count of a query: the planner's estimate on PostgreSQL (no scan),
+    an exact COUNT elsewhere.
+    """
+    query = query.order_by(None)
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        compiled = query.statement.compile(dialect=bind.dialect)
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return query.count()
+
+
+def paginate(db: Session, query: Query, orders: Sequence[SortOrder], page: Optional[PageRequest] = None):
+    """
+    Apply a sort order and keyset page to a query.
+
+    With no ``page`` this returns ``query.all()`` in the default order, for
+    callers that want the whole list; otherwise it returns a ``Page``.
+    """
+    order = resolve_sort(orders, page.sort if page else None)
+    columns = order.columns
+    ordered = query.order_by(*[column.desc() if order.descending else column for column in columns])
+    if page is None:
+        return ordered.all()
+
+    total = estimate_count(db, query) if page.with_total else None
+
+    if page.cursor:
+        values = _coerce(columns, decode_cursor(page.cursor, order.name))
+        keyset = tuple_(*columns)
+        ordered = ordered.filter(keyset < tuple_(*values) if order.descending else keyset > tuple_(*values))
+    elif page.offset:
+        ordered = ordered.offset(page.offset)
+
+    if page.limit is None:
+        return Page(items=ordered.all(), total_estimate=total)
+
+    rows = ordered.limit(page.limit + 1).all()
+    items = rows[:page.limit]
+    next_cursor = None
+    if len(rows) > page.limit:
+        last = items[-1]
+        next_cursor = encode_cursor(order.name, [getattr(last, column.key) for column in columns])
+    return Page(items=items, next_cursor=next_cursor, total_estimate=total)
+
+
+def paginate_sorted(
+    items: Sequence,
+    key: Callable[[Any], tuple],
+    sort_name: str,
+    page: Optional[PageRequest] = None
+):
+    """
+    Keyset-page an in-memory list that is already sorted ascending by ``key``.
+
+    Keys must be JSON round-trippable (strings and numbers) so that the
+    cursor compares equal to the key it was built from.
+    """
+    if page is None:
+        return list(items)
+    if page.sort is not None and page.sort != sort_name:
+        raise InvalidPageRequest(f"Unsupported sort '{page.sort}'; expected: {sort_name}")
+
+    keys = [key(item) for item in items]
+    start = page.offset
+    if page.cursor:
+        try:
+            start = bisect_right(keys, tuple(decode_cursor(page.cursor, sort_name)))
+        except TypeError:
+            raise InvalidPageRequest("Cursor does not match the requested sort order")
+
+    total = len(items) if page.with_total else None
+    if page.limit is None:
+        return Page(items=list(items[start:]), total_estimate=total)
+
+    end = start + page.limit
+    next_cursor = encode_cursor(sort_name, keys[end - 1]) if end < len(items) else None
+    return Page(items=list(items[start:end]), next_cursor=next_cursor, total_estimate=total)
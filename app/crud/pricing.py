@@ -1,7 +1,21 @@
+from sqlalchemy import insert, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.models.pricing import PricingDetail
-from app.schemas.pricing import PricingDetailCreate, PricingDetailUpdate
-from typing import Optional, List
+from app.models.pricing import PricingDetail, RateCardVersion, RateCardVersionEntry
+from app.schemas.pricing import (
+    PricingDetailCreate,
+    PricingDetailUpdate,
+    PricingScenario,
+    RateCardVersionCreate,
+    StaffingSubstitution
+)
+from app.crud import staffing as crud_staffing
+from app.crud.pagination import PageRequest, SortOrder, paginate, paginate_sorted
+from app.crud.rate_card_cache import RateCardEntry, rate_card_cache, sorted_entries
+from app.crud.rate_card_engine import DenseRateCard, PricedRows, cents_to_float
+from typing import Dict, Optional, List, Tuple
+from datetime import date
+from uuid import UUID
 
 
 def get_pricing_details(
@@ -9,41 +23,284 @@ def get_pricing_details(
     country: str,
     role: str,
     band: int
-) -> Optional[PricingDetail]:
-    """Get pricing details for a specific country, role, and band"""
-    return db.query(PricingDetail).filter(
-        PricingDetail.country == country,
-        PricingDetail.role == role,
-        PricingDetail.band == band
-    ).first()
+) -> Optional[RateCardEntry]:
+    """Get pricing details for a specific country, role, and band (served from the rate card cache)"""
+    return rate_card_cache.get(db, country, role, band)
 
 
 def search_pricing(
     db: Session,
     country: Optional[str] = None,
     role: Optional[str] = None,
-    band: Optional[int] = None
-) -> List[PricingDetail]:
-    """Search pricing details with optional filters"""
-    query = db.query(PricingDetail)
+    band: Optional[int] = None,
+    page: Optional[PageRequest] = None
+):
+    """Search pricing details with optional filters (served from the rate card cache), paged by rate key"""
+    results = sorted_entries(rate_card_cache.entries(db))
     
     if country:
-        query = query.filter(PricingDetail.country == country)
+        results = [entry for entry in results if entry.country == country]
     if role:
-        query = query.filter(PricingDetail.role == role)
+        results = [entry for entry in results if entry.role == role]
     if band:
-        query = query.filter(PricingDetail.band == band)
+        results = [entry for entry in results if entry.band == band]
     
-    return query.all()
+    return paginate_sorted(results, lambda entry: (entry.country, entry.role, entry.band), "key", page)
+
+
+def calculate_offering_totals(db: Session, offering_id: str, rate_card_version: Optional[int] = None) -> dict:
+    """
+    Calculate total hours, cost and sale price for an offering.
+
+    Staffing rows are loaded in one query and priced against the dense rate
+    card (the live one, or ``rate_card_version`` if given). Rows whose
+    (country, role, band) has no pricing still count towards total hours and
+    are reported under ``unpriced_staffing``.
+    """
+    staffing_details = crud_staffing.get_staffing_by_offering(db, offering_id)
+    if not staffing_details:
+        return _empty_totals(offering_id, rate_card_version)
+
+    return _price_staffing(offering_id, staffing_details, _rate_card(db, rate_card_version), rate_card_version)
+
+
+def calculate_totals_for_offerings(
+    db: Session,
+    offering_ids: List[UUID],
+    rate_card_version: Optional[int] = None
+) -> List[dict]:
+    """
+    Calculate totals for several offerings at once.
+
+    Uses one query for the staffing rows of all requested offerings and the
+    rate card cache for pricing, instead of one request per offering.
+    Results are returned in the order of ``offering_ids``.
+    """
+    card = _rate_card(db, rate_card_version)
+    staffing_by_offering: Dict[UUID, list] = {offering_id: [] for offering_id in offering_ids}
+    for offering_id, staffing in crud_staffing.get_staffing_by_offerings(db, offering_ids):
+        staffing_by_offering[offering_id].append(staffing)
+
+    return [
+        _price_staffing(offering_id, staffing_details, card, rate_card_version)
+        if staffing_details else _empty_totals(offering_id, rate_card_version)
+        for offering_id, staffing_details in staffing_by_offering.items()
+    ]
+
+
+def simulate_offering_pricing(
+    db: Session,
+    offering_id: str,
+    scenarios: List[PricingScenario],
+    rate_card_version: Optional[int] = None
+) -> dict:
+    """
+    Re-price an offering under what-if staffing substitutions without writing anything.
+
+    Staffing hours are collapsed to one total per (country, role, band) key, so
+    each scenario only remaps and prices the distinct keys rather than every
+    staffing row. Within a scenario the first matching substitution wins.
+    """
+    card = _rate_card(db, rate_card_version)
+    key_hours = {
+        (country, role, band): int(hours)
+        for country, role, band, hours, _ in crud_staffing.get_staffing_hours_by_key(db, offering_id)
+    }
+
+    baseline = card.price(list(key_hours), list(key_hours.values()))
+    results = []
+    for index, scenario in enumerate(scenarios):
+        scenario_hours: Dict[tuple, int] = {}
+        moved_hours = 0
+        for key, hours in key_hours.items():
+            target = _substitute_key(key, scenario.substitutions)
+            if target != key:
+                moved_hours += hours
+            scenario_hours[target] = scenario_hours.get(target, 0) + hours
+
+        priced = card.price(list(scenario_hours), list(scenario_hours.values()))
+        results.append({
+            "name": scenario.name or f"Scenario {index + 1}",
+            "moved_hours": moved_hours,
+            **_summarize_keys(list(scenario_hours), priced),
+            "cost_delta": cents_to_float(priced.total_cost_cents - baseline.total_cost_cents),
+            "sale_price_delta": cents_to_float(priced.total_sale_cents - baseline.total_sale_cents),
+        })
+
+    return {
+        "offering_id": offering_id,
+        "rate_card_version": rate_card_version,
+        "baseline": _summarize_keys(list(key_hours), baseline),
+        "scenarios": results,
+    }
+
+
+def compare_offering_across_countries(
+    db: Session,
+    offering_id: str,
+    rate_card_version: Optional[int] = None
+) -> dict:
+    """
+    Price an offering's staffing hours, grouped by (role, band), against every country in the rate card.
+
+    The staffed country is ignored: each country column answers "what would
+    this offering cost if all of it were delivered from here". All cells are
+    filled in a single pass over the dense rate card.
+    """
+    card = _rate_card(db, rate_card_version)
+
+    role_band_hours: Dict[Tuple[str, int], int] = {}
+    for _, role, band, hours, _ in crud_staffing.get_staffing_hours_by_key(db, offering_id):
+        role_band_hours[(role, band)] = role_band_hours.get((role, band), 0) + int(hours)
+
+    countries = []
+    for country in card.countries:
+        keys = [(country, role, band) for role, band in role_band_hours]
+        priced = card.price(keys, list(role_band_hours.values()))
+        missing = [position for position in range(len(keys)) if not priced.is_priced(position)]
+        missing_hours = sum(priced.hours[position] for position in missing)
+        countries.append({
+            "country": country,
+            "total_cost": cents_to_float(priced.total_cost_cents),
+            "total_sale_price": cents_to_float(priced.total_sale_cents),
+            "priced_hours": priced.total_hours - missing_hours,
+            "missing_rate_count": len(missing),
+            "missing_rate_hours": missing_hours,
+        })
+
+    return {
+        "offering_id": offering_id,
+        "rate_card_version": rate_card_version,
+        "total_hours": sum(role_band_hours.values()),
+        "role_band_count": len(role_band_hours),
+        "countries": countries,
+    }
+
+
+def _rate_card(db: Session, rate_card_version: Optional[int]) -> DenseRateCard:
+    """The live rate card, or an immutable version of it"""
+    if rate_card_version is None:
+        return rate_card_cache.dense(db)
+    return rate_card_cache.dense_version(db, rate_card_version)
+
+
+def _substitute_key(key: tuple, substitutions: List[StaffingSubstitution]) -> tuple:
+    country, role, band = key
+    for substitution in substitutions:
+        match = substitution.match
+        if match.country is not None and match.country != country:
+            continue
+        if match.role is not None and match.role != role:
+            continue
+        if match.band is not None and match.band != band:
+            continue
+
+        replace = substitution.replace
+        return (
+            replace.country if replace.country is not None else country,
+            replace.role if replace.role is not None else role,
+            replace.band if replace.band is not None else band,
+        )
+    return key
+
+
+def _price_staffing(
+    offering_id,
+    staffing_details: list,
+    card: DenseRateCard,
+    rate_card_version: Optional[int] = None
+) -> dict:
+    priced = card.price(
+        [(staffing.country, staffing.role, staffing.band) for staffing in staffing_details],
+        [staffing.hours for staffing in staffing_details]
+    )
+
+    totals = _empty_totals(offering_id, rate_card_version)
+    totals["total_hours"] = priced.total_hours
+    totals["total_cost"] = cents_to_float(priced.total_cost_cents)
+    totals["total_sale_price"] = cents_to_float(priced.total_sale_cents)
+
+    for position, staffing in enumerate(staffing_details):
+        hours = priced.hours[position]
+        if not priced.is_priced(position):
+            totals["unpriced_staffing"].append(_unpriced_row(staffing, hours))
+            continue
+
+        cost_per_hour = priced.cost_cents[position]
+        sale_price_per_hour = priced.sale_cents[position]
+        totals["breakdown"].append({
+            "staffing_id": staffing.staffing_id,
+            "country": staffing.country,
+            "role": staffing.role,
+            "band": staffing.band,
+            "hours": hours,
+            "cost_per_hour": cents_to_float(cost_per_hour) if cost_per_hour else 0,
+            "sale_price_per_hour": cents_to_float(sale_price_per_hour) if sale_price_per_hour else 0,
+            "total_cost": cents_to_float(priced.line_cost_cents[position]),
+            "total_sale_price": cents_to_float(priced.line_sale_cents[position])
+        })
+
+    return totals
+
+
+def _summarize_keys(keys: List[tuple], priced: PricedRows) -> dict:
+    return {
+        "total_hours": priced.total_hours,
+        "total_cost": cents_to_float(priced.total_cost_cents),
+        "total_sale_price": cents_to_float(priced.total_sale_cents),
+        "unpriced_keys": [
+            {"country": country, "role": role, "band": band, "hours": priced.hours[position]}
+            for position, (country, role, band) in enumerate(keys)
+            if not priced.is_priced(position)
+        ],
+    }
+
+
+def _empty_totals(offering_id, rate_card_version: Optional[int] = None) -> dict:
+    return {
+        "offering_id": offering_id,
+        "rate_card_version": rate_card_version,
+        "total_hours": 0,
+        "total_cost": 0,
+        "total_sale_price": 0,
+        "breakdown": [],
+        "unpriced_staffing": [],
+    }
 
 
-def get_all_pricing(db: Session) -> List[PricingDetail]:
-    """Get all pricing details"""
-    return db.query(PricingDetail).all()
+def _unpriced_row(staffing, hours) -> dict:
+    return {
+        "staffing_id": staffing.staffing_id,
+        "country": staffing.country,
+        "role": staffing.role,
+        "band": staffing.band,
+        "hours": hours,
+    }
 
 
-def create_pricing(db: Session, pricing: PricingDetailCreate) -> PricingDetail:
-    """Create a new pricing detail"""
+def get_all_pricing(db: Session, page: Optional[PageRequest] = None):
+    """Get all pricing details (served from the rate card cache), paged by rate key"""
+    return paginate_sorted(
+        sorted_entries(rate_card_cache.entries(db)),
+        lambda entry: (entry.country, entry.role, entry.band),
+        "key",
+        page
+    )
+
+
+def pricing_exists(db: Session, country: str, role: str, band: int) -> bool:
+    """Whether the database has a rate for this key (not the cache, which may lag other workers)"""
+    return db.query(
+        db.query(PricingDetail).filter(
+            PricingDetail.country == country,
+            PricingDetail.role == role,
+            PricingDetail.band == band
+        ).exists()
+    ).scalar()
+
+
+def create_pricing(db: Session, pricing: PricingDetailCreate) -> Optional[PricingDetail]:
+    """Create a new pricing detail; None if the (country, role, band) key already exists"""
     db_pricing = PricingDetail(
         country=pricing.country,
         role=pricing.role,
@@ -52,8 +309,14 @@ def create_pricing(db: Session, pricing: PricingDetailCreate) -> PricingDetail:
         sale_price=pricing.sale_price
     )
     db.add(db_pricing)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another request inserted the same key since the caller checked
+        db.rollback()
+        return None
     db.refresh(db_pricing)
+    rate_card_cache.put(db_pricing)
     return db_pricing
 
 
@@ -80,6 +343,9 @@ def update_pricing(
     
     db.commit()
     db.refresh(db_pricing)
+    # The update may move the row to a different (country, role, band) key
+    rate_card_cache.remove(country, role, band)
+    rate_card_cache.put(db_pricing)
     return db_pricing
 
 
@@ -101,4 +367,76 @@ def delete_pricing(
     
     db.delete(db_pricing)
     db.commit()
-    return True
\ No newline at end of file
+    rate_card_cache.remove(country, role, band)
+    return True
+
+
+RATE_CARD_VERSION_SORTS = (
+    SortOrder("-version", (RateCardVersion.version,), descending=True),
+    SortOrder("version", (RateCardVersion.version,)),
+)
+
+
+def get_rate_card_versions(db: Session, page: Optional[PageRequest] = None):
+    """List rate card versions, newest first"""
+    return paginate(db, db.query(RateCardVersion), RATE_CARD_VERSION_SORTS, page)
+
+
+def get_rate_card_version(db: Session, version: int) -> Optional[RateCardVersion]:
+    """Get a rate card version by number"""
+    return db.query(RateCardVersion).filter(RateCardVersion.version == version).first()
+
+
+def resolve_rate_card_version(
+    db: Session,
+    version: Optional[int] = None,
+    as_of: Optional[date] = None
+) -> Optional[RateCardVersion]:
+    """
+    Find the rate card version to price with.
+
+    An explicit ``version`` wins; otherwise the version in effect on ``as_of``
+    (latest effective date on or before it, highest version on ties).
+    """
+    if version is not None:
+        return get_rate_card_version(db, version)
+    if as_of is None:
+        return None
+    return db.query(RateCardVersion).filter(
+        RateCardVersion.effective_date <= as_of
+    ).order_by(
+        RateCardVersion.effective_date.desc(),
+        RateCardVersion.version.desc()
+    ).first()
+
+
+def create_rate_card_version(
+    db: Session,
+    version: RateCardVersionCreate,
+    created_by: Optional[str] = None
+) -> RateCardVersion:
+    """Snapshot the current pricing_details table as a new, immutable rate card version"""
+    db_version = RateCardVersion(
+        effective_date=version.effective_date,
+        note=version.note,
+        created_by=created_by
+    )
+    db.add(db_version)
+    db.flush()
+
+    db.execute(
+        insert(RateCardVersionEntry).from_select(
+            ["version", "country", "role", "band", "cost", "sale_price"],
+            select(
+                literal(db_version.version),
+                PricingDetail.country,
+                PricingDetail.role,
+                PricingDetail.band,
+                PricingDetail.cost,
+                PricingDetail.sale_price
+            )
+        )
+    )
+    db.commit()
+    db.refresh(db_version)
+    return db_version
@@ -0,0 +1,275 @@
+"""
+Incrementally maintained price rollups.
+
+``activity_price_rollups`` holds each activity's staffing priced on the
+current rate card and ``offering_price_rollups`` sums the rollups of an
+offering's linked activities. The staffing and activity CRUD functions
+call into this module after flushing their change and before committing,
+so a rollup is always written in the same transaction as the change that
+affects it. Rate card changes are propagated by the repricing job in
+``app.crud.repricing``. ``rebuild_all`` and ``check_drift`` back the admin
+rebuild/verify endpoints.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+from app.models.activity import Activity, OfferingActivity
+from app.models.offering import Offering
+from app.models.pricing import PricingDetail
+from app.models.pricing_rollup import ActivityPriceRollup, OfferingPriceRollup
+from app.models.staffing import StaffingDetail
+
+ROLLUP_FIELDS = ("total_hours", "total_cost", "total_sale_price", "unpriced_rows")
+OFFERING_ROLLUP_FIELDS = ROLLUP_FIELDS + ("activity_count",)
+DRIFT_REPORT_LIMIT = 100
+
+
+def get_offering_rollup(db: Session, offering_id: str) -> Optional[OfferingPriceRollup]:
+    """Get the stored totals for an offering (primary-key lookup)"""
+    return db.query(OfferingPriceRollup).filter(OfferingPriceRollup.offering_id == offering_id).first()
+
+
+def _as_uuids(ids: Iterable) -> set:
+    """Accept UUIDs or their string form, as the CRUD callers pass either"""
+    return {value if isinstance(value, UUID) else UUID(str(value)) for value in ids if value is not None}
+
+
+def _activity_totals_query(db: Session):
+    """Staffing priced on the rate card and summed per activity"""
+    hours = func.coalesce(StaffingDetail.hours, 0)
+    return (
+        db.query(
+            StaffingDetail.activity_id,
+            func.sum(hours).label("total_hours"),
+            func.sum(func.coalesce(PricingDetail.cost, 0) * hours).label("total_cost"),
+            func.sum(func.coalesce(PricingDetail.sale_price, 0) * hours).label("total_sale_price"),
+            func.sum(case((PricingDetail.band.is_(None), 1), else_=0)).label("unpriced_rows"),
+        )
+        .outerjoin(
+            PricingDetail,
+            and_(
+                PricingDetail.country == StaffingDetail.country,
+                PricingDetail.role == StaffingDetail.role,
+                PricingDetail.band == StaffingDetail.band,
+            ),
+        )
+        .group_by(StaffingDetail.activity_id)
+    )
+
+
+def _normalize(row) -> Tuple[int, Decimal, Decimal, int]:
+    """Coerce an aggregate row (or None for "no staffing") to comparable values"""
+    if row is None:
+        return (0, Decimal("0.00"), Decimal("0.00"), 0)
+    cent = Decimal("0.01")
+    return (
+        int(row.total_hours or 0),
+        Decimal(str(row.total_cost or 0)).quantize(cent),
+        Decimal(str(row.total_sale_price or 0)).quantize(cent),
+        int(row.unpriced_rows or 0),
+    )
+
+
+def _normalize_offering(row) -> Tuple[int, Decimal, Decimal, int, int]:
+    """``_normalize`` plus the offering's linked activity count"""
+    return _normalize(row) + (int(row.activity_count or 0) if row is not None else 0,)
+
+
+def _assign(rollup, values: tuple, fields: Tuple[str, ...] = ROLLUP_FIELDS) -> None:
+    for field, value in zip(fields, values):
+        setattr(rollup, field, value)
+
+
+def _upsert_activity_rollups(db: Session, activity_ids: set) -> None:
+    totals = {
+        row.activity_id: row
+        for row in _activity_totals_query(db).filter(StaffingDetail.activity_id.in_(activity_ids)).all()
+    }
+    existing = {
+        rollup.activity_id: rollup
+        for rollup in db.query(ActivityPriceRollup).filter(ActivityPriceRollup.activity_id.in_(activity_ids)).all()
+    }
+    for activity_id in activity_ids:
+        rollup = existing.get(activity_id)
+        if rollup is None:
+            rollup = ActivityPriceRollup(activity_id=activity_id)
+            db.add(rollup)
+        _assign(rollup, _normalize(totals.get(activity_id)))
+    db.flush()
+
+
+def refresh_activities(db: Session, activity_ids: Iterable[UUID]) -> None:
+    """Recompute the rollups of the given activities and of every offering linked to them"""
+    activity_ids = _as_uuids(activity_ids)
+    if not activity_ids:
+        return
+
+    _upsert_activity_rollups(db, activity_ids)
+
+    offering_ids = [
+        offering_id for (offering_id,) in db.query(OfferingActivity.offering_id)
+        .filter(OfferingActivity.activity_id.in_(activity_ids))
+        .distinct()
+        .all()
+    ]
+    refresh_offerings(db, offering_ids)
+
+
+def refresh_offerings(db: Session, offering_ids: Iterable[UUID]) -> None:
+    """Recompute offering rollups by summing the rollups of their linked activities"""
+    offering_ids = _as_uuids(offering_ids)
+    if not offering_ids:
+        return
+
+    # Linked activities that have never been rolled up (e.g. before the first rebuild)
+    missing = {
+        activity_id for (activity_id,) in db.query(OfferingActivity.activity_id)
+        .outerjoin(ActivityPriceRollup, ActivityPriceRollup.activity_id == OfferingActivity.activity_id)
+        .filter(
+            OfferingActivity.offering_id.in_(offering_ids),
+            ActivityPriceRollup.activity_id.is_(None)
+        )
+        .distinct()
+        .all()
+    }
+    if missing:
+        _upsert_activity_rollups(db, missing)
+
+    totals = {
+        row.offering_id: row
+        for row in db.query(
+            OfferingActivity.offering_id,
+            func.sum(ActivityPriceRollup.total_hours).label("total_hours"),
+            func.sum(ActivityPriceRollup.total_cost).label("total_cost"),
+            func.sum(ActivityPriceRollup.total_sale_price).label("total_sale_price"),
+            func.sum(ActivityPriceRollup.unpriced_rows).label("unpriced_rows"),
+            func.count(OfferingActivity.activity_id).label("activity_count"),
+        )
+        .join(ActivityPriceRollup, ActivityPriceRollup.activity_id == OfferingActivity.activity_id)
+        .filter(OfferingActivity.offering_id.in_(offering_ids))
+        .group_by(OfferingActivity.offering_id)
+        .all()
+    }
+    existing = {
+        rollup.offering_id: rollup
+        for rollup in db.query(OfferingPriceRollup).filter(OfferingPriceRollup.offering_id.in_(offering_ids)).all()
+    }
+    for offering_id in offering_ids:
+        rollup = existing.get(offering_id)
+        if rollup is None:
+            rollup = OfferingPriceRollup(offering_id=offering_id)
+            db.add(rollup)
+        _assign(rollup, _normalize_offering(totals.get(offering_id)), OFFERING_ROLLUP_FIELDS)
+    db.flush()
+
+
+def refresh_for_rate_keys(db: Session, rate_keys: Iterable[Tuple[str, str, int]]) -> None:
+    """Recompute every activity (and offering) that staffs one of the given (country, role, band) keys"""
+    rate_keys = set(rate_keys)
+    if not rate_keys:
+        return
+
+    activity_ids = [
+        activity_id for (activity_id,) in db.query(StaffingDetail.activity_id)
+        .filter(or_(*[
+            and_(
+                StaffingDetail.country == country,
+                StaffingDetail.role == role,
+                StaffingDetail.band == band
+            )
+            for country, role, band in rate_keys
+        ]))
+        .distinct()
+        .all()
+    ]
+    refresh_activities(db, activity_ids)
+
+
+def remove_activity(db: Session, activity_id: UUID) -> None:
+    """Drop the rollup of a deleted activity"""
+    db.query(ActivityPriceRollup).filter(ActivityPriceRollup.activity_id == activity_id).delete(
+        synchronize_session=False
+    )
+
+
+def _expected_totals(db: Session) -> Tuple[Dict[UUID, tuple], Dict[UUID, tuple]]:
+    """Compute every activity and offering rollup from scratch"""
+    staffed = {row.activity_id: _normalize(row) for row in _activity_totals_query(db).all()}
+    activities = {
+        activity_id: staffed.get(activity_id, _normalize(None))
+        for (activity_id,) in db.query(Activity.activity_id).all()
+    }
+
+    offerings = {offering_id: _normalize_offering(None) for (offering_id,) in db.query(Offering.offering_id).all()}
+    for offering_id, activity_id in db.query(OfferingActivity.offering_id, OfferingActivity.activity_id).all():
+        values = activities.get(activity_id)
+        if values is None or offering_id not in offerings:
+            continue
+        offerings[offering_id] = tuple(a + b for a, b in zip(offerings[offering_id], values + (1,)))
+
+    return activities, offerings
+
+
+def rebuild_all(db: Session) -> Dict[str, int]:
+    """Recompute and replace every activity and offering rollup"""
+    activities, offerings = _expected_totals(db)
+
+    db.query(OfferingPriceRollup).delete(synchronize_session=False)
+    db.query(ActivityPriceRollup).delete(synchronize_session=False)
+    db.bulk_insert_mappings(ActivityPriceRollup, [
+        {"activity_id": activity_id, **dict(zip(ROLLUP_FIELDS, values))}
+        for activity_id, values in activities.items()
+    ])
+    db.bulk_insert_mappings(OfferingPriceRollup, [
+        {"offering_id": offering_id, **dict(zip(OFFERING_ROLLUP_FIELDS, values))}
+        for offering_id, values in offerings.items()
+    ])
+    db.commit()
+
+    return {"activities": len(activities), "offerings": len(offerings)}
+
+
+def _compare(
+    expected: Dict[UUID, tuple],
+    stored_rows,
+    id_field: str,
+    normalize=_normalize,
+    fields: Tuple[str, ...] = ROLLUP_FIELDS
+) -> Tuple[int, List[dict]]:
+    stored = {getattr(row, id_field): normalize(row) for row in stored_rows}
+    drifted = []
+    for entity_id, values in expected.items():
+        stored_values = stored.get(entity_id)
+        if stored_values != values:
+            drifted.append({
+                id_field: entity_id,
+                "expected": dict(zip(fields, values)),
+                "stored": dict(zip(fields, stored_values)) if stored_values else None,
+            })
+    orphaned = len(set(stored) - set(expected))
+    return orphaned, drifted
+
+
+def check_drift(db: Session) -> Dict:
+    """Compare the stored rollups against a from-scratch recomputation"""
+    activities, offerings = _expected_totals(db)
+    orphaned_activities, drifted_activities = _compare(
+        activities, db.query(ActivityPriceRollup).all(), "activity_id"
+    )
+    orphaned_offerings, drifted_offerings = _compare(
+        offerings, db.query(OfferingPriceRollup).all(), "offering_id", _normalize_offering, OFFERING_ROLLUP_FIELDS
+    )
+
+    return {
+        "in_sync": not (drifted_activities or drifted_offerings or orphaned_activities or orphaned_offerings),
+        "activities_checked": len(activities),
+        "offerings_checked": len(offerings),
+        "drifted_activity_count": len(drifted_activities),
+        "drifted_offering_count": len(drifted_offerings),
+        "orphaned_activity_rollups": orphaned_activities,
+        "orphaned_offering_rollups": orphaned_offerings,
+        "drifted_activities": drifted_activities[:DRIFT_REPORT_LIMIT],
+        "drifted_offerings": drifted_offerings[:DRIFT_REPORT_LIMIT],
+    }
@@ -1,18 +1,29 @@
 from sqlalchemy.orm import Session
+from app.models.offering import Offering
 from app.models.product import Product
 from app.schemas.product import ProductCreate, ProductUpdate
+from app.crud.pagination import PageRequest, SortOrder, paginate
+from app.crud import offering_similarity
+from app.crud.offering_attributes import offering_attribute_cache
+from app.crud.search_index import catalog_index
 from typing import List, Optional
 import uuid
 
 
-def get_all_products(db: Session) -> List[Product]:
-    """Get all products"""
-    return db.query(Product).all()
+PRODUCT_SORTS = (
+    SortOrder("name", (Product.product_name, Product.product_id)),
+    SortOrder("-name", (Product.product_name, Product.product_id), descending=True),
+)
 
 
-def get_products_by_brand(db: Session, brand_id: str) -> List[Product]:
-    """Get all products for a specific brand"""
-    return db.query(Product).filter(Product.brand_id == brand_id).all()
+def get_all_products(db: Session, page: Optional[PageRequest] = None):
+    """Get all products (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(Product), PRODUCT_SORTS, page)
+
+
+def get_products_by_brand(db: Session, brand_id: str, page: Optional[PageRequest] = None):
+    """Get all products for a specific brand (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(Product).filter(Product.brand_id == brand_id), PRODUCT_SORTS, page)
 
 
 def get_product_by_id(db: Session, product_id: str) -> Optional[Product]:
@@ -20,11 +31,6 @@ def get_product_by_id(db: Session, product_id: str) -> Optional[Product]:
     return db.query(Product).filter(Product.product_id == product_id).first()
 
 
-def get_all_products(db: Session) -> List[Product]:
-    """Get all products"""
-    return db.query(Product).all()
-
-
 def create_product(db: Session, product: ProductCreate) -> Product:
     """Create a new product"""
     db_product = Product(
@@ -36,6 +42,7 @@ def create_product(db: Session, product: ProductCreate) -> Product:
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    catalog_index.put_product(db_product)
     return db_product
 
 
@@ -52,6 +59,7 @@ def update_product(db: Session, product_id: str, product: ProductUpdate) -> Opti
     
     db.commit()
     db.refresh(db_product)
+    catalog_index.put_product(db_product)
     return db_product
 
 
@@ -62,6 +70,16 @@ def delete_product(db: Session, product_id: str) -> bool:
     if not db_product:
         return False
     
+    # Offerings go with it (ON DELETE CASCADE); note which, and who listed them as similar
+    offering_ids = [
+        offering_id for (offering_id,) in
+        db.query(Offering.offering_id).filter(Offering.product_id == db_product.product_id).all()
+    ]
+    listed_by = offering_similarity.listed_by(db, offering_ids)
     db.delete(db_product)
     db.commit()
+    catalog_index.remove_product(db_product.product_id, offering_ids)
+    if offering_ids:
+        offering_attribute_cache.invalidate()
+        offering_similarity.submit_refresh([*offering_ids, *listed_by])
     return True
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+In-process cache of the PricingDetail rate card.
+
+The rate card is a small, read-mostly matrix keyed by (country, role, band),
+so the whole table is loaded once and served from a dict. The pricing CRUD
+write functions patch the cache after each successful commit; a reload is
+also forced after RATE_CARD_CACHE_TTL_SECONDS so that writes made by other
+worker processes are eventually picked up.
+
+Rate card versions are immutable snapshots, so their dense form is built
+once per version and kept for the life of the process.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.pricing import PricingDetail, RateCardVersion, RateCardVersionEntry
+from app.crud.rate_card_engine import DenseRateCard
+
+RateKey = Tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class RateCardEntry:
+    """Detached, immutable copy of a PricingDetail row"""
+    country: str
+    role: str
+    band: int
+    cost: Optional[Decimal]
+    sale_price: Optional[Decimal]
+
+    @property
+    def key(self) -> RateKey:
+        return (self.country, self.role, self.band)
+
+    @classmethod
+    def from_model(cls, pricing) -> "RateCardEntry":
+        """Copy a PricingDetail (or RateCardVersionEntry) row"""
+        return cls(
+            country=pricing.country,
+            role=pricing.role,
+            band=pricing.band,
+            cost=pricing.cost,
+            sale_price=pricing.sale_price
+        )
+
+
+class RateCardCache:
+    """Whole-table cache of PricingDetail with hit/miss/reload counters"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[RateKey, RateCardEntry]] = None
+        self._dense: Optional[Tuple[Dict, DenseRateCard]] = None
+        self._versions: Dict[int, DenseRateCard] = {}
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        if self._entries is None:
+            return False
+        if self.ttl_seconds <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def entries(self, db: Session) -> Dict[RateKey, RateCardEntry]:
+        """Return the full rate card, loading it from the database if needed"""
+        if self._is_fresh():
+            return self._entries
+
+        with self._lock:
+            if not self._is_fresh():
+                rows = db.query(PricingDetail).all()
+                self._entries = {
+                    (row.country, row.role, row.band): RateCardEntry.from_model(row)
+                    for row in rows
+                }
+                self._loaded_at = time.monotonic()
+                self.reloads += 1
+            return self._entries
+
+    def dense(self, db: Session) -> DenseRateCard:
+        """The rate card as integer-cent arrays, rebuilt only when the cached card changes"""
+        entries = self.entries(db)
+        memo = self._dense
+        if memo is not None and memo[0] is entries:
+            return memo[1]
+
+        dense = DenseRateCard(entries.values())
+        self._dense = (entries, dense)
+        return dense
+
+    def dense_version(self, db: Session, version: int) -> DenseRateCard:
+        """The dense form of an immutable rate card version, loaded once and never expired"""
+        card = self._versions.get(version)
+        if card is not None:
+            return card
+
+        rows = db.query(RateCardVersionEntry).filter(RateCardVersionEntry.version == version).all()
+        card = DenseRateCard(RateCardEntry.from_model(row) for row in rows)
+        if not rows and not db.query(RateCardVersion.version).filter(RateCardVersion.version == version).first():
+            # Not created yet (or rolled back); an empty card would otherwise stick forever
+            return card
+        with self._lock:
+            self._versions[version] = card
+        return card
+
+    def get(self, db: Session, country: str, role: str, band: int) -> Optional[RateCardEntry]:
+        """Look up a single rate card entry"""
+        entry = self.entries(db).get((country, role, band))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, pricing: PricingDetail) -> None:
+        """Write-through a created or updated PricingDetail row"""
+        with self._lock:
+            if self._entries is None:
+                return
+            entry = RateCardEntry.from_model(pricing)
+            # Copy-on-write so readers iterating the previous dict are unaffected
+            entries = dict(self._entries)
+            entries[entry.key] = entry
+            self._entries = entries
+
+    def remove(self, country: str, role: str, band: int) -> None:
+        """Drop a deleted (or re-keyed) PricingDetail row"""
+        with self._lock:
+            if self._entries is None or (country, role, band) not in self._entries:
+                return
+            entries = dict(self._entries)
+            del entries[(country, role, band)]
+            self._entries = entries
+
+    def invalidate(self) -> None:
+        """Force a reload on the next read"""
+        with self._lock:
+            self._entries = None
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "loaded": self._entries is not None,
+            "size": len(self._entries) if self._entries is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "reloads": self.reloads,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+            "versions_cached": len(self._versions),
+        }
+
+
+def sorted_entries(entries: Dict[RateKey, RateCardEntry]) -> List[RateCardEntry]:
+    """Entries in a stable (country, role, band) order"""
+    return [entries[key] for key in sorted(entries)]
+
+
+rate_card_cache = RateCardCache(ttl_seconds=settings.RATE_CARD_CACHE_TTL_SECONDS)
@@ -0,0 +1,159 @@
+"""
+Rate card coverage report.
+
+A staffing row whose (country, role, band) has no PricingDetail prices as
+zero. This report finds those rows with a single anti-join (staffing LEFT
+JOIN pricing WHERE pricing is NULL, served by the pricing primary key and
+the staffing rate key index) and summarizes them set-wise, so it stays
+cheap enough to run after every rate card import.
+"""
+from typing import Dict, List
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+from app.models.activity import Activity, OfferingActivity
+from app.models.offering import Offering
+from app.models.pricing import PricingDetail
+from app.models.staffing import StaffingDetail
+
+
+def _unpriced_staffing(db: Session):
+    """Staffing rows with no matching rate card entry"""
+    return (
+        db.query(
+            StaffingDetail.staffing_id,
+            StaffingDetail.activity_id,
+            StaffingDetail.country,
+            StaffingDetail.role,
+            StaffingDetail.band,
+            StaffingDetail.hours,
+        )
+        .outerjoin(
+            PricingDetail,
+            and_(
+                PricingDetail.country == StaffingDetail.country,
+                PricingDetail.role == StaffingDetail.role,
+                PricingDetail.band == StaffingDetail.band,
+            ),
+        )
+        .filter(PricingDetail.band.is_(None))
+        .cte("unpriced_staffing")
+    )
+
+
+def _summary_by_key(db: Session, unpriced) -> List[Dict]:
+    key = (unpriced.c.country, unpriced.c.role, unpriced.c.band)
+    rows = (
+        db.query(
+            *key,
+            func.count().label("staffing_rows"),
+            func.coalesce(func.sum(unpriced.c.hours), 0).label("hours"),
+            func.count(func.distinct(unpriced.c.activity_id)).label("activities"),
+        )
+        .group_by(*key)
+        .subquery()
+    )
+    offerings = (
+        db.query(
+            *key,
+            func.count(func.distinct(OfferingActivity.offering_id)).label("offerings"),
+        )
+        .join(OfferingActivity, OfferingActivity.activity_id == unpriced.c.activity_id)
+        .group_by(*key)
+        .subquery()
+    )
+    # NULL-safe join: staffing rows with a missing country/role/band are reported too
+    same_key = and_(*[
+        func.coalesce(rows.c[column], sentinel) == func.coalesce(offerings.c[column], sentinel)
+        for column, sentinel in (("country", ""), ("role", ""), ("band", -1))
+    ])
+    summary = (
+        db.query(rows, func.coalesce(offerings.c.offerings, 0).label("offerings"))
+        .outerjoin(offerings, same_key)
+        .order_by(rows.c.staffing_rows.desc(), rows.c.country, rows.c.role, rows.c.band)
+        .all()
+    )
+    return [
+        {
+            "country": row.country,
+            "role": row.role,
+            "band": row.band,
+            "staffing_rows": row.staffing_rows,
+            "hours": int(row.hours),
+            "activities": row.activities,
+            "offerings": row.offerings,
+        }
+        for row in summary
+    ]
+
+
+def get_coverage_report(db: Session, skip: int = 0, limit: int = 100) -> Dict:
+    """
+    Report staffing rows whose rate key is missing from the rate card.
+
+    ``missing_keys`` lists every missing key with row/hour/activity/offering
+    counts; ``staffing_rows`` is one page of the affected rows, each with its
+    activity and the offerings that include it.
+    """
+    unpriced = _unpriced_staffing(db)
+
+    by_key = _summary_by_key(db, unpriced)
+    totals = (
+        db.query(
+            func.count(func.distinct(unpriced.c.activity_id)),
+            func.count(func.distinct(OfferingActivity.offering_id)),
+        )
+        .select_from(unpriced)
+        .outerjoin(OfferingActivity, OfferingActivity.activity_id == unpriced.c.activity_id)
+        .one()
+    )
+    total_staffing = db.query(func.count(StaffingDetail.staffing_id)).scalar() or 0
+    unpriced_rows = sum(entry["staffing_rows"] for entry in by_key)
+
+    page = (
+        db.query(unpriced, Activity.activity_name)
+        .join(Activity, Activity.activity_id == unpriced.c.activity_id)
+        .order_by(unpriced.c.country, unpriced.c.role, unpriced.c.band, unpriced.c.staffing_id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+    offerings_by_activity: Dict = {}
+    activity_ids = {row.activity_id for row in page}
+    if activity_ids:
+        linked = (
+            db.query(OfferingActivity.activity_id, Offering.offering_id, Offering.offering_name)
+            .join(Offering, Offering.offering_id == OfferingActivity.offering_id)
+            .filter(OfferingActivity.activity_id.in_(activity_ids))
+            .order_by(Offering.offering_name)
+            .all()
+        )
+        for activity_id, offering_id, offering_name in linked:
+            offerings_by_activity.setdefault(activity_id, []).append(
+                {"offering_id": offering_id, "offering_name": offering_name}
+            )
+
+    return {
+        "total_staffing_rows": total_staffing,
+        "unpriced_staffing_rows": unpriced_rows,
+        "coverage": round(1 - unpriced_rows / total_staffing, 4) if total_staffing else 1.0,
+        "missing_key_count": len(by_key),
+        "affected_activities": totals[0],
+        "affected_offerings": totals[1],
+        "missing_keys": by_key,
+        "skip": skip,
+        "limit": limit,
+        "staffing_rows": [
+            {
+                "staffing_id": row.staffing_id,
+                "activity_id": row.activity_id,
+                "activity_name": row.activity_name,
+                "country": row.country,
+                "role": row.role,
+                "band": row.band,
+                "hours": row.hours,
+                "offerings": offerings_by_activity.get(row.activity_id, []),
+            }
+            for row in page
+        ],
+    }
@@ -0,0 +1,121 @@
+"""
+Dense, array-backed form of the rate card used to price staffing rows.
+
+Country, role and band are encoded to small integer codes, and cost and
+sale price are held as integer cents in contiguous arrays indexed by the
+combined code. Pricing a list of staffing rows is then a gather of rates
+followed by a dot product with the hours.
+
+Integer cents are exact for the DECIMAL(12, 2) rate columns, and Python's
+int / int division is correctly rounded exactly like ``float(Decimal)``,
+so every figure produced here is bit-identical to the Decimal arithmetic
+the pricing endpoints used before.
+"""
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from operator import mul
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MISSING = -1
+
+
+def to_cents(value: Optional[Decimal]) -> int:
+    """Convert a rate to integer cents; a missing rate prices as zero"""
+    if value is None:
+        return 0
+    cents = Decimal(value).scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError(f"Rate {value} has more than two decimal places")
+    return int(cents)
+
+
+def cents_to_float(cents: int) -> float:
+    """Equal to float(Decimal(cents) / 100), since int true division is correctly rounded"""
+    return cents / 100
+
+
+@dataclass
+class PricedRows:
+    """Per-row and total pricing for a sequence of (country, role, band) keys"""
+    indexes: List[int]
+    hours: List[int]
+    cost_cents: List[int]
+    sale_cents: List[int]
+    line_cost_cents: List[int]
+    line_sale_cents: List[int]
+    total_hours: int
+    total_cost_cents: int
+    total_sale_cents: int
+
+    def is_priced(self, position: int) -> bool:
+        return self.indexes[position] != MISSING
+
+
+class DenseRateCard:
+    """Immutable rate card laid out as flat integer-cent arrays"""
+
+    def __init__(self, entries: Iterable):
+        entries = list(entries)
+        self.country_codes: Dict[str, int] = _encode(entry.country for entry in entries)
+        self.role_codes: Dict[str, int] = _encode(entry.role for entry in entries)
+        self.band_codes: Dict[int, int] = _encode(entry.band for entry in entries)
+
+        self._role_stride = len(self.band_codes)
+        self._country_stride = len(self.role_codes) * self._role_stride
+        size = len(self.country_codes) * self._country_stride
+
+        self.cost_cents = array("q", [0]) * size
+        self.sale_cents = array("q", [0]) * size
+        self.present = bytearray(size)
+
+        for entry in entries:
+            slot = (
+                self.country_codes[entry.country] * self._country_stride
+                + self.role_codes[entry.role] * self._role_stride
+                + self.band_codes[entry.band]
+            )
+            self.cost_cents[slot] = to_cents(entry.cost)
+            self.sale_cents[slot] = to_cents(entry.sale_price)
+            self.present[slot] = 1
+
+    @property
+    def countries(self) -> List[str]:
+        return list(self.country_codes)
+
+    def index(self, country: str, role: str, band: int) -> int:
+        """Array slot of a (country, role, band) key, or MISSING if it has no rate"""
+        country_code = self.country_codes.get(country)
+        role_code = self.role_codes.get(role)
+        band_code = self.band_codes.get(band)
+        if country_code is None or role_code is None or band_code is None:
+            return MISSING
+        slot = country_code * self._country_stride + role_code * self._role_stride + band_code
+        return slot if self.present[slot] else MISSING
+
+    def price(self, keys: Sequence[Tuple[str, str, int]], hours: Sequence[int]) -> PricedRows:
+        """Price staffing rows given as parallel sequences of keys and hours"""
+        indexes = [self.index(*key) for key in keys]
+        hours = [value or 0 for value in hours]
+
+        cost_table, sale_table = self.cost_cents, self.sale_cents
+        cost = [cost_table[slot] if slot != MISSING else 0 for slot in indexes]
+        sale = [sale_table[slot] if slot != MISSING else 0 for slot in indexes]
+        line_cost = list(map(mul, cost, hours))
+        line_sale = list(map(mul, sale, hours))
+
+        return PricedRows(
+            indexes=indexes,
+            hours=hours,
+            cost_cents=cost,
+            sale_cents=sale,
+            line_cost_cents=line_cost,
+            line_sale_cents=line_sale,
+            total_hours=sum(hours),
+            total_cost_cents=sum(line_cost),
+            total_sale_cents=sum(line_sale),
+        )
+
+
+def _encode(values: Iterable) -> Dict:
+    return {value: code for code, value in enumerate(sorted(set(values)))}
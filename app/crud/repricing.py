@@ -0,0 +1,134 @@
+"""
+Portfolio repricing after rate card changes.
+
+A change to one (country, role, band) rate moves the price of every
+offering that staffs it. The affected offerings are found through the
+reverse path rate key -> staffing rows -> activities -> offerings
+(backed by the ix_staffing_details_rate_key index), only their rollups
+are recomputed, and the before/after totals are reported. Repricing runs
+as a background job so the rate card write returns immediately.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.jobs import Job, jobs
+from app.models.activity import OfferingActivity
+from app.models.offering import Offering
+from app.models.pricing_rollup import OfferingPriceRollup
+from app.models.staffing import StaffingDetail
+from app.crud import pricing_rollup
+
+RateKey = Tuple[str, str, int]
+JOB_KIND = "repricing"
+
+
+def find_affected_offerings(db: Session, rate_keys: Iterable[RateKey]) -> Dict[UUID, int]:
+    """Map each offering that staffs one of the rate keys to the number of matching staffing rows"""
+    rate_keys = set(rate_keys)
+    if not rate_keys:
+        return {}
+
+    rows = (
+        db.query(OfferingActivity.offering_id, StaffingDetail.staffing_id)
+        .join(StaffingDetail, StaffingDetail.activity_id == OfferingActivity.activity_id)
+        .filter(or_(*[
+            and_(
+                StaffingDetail.country == country,
+                StaffingDetail.role == role,
+                StaffingDetail.band == band
+            )
+            for country, role, band in rate_keys
+        ]))
+        .all()
+    )
+
+    affected: Dict[UUID, int] = {}
+    for offering_id, _ in rows:
+        affected[offering_id] = affected.get(offering_id, 0) + 1
+    return affected
+
+
+def _snapshot(db: Session, offering_ids: Optional[List[UUID]] = None) -> Dict[UUID, dict]:
+    query = db.query(OfferingPriceRollup)
+    if offering_ids is not None:
+        query = query.filter(OfferingPriceRollup.offering_id.in_(offering_ids))
+    return {
+        rollup.offering_id: {
+            "total_hours": rollup.total_hours,
+            "total_cost": Decimal(rollup.total_cost),
+            "total_sale_price": Decimal(rollup.total_sale_price),
+        }
+        for rollup in query.all()
+    }
+
+
+def _serialize(totals: dict) -> dict:
+    return {field: float(value) if isinstance(value, Decimal) else value for field, value in totals.items()}
+
+
+def _deltas(db: Session, before: Dict[UUID, dict], after: Dict[UUID, dict], matched_rows: Dict[UUID, int]) -> List[dict]:
+    zero = {"total_hours": 0, "total_cost": Decimal(0), "total_sale_price": Decimal(0)}
+    names = dict(
+        db.query(Offering.offering_id, Offering.offering_name)
+        .filter(Offering.offering_id.in_(list(after)))
+        .all()
+    ) if after else {}
+
+    deltas = []
+    for offering_id, new in after.items():
+        old = before.get(offering_id, zero)
+        deltas.append({
+            "offering_id": offering_id,
+            "offering_name": names.get(offering_id),
+            "matched_staffing_rows": matched_rows.get(offering_id, 0),
+            "before": _serialize(old),
+            "after": _serialize(new),
+            "cost_delta": float(new["total_cost"] - old["total_cost"]),
+            "sale_price_delta": float(new["total_sale_price"] - old["total_sale_price"]),
+        })
+    deltas.sort(key=lambda delta: abs(delta["sale_price_delta"]), reverse=True)
+    return deltas
+
+
+def reprice_for_rate_keys(db: Session, rate_keys: Optional[List[RateKey]] = None) -> dict:
+    """
+    Recompute the rollups of the offerings affected by ``rate_keys`` and report the deltas.
+
+    With no rate keys the whole portfolio is rebuilt.
+    """
+    if rate_keys is None:
+        before = _snapshot(db)
+        pricing_rollup.rebuild_all(db)
+        after = _snapshot(db)
+        matched_rows: Dict[UUID, int] = {}
+    else:
+        matched_rows = find_affected_offerings(db, rate_keys)
+        affected_ids = list(matched_rows)
+        before = _snapshot(db, affected_ids)
+        pricing_rollup.refresh_for_rate_keys(db, rate_keys)
+        db.commit()
+        after = _snapshot(db, affected_ids)
+
+    deltas = _deltas(db, before, after, matched_rows)
+    changed = [delta for delta in deltas if delta["cost_delta"] or delta["sale_price_delta"]]
+    return {
+        "rate_keys": [list(key) for key in rate_keys] if rate_keys is not None else None,
+        "affected_offerings": len(deltas),
+        "changed_offerings": len(changed),
+        "total_cost_delta": sum(delta["cost_delta"] for delta in deltas),
+        "total_sale_price_delta": sum(delta["sale_price_delta"] for delta in deltas),
+        "offerings": deltas,
+    }
+
+
+def submit_repricing(rate_keys: Optional[List[RateKey]] = None) -> Job:
+    """Queue a repricing job for the given rate keys (or the whole portfolio)"""
+    if rate_keys is not None:
+        rate_keys = sorted(set(rate_keys))
+    return jobs.submit(
+        JOB_KIND,
+        lambda db: reprice_for_rate_keys(db, rate_keys),
+        params={"rate_keys": [list(key) for key in rate_keys] if rate_keys is not None else None},
+    )
@@ -0,0 +1,627 @@
+"""
+In-process inverted index over the offering and activity catalog.
+
+The catalog is small enough to keep in memory, so searches are answered
+without a database round-trip. Text fields are tokenized into lowercase
+word terms; each query word is matched as a prefix of the indexed terms
+(through a sorted vocabulary) and all query words must match. Documents
+are ranked with BM25 over field-weighted term frequencies.
+
+Activity results can carry highlighted snippets of the long text fields
+(deliverables, assumptions, responsibilities, ...), so callers do not have
+to ship whole Text columns to show why an activity matched.
+
+A separate suggestion index keeps the offering, activity, product and
+brand names in a sorted array keyed by every word start, so typeahead
+completions are a bisect plus a short scan.
+
+The indexes are loaded at startup and patched by the catalog CRUD write
+functions after each commit. As with the rate card cache, a
+full reload is forced after SEARCH_INDEX_TTL_SECONDS so that writes made
+by other worker processes are eventually picked up.
+"""
+import heapq
+import html
+import math
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterable, KeysView, List, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.activity import Activity
+from app.models.brand import Brand
+from app.models.offering import Offering
+from app.models.product import Product
+from app.schemas.activity import Activity as ActivitySchema
+from app.schemas.offering import Offering as OfferingSchema
+
+OFFERING_FIELDS = {
+    "offering_name": 3.0,
+    "tag_line": 2.0,
+    "offering_tags": 2.0,
+    "offering_summary": 1.0,
+    "elevator_pitch": 1.0,
+}
+
+ACTIVITY_FIELDS = {
+    "activity_name": 3.0,
+    "category": 1.5,
+    "brand": 1.5,
+    "product_name": 1.5,
+    "part_numbers": 1.0,
+    "description": 1.0,
+    "outcome": 1.0,
+    "deliverables": 1.0,
+    "completion_criteria": 1.0,
+    "client_responsibilities": 0.75,
+    "ibm_responsibilities": 0.75,
+    # Mostly boilerplate, so a hit there counts for less
+    "assumptions": 0.5,
+}
+
+# Long text fields that activity search returns as highlighted snippets
+ACTIVITY_SNIPPET_FIELDS = (
+    "description",
+    "deliverables",
+    "assumptions",
+    "client_responsibilities",
+    "ibm_responsibilities",
+    "completion_criteria",
+)
+SNIPPET_CHARS = 160
+
+MAX_QUERY_TERMS = 16
+# A short prefix can expand to thousands of terms. Every expansion still
+# decides which documents match; only this many (the rarest, which carry the
+# most weight) are BM25-scored, and the rest match with a score of zero.
+MAX_SCORED_EXPANSIONS = 200
+# Each document is also kept in a set per term prefix up to this length, so
+# the zero-score matches of a short prefix come from one set operation
+# instead of a walk over the postings of every unscored expansion
+PREFIX_SET_CHARS = 3
+# A prefix-only match scores a little below an exact term match
+PREFIX_MATCH_FACTOR = 0.9
+# Upper bound on suggestion keys examined per request, to keep typeahead latency flat
+MAX_SUGGEST_SCAN = 1000
+
+SUGGEST_KINDS = ("offering", "activity", "product", "brand")
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+_WORD_START = re.compile(r"\b\w", re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word terms of a piece of text"""
+    if not text:
+        return []
+    return [term.lower() for term in _TERM.findall(text)]
+
+
+def _query_terms(query: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+
+
+def _prefixes(terms: Iterable[str]) -> Set[str]:
+    return {term[:length] for term in terms for length in range(1, min(len(term), PREFIX_SET_CHARS) + 1)}
+
+
+def highlight(text: Optional[str], terms: Set[str], width: int = SNIPPET_CHARS) -> Optional[str]:
+    """
+    A window of about ``width`` characters of ``text`` around its first
+    matching word, with matching words wrapped in <mark> (the rest of the
+    text is HTML-escaped). None when no word of ``text`` is in ``terms``.
+    """
+    if not text or not terms:
+        return None
+    matches = [match for match in _TERM.finditer(text) if match.group().lower() in terms]
+    if not matches:
+        return None
+
+    first = matches[0]
+    start = max(0, first.start() - width // 4)
+    end = max(min(len(text), start + width), first.end())
+    # Do not cut words in half at either edge
+    if start > 0:
+        space = text.find(" ", start, first.start())
+        start = space + 1 if space != -1 else first.start()
+    if end < len(text):
+        space = text.rfind(" ", first.end(), end)
+        if space != -1:
+            end = space
+
+    parts = []
+    position = start
+    for match in matches:
+        if match.end() > end:
+            break
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(match.group())}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+
+    snippet = _SPACES.sub(" ", "".join(parts)).strip()
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+class SearchIndex:
+    """BM25-ranked inverted index with prefix matching; documents carry an arbitrary payload"""
+
+    def __init__(self, fields: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[Any, float]] = {}
+        self._doc_terms: Dict[Any, Set[str]] = {}
+        self._prefix_docs: Dict[str, Set[Any]] = {}
+        self._doc_lengths: Dict[Any, float] = {}
+        self._payloads: Dict[Any, Any] = {}
+        self._total_length = 0.0
+        self._vocabulary: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _weighted_terms(self, record: Dict[str, Optional[str]]) -> Dict[str, float]:
+        frequencies: Dict[str, float] = {}
+        for field, weight in self.fields.items():
+            for term in tokenize(record.get(field)):
+                frequencies[term] = frequencies.get(term, 0.0) + weight
+        return frequencies
+
+    def add(self, doc_id, record: Dict[str, Optional[str]], payload: Any = None) -> None:
+        """Index (or re-index) a document from its text fields"""
+        frequencies = self._weighted_terms(record)
+        with self._lock:
+            self._remove(doc_id)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._vocabulary = None
+                postings[doc_id] = frequency
+            for prefix in _prefixes(frequencies):
+                self._prefix_docs.setdefault(prefix, set()).add(doc_id)
+            length = sum(frequencies.values())
+            self._doc_terms[doc_id] = set(frequencies)
+            self._doc_lengths[doc_id] = length
+            self._payloads[doc_id] = payload
+            self._total_length += length
+
+    def remove(self, doc_id) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary = None
+        for prefix in _prefixes(terms):
+            docs = self._prefix_docs[prefix]
+            docs.discard(doc_id)
+            if not docs:
+                del self._prefix_docs[prefix]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        del self._payloads[doc_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._postings = {}
+            self._doc_terms = {}
+            self._prefix_docs = {}
+            self._doc_lengths = {}
+            self._payloads = {}
+            self._total_length = 0.0
+            self._vocabulary = None
+
+    def get(self, doc_id) -> Any:
+        return self._payloads.get(doc_id)
+
+    def payloads(self) -> List[Any]:
+        with self._lock:
+            return list(self._payloads.values())
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with ``prefix``, in sorted order"""
+        with self._lock:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            vocabulary = self._vocabulary
+        terms = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            terms.append(vocabulary[position])
+            position += 1
+        return terms
+
+    def _prefix_matches(self, query_term: str, candidates: Optional[KeysView]) -> Set[Any]:
+        """Documents with a term starting with ``query_term`` (within ``candidates``, when given)"""
+        docs = self._prefix_docs.get(query_term[:PREFIX_SET_CHARS], set())
+        if candidates is not None:
+            docs = candidates & docs
+        if len(query_term) > PREFIX_SET_CHARS:
+            # The set is keyed by a shorter prefix; confirm against the document's own terms
+            docs = {doc_id for doc_id in docs if any(term.startswith(query_term) for term in self._doc_terms[doc_id])}
+        return docs
+
+    def matched_terms(self, query: Optional[str]) -> Set[str]:
+        """Indexed terms that the words of ``query`` match (for highlighting)"""
+        terms: Set[str] = set()
+        for query_term in _query_terms(query):
+            terms.update(self.expand(query_term))
+        return terms
+
+    def search(
+        self,
+        query: str,
+        accept: Optional[Callable[[Any], bool]] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Rank documents matching every word of ``query`` (as a prefix).
+
+        ``accept`` filters the matches by payload. Returns (doc_id, score)
+        pairs, best first.
+        """
+        terms = _query_terms(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            doc_count = len(self._payloads)
+            if not doc_count:
+                return []
+            average_length = self._total_length / doc_count or 1.0
+
+            # The most selective words go first, so later words only look at
+            # the documents that are still in the running
+            terms.sort(key=lambda term: len(self._prefix_docs.get(term[:PREFIX_SET_CHARS], ())))
+
+            scores: Optional[Dict[Any, float]] = None
+            for query_term in terms:
+                term_scores: Dict[Any, float] = {}
+                expansions = self.expand(query_term)
+                scored = set(heapq.nsmallest(
+                    MAX_SCORED_EXPANSIONS, expansions, key=lambda term: len(self._postings[term])
+                ))
+                if query_term in self._postings:
+                    scored.add(query_term)
+                for term in scored:
+                    postings = self._postings[term]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    factor = 1.0 if term == query_term else PREFIX_MATCH_FACTOR
+                    doc_ids = postings if scores is None else postings.keys() & scores.keys()
+                    for doc_id in doc_ids:
+                        frequency = postings[doc_id]
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                        score = factor * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                        if score > term_scores.get(doc_id, 0.0):
+                            term_scores[doc_id] = score
+                if len(scored) < len(expansions):
+                    matches = self._prefix_matches(query_term, scores.keys() if scores is not None else None)
+                    term_scores = {**dict.fromkeys(matches, 0.0), **term_scores}
+
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()}
+                if not scores:
+                    return []
+
+            if accept is not None:
+                scores = {doc_id: score for doc_id, score in scores.items() if accept(self._payloads[doc_id])}
+
+        # Ties are broken by ID so that the order is stable (and cursor-pageable)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0])))
+        return ranked[:limit] if limit is not None else ranked
+
+    def stats(self) -> Dict:
+        return {
+            "documents": len(self._payloads),
+            "terms": len(self._postings),
+        }
+
+
+def _normalize_name(name: Optional[str]) -> str:
+    return _SPACES.sub(" ", (name or "").strip().lower())
+
+
+class SuggestIndex:
+    """Names in a sorted array keyed by each word start, for prefix completion"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys: List[Tuple[str, str, str]] = []
+        # (kind, id) -> (display name, normalized name)
+        self._names: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _entry_keys(kind: str, doc_id: str, name: str) -> List[Tuple[str, str, str]]:
+        normalized = _normalize_name(name)
+        return [(normalized[match.start():], kind, doc_id) for match in _WORD_START.finditer(normalized)]
+
+    def put(self, kind: str, doc_id, name: Optional[str]) -> None:
+        doc_id = str(doc_id)
+        with self._lock:
+            self._remove(kind, doc_id)
+            if not name:
+                return
+            for key in self._entry_keys(kind, doc_id, name):
+                insort(self._keys, key)
+            self._names[(kind, doc_id)] = (name, _normalize_name(name))
+
+    def remove(self, kind: str, doc_id) -> None:
+        with self._lock:
+            self._remove(kind, str(doc_id))
+
+    def _remove(self, kind: str, doc_id: str) -> None:
+        entry = self._names.pop((kind, doc_id), None)
+        if entry is None:
+            return
+        for key in self._entry_keys(kind, doc_id, entry[0]):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def load(self, entries: Iterable[Tuple[str, Any, Optional[str]]]) -> None:
+        """Replace the contents with (kind, id, name) entries in one sort"""
+        keys = []
+        names = {}
+        for kind, doc_id, name in entries:
+            if not name:
+                continue
+            doc_id = str(doc_id)
+            keys.extend(self._entry_keys(kind, doc_id, name))
+            names[(kind, doc_id)] = (name, _normalize_name(name))
+        keys.sort()
+        with self._lock:
+            self._keys, self._names = keys, names
+
+    def suggest(self, prefix: str, limit: int = 10, kinds: Optional[Iterable[str]] = None) -> List[Dict[str, str]]:
+        """
+        Names with a word starting with ``prefix``.
+
+        Names that start with the prefix come first, then shorter names.
+        """
+        prefix = _normalize_name(prefix)
+        if not prefix:
+            return []
+        kinds = set(kinds) if kinds else None
+
+        best: Dict[Tuple[str, str], tuple] = {}
+        with self._lock:
+            keys, names = self._keys, self._names
+            position = bisect_left(keys, (prefix,))
+            end = min(len(keys), position + MAX_SUGGEST_SCAN)
+            while position < end:
+                key, kind, doc_id = keys[position]
+                if not key.startswith(prefix):
+                    break
+                position += 1
+                if kinds is not None and kind not in kinds:
+                    continue
+                name, normalized = names[(kind, doc_id)]
+                rank = (0 if key == normalized else 1, len(normalized), normalized)
+                if rank < best.get((kind, doc_id), (2,)):
+                    best[(kind, doc_id)] = rank
+
+        ranked = sorted(best.items(), key=lambda item: item[1])[:limit]
+        return [{"type": kind, "id": doc_id, "name": names[(kind, doc_id)][0]} for (kind, doc_id), _ in ranked]
+
+    def stats(self) -> Dict:
+        return {"names": len(self._names), "keys": len(self._keys)}
+
+
+def _record(model, fields: Iterable[str]) -> Dict[str, Optional[str]]:
+    return {field: getattr(model, field) for field in fields}
+
+
+class CatalogIndex:
+    """Offering and activity search indexes with TTL reload and write-through updates"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self.offerings = SearchIndex(OFFERING_FIELDS)
+        self.activities = SearchIndex(ACTIVITY_FIELDS)
+        self.suggestions = SuggestIndex()
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self.reloads = 0
+        self.searches = 0
+        self.suggests = 0
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if self.ttl_seconds <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    def ensure_loaded(self, db: Session) -> "CatalogIndex":
+        """Load (or reload, once stale) both indexes from the database"""
+        if self._is_fresh():
+            return self
+        with self._lock:
+            if not self._is_fresh():
+                self.load(db)
+        return self
+
+    def load(self, db: Session) -> None:
+        offerings = db.query(Offering).all()
+        activities = db.query(Activity).all()
+
+        offering_index = SearchIndex(OFFERING_FIELDS)
+        for offering in offerings:
+            offering_index.add(offering.offering_id, _record(offering, OFFERING_FIELDS), OfferingSchema.model_validate(offering))
+        activity_index = SearchIndex(ACTIVITY_FIELDS)
+        for activity in activities:
+            activity_index.add(activity.activity_id, _record(activity, ACTIVITY_FIELDS), ActivitySchema.model_validate(activity))
+
+        suggestions = SuggestIndex()
+        suggestions.load(
+            [("offering", offering.offering_id, offering.offering_name) for offering in offerings]
+            + [("activity", activity.activity_id, activity.activity_name) for activity in activities]
+            + [("product", product_id, name) for product_id, name in db.query(Product.product_id, Product.product_name).all()]
+            + [("brand", brand_id, name) for brand_id, name in db.query(Brand.brand_id, Brand.brand_name).all()]
+        )
+
+        # Swap in fully built indexes so concurrent searches never see a partial load
+        self.offerings, self.activities, self.suggestions = offering_index, activity_index, suggestions
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+    def put_offering(self, offering: Offering) -> None:
+        if self._loaded_at is None:
+            return
+        self.offerings.add(offering.offering_id, _record(offering, OFFERING_FIELDS), OfferingSchema.model_validate(offering))
+        self.suggestions.put("offering", offering.offering_id, offering.offering_name)
+
+    def remove_offering(self, offering_id) -> None:
+        self.offerings.remove(_as_uuid(offering_id))
+        self.suggestions.remove("offering", offering_id)
+
+    def put_activity(self, activity: Activity) -> None:
+        if self._loaded_at is None:
+            return
+        self.activities.add(activity.activity_id, _record(activity, ACTIVITY_FIELDS), ActivitySchema.model_validate(activity))
+        self.suggestions.put("activity", activity.activity_id, activity.activity_name)
+
+    def remove_activity(self, activity_id) -> None:
+        self.activities.remove(_as_uuid(activity_id))
+        self.suggestions.remove("activity", activity_id)
+
+    def put_product(self, product: Product) -> None:
+        if self._loaded_at is None:
+            return
+        self.suggestions.put("product", product.product_id, product.product_name)
+
+    def put_brand(self, brand: Brand) -> None:
+        if self._loaded_at is None:
+            return
+        self.suggestions.put("brand", brand.brand_id, brand.brand_name)
+
+    def remove_product(self, product_id, offering_ids: Iterable = ()) -> None:
+        """Drop a product and the offerings its delete cascaded to"""
+        for offering_id in offering_ids:
+            self.remove_offering(offering_id)
+        self.suggestions.remove("product", product_id)
+
+    def remove_brand(self, brand_id, product_ids: Iterable = (), offering_ids: Iterable = ()) -> None:
+        """Drop a brand and the products and offerings its delete cascaded to"""
+        for offering_id in offering_ids:
+            self.remove_offering(offering_id)
+        for product_id in product_ids:
+            self.suggestions.remove("product", product_id)
+        self.suggestions.remove("brand", brand_id)
+
+    def suggest(
+        self,
+        db: Session,
+        prefix: str,
+        limit: int = 10,
+        kinds: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, str]]:
+        """Top name completions for ``prefix`` across the catalog"""
+        self.ensure_loaded(db)
+        self.suggests += 1
+        return self.suggestions.suggest(prefix, limit=limit, kinds=kinds)
+
+    def ranked_offerings(self, db: Session, query: Optional[str] = None) -> List[Tuple[OfferingSchema, Optional[float]]]:
+        """
+        (offering, score) pairs matching ``query``, best first.
+
+        Without searchable words in ``query`` the score is None and offerings
+        are ordered by name.
+        """
+        self.ensure_loaded(db)
+        self.searches += 1
+
+        index = self.offerings
+        if query and tokenize(query):
+            return [(index.get(doc_id), score) for doc_id, score in index.search(query)]
+
+        matches = index.payloads()
+        if query:
+            # No word characters to look up; match the raw text like the ILIKE search did
+            needle = query.lower()
+            matches = [
+                offering for offering in matches
+                if any(needle in (value or "").lower() for value in (
+                    offering.offering_name, offering.offering_summary, offering.tag_line
+                ))
+            ]
+        # Same order as app.crud.offering.name_sort_key
+        matches = sorted(matches, key=lambda offering: (offering.offering_name.lower(), str(offering.offering_id)))
+        return [(offering, None) for offering in matches]
+
+    def match_offerings(self, db: Session, query: Optional[str] = None) -> List[OfferingSchema]:
+        """Offerings matching ``query``, best first (all offerings by name when there is no query)"""
+        return [offering for offering, _ in self.ranked_offerings(db, query)]
+
+    def ranked_activities(
+        self,
+        db: Session,
+        query: Optional[str] = None,
+        accept: Optional[Callable[[ActivitySchema], bool]] = None
+    ) -> List[Tuple[ActivitySchema, Optional[float]]]:
+        """
+        (activity, score) pairs matching ``query`` and ``accept``, best first.
+
+        Without searchable words in ``query`` the score is None and
+        activities are ordered by name.
+        """
+        self.ensure_loaded(db)
+        self.searches += 1
+
+        index = self.activities
+        if tokenize(query):
+            return [(index.get(doc_id), score) for doc_id, score in index.search(query, accept=accept)]
+
+        activities = [activity for activity in index.payloads() if accept is None or accept(activity)]
+        activities.sort(key=lambda activity: (activity.activity_name.lower(), str(activity.activity_id)))
+        return [(activity, None) for activity in activities]
+
+    def activity_highlights(self, query: Optional[str], activities: Iterable[ActivitySchema]) -> List[Dict[str, str]]:
+        """Highlighted snippets of the long text fields that match ``query``, per activity"""
+        terms = self.activities.matched_terms(query)
+        highlights = []
+        for activity in activities:
+            snippets = {}
+            for field in ACTIVITY_SNIPPET_FIELDS:
+                snippet = highlight(getattr(activity, field), terms)
+                if snippet:
+                    snippets[field] = snippet
+            highlights.append(snippets)
+        return highlights
+
+    def stats(self) -> Dict:
+        return {
+            "loaded": self._loaded_at is not None,
+            "offerings": self.offerings.stats(),
+            "activities": self.activities.stats(),
+            "suggestions": self.suggestions.stats(),
+            "searches": self.searches,
+            "suggests": self.suggests,
+            "reloads": self.reloads,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+catalog_index = CatalogIndex(ttl_seconds=settings.SEARCH_INDEX_TTL_SECONDS)
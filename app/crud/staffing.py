@@ -1,24 +1,67 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.staffing import StaffingDetail
 from app.models.activity import Activity
 from app.models.activity import OfferingActivity
 from app.schemas.staffing import StaffingDetailCreate, StaffingDetailUpdate
-from typing import List, Optional
+from app.crud import pricing_rollup
+from app.crud.pagination import PageRequest, SortOrder, paginate
+from typing import List, Optional, Tuple
+from uuid import UUID
 import uuid
 
 
-def get_all_staffing(db: Session) -> List[StaffingDetail]:
-    """Get all staffing details"""
-    return db.query(StaffingDetail).all()
+STAFFING_SORTS = (
+    SortOrder("id", (StaffingDetail.staffing_id,)),
+)
 
 
-def get_staffing_by_offering(db: Session, offering_id: str) -> List[StaffingDetail]:
-    """Get all staffing details for a specific offering"""
-    return (
+def get_all_staffing(db: Session, page: Optional[PageRequest] = None):
+    """Get all staffing details (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(StaffingDetail), STAFFING_SORTS, page)
+
+
+def get_staffing_by_offering(db: Session, offering_id: str, page: Optional[PageRequest] = None):
+    """Get all staffing details for a specific offering (a ``Page`` of them when ``page`` is given)"""
+    return paginate(
+        db,
         db.query(StaffingDetail)
         .join(Activity, StaffingDetail.activity_id == Activity.activity_id)
         .join(OfferingActivity, OfferingActivity.activity_id == Activity.activity_id)
+        .filter(OfferingActivity.offering_id == offering_id),
+        STAFFING_SORTS,
+        page
+    )
+
+
+def get_staffing_by_offerings(
+    db: Session,
+    offering_ids: List[UUID]
+) -> List[Tuple[UUID, StaffingDetail]]:
+    """Get staffing details for several offerings in one query, paired with their offering ID"""
+    if not offering_ids:
+        return []
+    return (
+        db.query(OfferingActivity.offering_id, StaffingDetail)
+        .join(StaffingDetail, StaffingDetail.activity_id == OfferingActivity.activity_id)
+        .filter(OfferingActivity.offering_id.in_(offering_ids))
+        .all()
+    )
+
+
+def get_staffing_hours_by_key(db: Session, offering_id: str) -> List[Tuple[str, str, int, int, int]]:
+    """Get an offering's staffing hours grouped by (country, role, band), with the row count per key"""
+    return (
+        db.query(
+            StaffingDetail.country,
+            StaffingDetail.role,
+            StaffingDetail.band,
+            func.coalesce(func.sum(StaffingDetail.hours), 0),
+            func.count(StaffingDetail.staffing_id)
+        )
+        .join(OfferingActivity, OfferingActivity.activity_id == StaffingDetail.activity_id)
         .filter(OfferingActivity.offering_id == offering_id)
+        .group_by(StaffingDetail.country, StaffingDetail.role, StaffingDetail.band)
         .all()
     )
 
@@ -28,9 +71,9 @@ def get_staffing_by_id(db: Session, staffing_id: str) -> Optional[StaffingDetail
     return db.query(StaffingDetail).filter(StaffingDetail.staffing_id == staffing_id).first()
 
 
-def get_staffing_by_activity(db: Session, activity_id: str) -> List[StaffingDetail]:
-    """Get all staffing details for a specific activity"""
-    return db.query(StaffingDetail).filter(StaffingDetail.activity_id == activity_id).all()
+def get_staffing_by_activity(db: Session, activity_id: str, page: Optional[PageRequest] = None):
+    """Get all staffing details for a specific activity (a ``Page`` of them when ``page`` is given)"""
+    return paginate(db, db.query(StaffingDetail).filter(StaffingDetail.activity_id == activity_id), STAFFING_SORTS, page)
 
 
 def create_staffing_detail(db: Session, staffing: StaffingDetailCreate) -> StaffingDetail:
@@ -44,6 +87,8 @@ def create_staffing_detail(db: Session, staffing: StaffingDetailCreate) -> Staff
         hours=staffing.hours
     )
     db.add(db_staffing)
+    db.flush()
+    pricing_rollup.refresh_activities(db, [db_staffing.activity_id])
     db.commit()
     db.refresh(db_staffing)
     return db_staffing
@@ -62,10 +107,13 @@ def update_staffing_detail(
     if not db_staffing:
         return None
     
+    previous_activity_id = db_staffing.activity_id
     update_data = staffing.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_staffing, field, value)
     
+    db.flush()
+    pricing_rollup.refresh_activities(db, [previous_activity_id, db_staffing.activity_id])
     db.commit()
     db.refresh(db_staffing)
     return db_staffing
@@ -80,6 +128,9 @@ def delete_staffing_detail(db: Session, staffing_id: str) -> bool:
     if not db_staffing:
         return False
     
+    activity_id = db_staffing.activity_id
     db.delete(db_staffing)
+    db.flush()
+    pricing_rollup.refresh_activities(db, [activity_id])
     db.commit()
     return True
\ No newline at end of file
@@ -4,6 +4,12 @@ from uuid import UUID
 from app.models.wbs import WBS
 from app.models.activity_wbs import ActivityWBS
 from app.schemas.wbs import WBSCreate, WBSUpdate
+from app.crud.pagination import PageRequest, SortOrder, paginate
+
+
+WBS_SORTS = (
+    SortOrder("id", (WBS.wbs_id,)),
+)
 
 
 def create_wbs(db: Session, wbs: WBSCreate) -> WBS:
@@ -18,8 +24,10 @@ def get_wbs(db: Session, wbs_id: UUID) -> Optional[WBS]:
     return db.query(WBS).filter(WBS.wbs_id == wbs_id).first()
 
 
-def get_all_wbs(db: Session, skip: int = 0, limit: int = 100) -> List[WBS]:
-    return db.query(WBS).offset(skip).limit(limit).all()
+def get_all_wbs(db: Session, skip: int = 0, limit: int = 100, page: Optional[PageRequest] = None):
+    if page is None:
+        return paginate(db, db.query(WBS), WBS_SORTS, PageRequest(limit=limit, offset=skip)).items
+    return paginate(db, db.query(WBS), WBS_SORTS, page)
 
 
 def update_wbs(db: Session, wbs_id: UUID, wbs_update: WBSUpdate) -> Optional[WBS]:
@@ -62,7 +70,7 @@ def remove_wbs_from_activity(db: Session, activity_id: UUID, wbs_id: UUID) -> bo
     return False
 
 
-def get_wbs_for_activity(db: Session, activity_id: UUID) -> List[WBS]:
-    return db.query(WBS).join(ActivityWBS).filter(
+def get_wbs_for_activity(db: Session, activity_id: UUID, page: Optional[PageRequest] = None):
+    return paginate(db, db.query(WBS).join(ActivityWBS).filter(
         ActivityWBS.activity_id == activity_id
-    ).all()
\ No newline at end of file
+    ), WBS_SORTS, page)
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+In-process background jobs.
+
+Long-running admin work is handed to a small thread pool, so the request
+that starts it can return immediately. Each job runs with its own database
+session in the worker process that accepted the request.
+
+Every state change is also written to the ``background_jobs`` table, so any
+worker can answer a status poll. Jobs are listed from that table too
+(newest BACKGROUND_JOB_HISTORY), and rows older than
+BACKGROUND_JOB_RETENTION_DAYS are pruned. A job whose worker stopped while
+it ran stays "running" in the table.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+from fastapi.encoders import jsonable_encoder
+from app.config import settings
+from app.models.background_job import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    submitted_on: datetime = field(default_factory=datetime.utcnow)
+    started_on: Optional[datetime] = None
+    finished_on: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "submitted_on": self.submitted_on,
+            "started_on": self.started_on,
+            "finished_on": self.finished_on,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+    def to_row(self) -> BackgroundJob:
+        return BackgroundJob(
+            job_id=uuid.UUID(self.job_id),
+            kind=self.kind,
+            status=self.status,
+            params=jsonable_encoder(self.params),
+            result=jsonable_encoder(self.result),
+            error=self.error,
+            submitted_on=self.submitted_on,
+            started_on=self.started_on,
+            finished_on=self.finished_on,
+        )
+
+    @classmethod
+    def from_row(cls, row: BackgroundJob) -> "Job":
+        return cls(
+            job_id=str(row.job_id),
+            kind=row.kind,
+            params=row.params or {},
+            status=row.status,
+            submitted_on=row.submitted_on,
+            started_on=row.started_on,
+            finished_on=row.finished_on,
+            result=row.result,
+            error=row.error,
+        )
+
+
+class JobRegistry:
+    """Thread pool plus a bounded, in-memory record of submitted jobs"""
+
+    def __init__(self, max_workers: int, history: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._history = history
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, kind: str, func: Callable, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Queue ``func(db)``; it runs with a fresh session and its return value becomes the job result"""
+        job = Job(job_id=str(uuid.uuid4()), kind=kind, params=params or {})
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self._history:
+                self._jobs.popitem(last=False)
+        self._save(job, prune=True)
+        self._executor.submit(self._run, job, func)
+        logger.info(f"Queued {kind} job {job.job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job of this worker, or of any worker from the background_jobs table"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            key = uuid.UUID(job_id)
+        except ValueError:
+            return None
+
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            row = db.get(BackgroundJob, key)
+            return Job.from_row(row) if row is not None else None
+        finally:
+            db.close()
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """The most recent jobs of every worker, newest first"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            query = db.query(BackgroundJob)
+            if kind is not None:
+                query = query.filter(BackgroundJob.kind == kind)
+            rows = query.order_by(BackgroundJob.submitted_on.desc()).limit(self._history).all()
+            return [Job.from_row(row) for row in rows]
+        finally:
+            db.close()
+
+    def _save(self, job: Job, prune: bool = False) -> None:
+        """Write the job's state to the background_jobs table; failures only cost cross-worker visibility"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.merge(job.to_row())
+            if prune:
+                cutoff = datetime.utcnow() - timedelta(days=settings.BACKGROUND_JOB_RETENTION_DAYS)
+                db.query(BackgroundJob).filter(BackgroundJob.submitted_on < cutoff).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not record {job.kind} job {job.job_id}: {e}")
+        finally:
+            db.close()
+
+    def _run(self, job: Job, func: Callable) -> None:
+        from app.database import SessionLocal
+
+        job.status = "running"
+        job.started_on = datetime.utcnow()
+        self._save(job)
+        db = SessionLocal()
+        try:
+            job.result = func(db)
+            job.status = "succeeded"
+            logger.info(f"{job.kind} job {job.job_id} succeeded")
+        except Exception as e:
+            db.rollback()
+            job.error = str(e)
+            job.status = "failed"
+            logger.error(f"{job.kind} job {job.job_id} failed: {e}", exc_info=True)
+        finally:
+            db.close()
+            job.finished_on = datetime.utcnow()
+            self._save(job)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+jobs = JobRegistry(max_workers=settings.BACKGROUND_JOB_WORKERS, history=settings.BACKGROUND_JOB_HISTORY)
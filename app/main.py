@@ -4,6 +4,11 @@ from starlette.middleware.sessions import SessionMiddleware
 from authlib.integrations.starlette_client import OAuth
 from app.config import settings
 from app.api.v1.api import api_router
+from app.jobs import jobs
+from app.database import SessionLocal
+from app.crud.search_index import catalog_index
+from app import bluegroups_auth
+from app.auth.ibm_auth import ibm_auth
 import logging
 import os
 from fastapi.responses import FileResponse
@@ -47,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Estimate", "X-Repricing-Job-Id"],
 )
 
 # ----------------------------------------------------------------------
@@ -82,6 +88,23 @@ async def startup_event():
     logger.info(f"Frontend URL: {FRONTEND_ORIGIN}")
     logger.info("=" * 70)
 
+    if settings.SEARCH_INDEX_ENABLED:
+        db = SessionLocal()
+        try:
+            catalog_index.ensure_loaded(db)
+            logger.info(f"Search index loaded: {catalog_index.stats()}")
+        except Exception as e:
+            # Searches load the index lazily if this fails
+            logger.error(f"Failed to load search index at startup: {e}")
+        finally:
+            db.close()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    jobs.shutdown()
+    await bluegroups_auth.close_http_client()
+    await ibm_auth.close()
+
 @app.get("/")
 async def index():
     return {"message": f"{settings.PROJECT_NAME} running"}
@@ -4,9 +4,12 @@ from app.models.product import Product
 from app.models.offering import Offering
 from app.models.activity import Activity, OfferingActivity
 from app.models.staffing import StaffingDetail
-from app.models.pricing import PricingDetail
+from app.models.pricing import PricingDetail, RateCardVersion, RateCardVersionEntry
 from app.models.wbs import WBS
 from app.models.activity_wbs import ActivityWBS
+from app.models.pricing_rollup import ActivityPriceRollup, OfferingPriceRollup
+from app.models.offering_similarity import OfferingSimilarity
+from app.models.background_job import BackgroundJob
 
 __all__ = [
     "Country",
@@ -16,7 +19,13 @@ __all__ = [
     "Activity",
     "OfferingActivity",
     "StaffingDetail",
-    "PricingDetail"
+    "PricingDetail",
+    "RateCardVersion",
+    "RateCardVersionEntry",
     "WBS",
     "ActivityWBS",
+    "ActivityPriceRollup",
+    "OfferingPriceRollup",
+    "OfferingSimilarity",
+    "BackgroundJob",
 ]
\ No newline at end of file
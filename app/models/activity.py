@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, String, Text, Integer, Boolean, DECIMAL, TIMESTAMP
+from sqlalchemy import Column, ForeignKey, Index, String, Text, Integer, Boolean, DECIMAL, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,6 +8,10 @@ import uuid
 
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Keyset pagination by name (see app/crud/pagination.py)
+        Index('ix_activities_name', 'activity_name', 'activity_id'),
+    )
     
     activity_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     activity_name = Column(String(255), nullable=False)
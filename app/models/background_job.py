@@ -0,0 +1,22 @@
+from sqlalchemy import JSON, Column, Index, String, Text, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class BackgroundJob(Base):
+    """Status and result of a background job, shared by every worker process (see app/jobs.py)"""
+    __tablename__ = "background_jobs"
+    __table_args__ = (
+        Index('ix_background_jobs_submitted_on', 'submitted_on'),
+        Index('ix_background_jobs_kind_submitted_on', 'kind', 'submitted_on'),
+    )
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True)
+    kind = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)
+    params = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+    submitted_on = Column(TIMESTAMP, nullable=False)
+    started_on = Column(TIMESTAMP)
+    finished_on = Column(TIMESTAMP)
@@ -1,4 +1,4 @@
-from sqlalchemy import DECIMAL, Column, String, Text, ForeignKey, TIMESTAMP
+from sqlalchemy import DECIMAL, Column, String, Text, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,6 +8,11 @@ import uuid
 
 class Offering(Base):
     __tablename__ = "offerings"
+    __table_args__ = (
+        # Keyset pagination by name (see app/crud/pagination.py)
+        Index('ix_offerings_name', 'offering_name', 'offering_id'),
+        Index('ix_offerings_product_name', 'product_id', 'offering_name', 'offering_id'),
+    )
 
     offering_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.product_id", ondelete="CASCADE"), nullable=False)
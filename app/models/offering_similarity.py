@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class OfferingSimilarity(Base):
+    """Precomputed nearest neighbours of an offering by TF-IDF cosine similarity"""
+    __tablename__ = "offering_similarities"
+    __table_args__ = (
+        # "Similar offerings" is a single range scan: WHERE offering_id = ? ORDER BY rank
+        Index('ix_offering_similarities_rank', 'offering_id', 'rank'),
+    )
+
+    offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), primary_key=True)
+    similar_offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    updated_on = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Integer, DECIMAL, UniqueConstraint
+from sqlalchemy import Column, String, Integer, DECIMAL, Date, ForeignKey, TIMESTAMP, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
 
 
@@ -12,4 +14,39 @@ class PricingDetail(Base):
     role = Column(String(100), primary_key=True)
     band = Column(Integer, primary_key=True)
     cost = Column(DECIMAL(12, 2))
-    sale_price = Column(DECIMAL(12, 2))
\ No newline at end of file
+    sale_price = Column(DECIMAL(12, 2))
+
+
+class RateCardVersion(Base):
+    """Immutable snapshot of the pricing_details rate card, effective from a given date"""
+    __tablename__ = "rate_card_versions"
+
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    effective_date = Column(Date, nullable=False, index=True)
+    note = Column(String(255))
+    created_by = Column(String(255))
+    created_on = Column(TIMESTAMP, server_default=func.now())
+
+    # Relationships
+    entries = relationship(
+        "RateCardVersionEntry",
+        back_populates="rate_card_version",
+        order_by="(RateCardVersionEntry.country, RateCardVersionEntry.role, RateCardVersionEntry.band)",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+
+class RateCardVersionEntry(Base):
+    """One (country, role, band) rate as it was in a rate card version"""
+    __tablename__ = "rate_card_version_entries"
+
+    version = Column(Integer, ForeignKey("rate_card_versions.version", ondelete="CASCADE"), primary_key=True)
+    country = Column(String(50), primary_key=True)
+    role = Column(String(100), primary_key=True)
+    band = Column(Integer, primary_key=True)
+    cost = Column(DECIMAL(12, 2))
+    sale_price = Column(DECIMAL(12, 2))
+
+    # Relationships
+    rate_card_version = relationship("RateCardVersion", back_populates="entries")
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, DECIMAL, TIMESTAMP
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ActivityPriceRollup(Base):
+    """Materialized hours/cost/sale price of an activity's staffing, priced on the current rate card"""
+    __tablename__ = "activity_price_rollups"
+
+    activity_id = Column(UUID(as_uuid=True), ForeignKey("activities.activity_id", ondelete="CASCADE"), primary_key=True)
+    total_hours = Column(Integer, nullable=False, default=0)
+    total_cost = Column(DECIMAL(14, 2), nullable=False, default=0)
+    total_sale_price = Column(DECIMAL(14, 2), nullable=False, default=0)
+    unpriced_rows = Column(Integer, nullable=False, default=0)
+    updated_on = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
+
+
+class OfferingPriceRollup(Base):
+    """Materialized totals of an offering, summed over its linked activities' rollups"""
+    __tablename__ = "offering_price_rollups"
+    __table_args__ = (
+        # Range filters and keyset sorts of the catalog search (see app/crud/offering.py)
+        Index('ix_offering_price_rollups_sale_price', 'total_sale_price', 'offering_id'),
+        Index('ix_offering_price_rollups_hours', 'total_hours', 'offering_id'),
+        Index('ix_offering_price_rollups_activity_count', 'activity_count', 'offering_id'),
+    )
+
+    offering_id = Column(UUID(as_uuid=True), ForeignKey("offerings.offering_id", ondelete="CASCADE"), primary_key=True)
+    total_hours = Column(Integer, nullable=False, default=0)
+    total_cost = Column(DECIMAL(14, 2), nullable=False, default=0)
+    total_sale_price = Column(DECIMAL(14, 2), nullable=False, default=0)
+    unpriced_rows = Column(Integer, nullable=False, default=0)
+    activity_count = Column(Integer, nullable=False, default=0)
+    updated_on = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Integer
+from sqlalchemy import Column, String, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -7,6 +7,10 @@ from app.database import Base
 
 class StaffingDetail(Base):
     __tablename__ = "staffing_details"
+    __table_args__ = (
+        # Reverse lookup from a rate card key to the staffing rows priced by it
+        Index('ix_staffing_details_rate_key', 'country', 'role', 'band'),
+    )
 
     staffing_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     activity_id = Column(UUID(as_uuid=True), ForeignKey("activities.activity_id", ondelete="CASCADE"), nullable=False)
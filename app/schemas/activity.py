@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
@@ -67,6 +67,17 @@ class ActivityWithOfferings(Activity):
     """Activity with list of offerings using it"""
     offerings: List[dict] = []
 
+class ActivitySearchHit(BaseModel):
+    """Activity search result: summary fields plus highlighted snippets of the matching text fields"""
+    activity_id: UUID
+    activity_name: str
+    brand: Optional[str] = None
+    product_name: Optional[str] = None
+    category: Optional[str] = None
+    score: Optional[float] = None
+    # Field name -> snippet with matching words wrapped in <mark>
+    highlights: Dict[str, str] = {}
+
 # Offering-Activity Junction Schemas
 class OfferingActivityBase(BaseModel):
     offering_id: UUID
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
 
@@ -106,4 +106,21 @@ class OfferingSearch(BaseModel):
     saas_type: Optional[str] = None
     industry: Optional[str] = None
     client_type: Optional[str] = None
-    framework_category: Optional[str] = None
\ No newline at end of file
+    framework_category: Optional[str] = None
+
+
+class OfferingSearchResults(BaseModel):
+    """Search results with per-value counts for each filter column"""
+    results: List[Offering]
+    facets: Dict[str, Dict[str, int]]
+
+
+class AttributeValueCount(BaseModel):
+    """A distinct value of an offering attribute and how many offerings have it"""
+    value: str
+    count: int
+
+
+class SimilarOffering(Offering):
+    """An offering with its cosine similarity (0-1) to the offering being viewed"""
+    similarity: float
@@ -1,6 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from datetime import date, datetime
 from decimal import Decimal
+from uuid import UUID
 
 
 class PricingDetailBase(BaseModel):
@@ -27,4 +29,64 @@ class PricingDetailUpdate(BaseModel):
 class PricingDetail(PricingDetailBase):
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class OfferingTotalsBatchRequest(BaseModel):
+    """Offering IDs to price in a single /totalHoursAndPrices/batch call"""
+    offering_ids: List[UUID]
+
+
+class StaffingKeyPattern(BaseModel):
+    """A (country, role, band) pattern; unset fields match any value / are left unchanged"""
+    country: Optional[str] = None
+    role: Optional[str] = None
+    band: Optional[int] = None
+
+
+class StaffingSubstitution(BaseModel):
+    """Move the hours of staffing rows matching ``match`` to the key described by ``replace``"""
+    match: StaffingKeyPattern
+    replace: StaffingKeyPattern
+
+
+class PricingScenario(BaseModel):
+    name: Optional[str] = None
+    substitutions: List[StaffingSubstitution] = []
+
+
+class PricingSimulationRequest(BaseModel):
+    """What-if scenarios to price against an offering's current staffing"""
+    scenarios: List[PricingScenario]
+
+
+class RateKey(BaseModel):
+    country: str
+    role: str
+    band: int
+
+
+class RepricingJobRequest(BaseModel):
+    """Rate card keys whose offerings should be repriced; omit to reprice the whole portfolio"""
+    rate_keys: Optional[List[RateKey]] = None
+
+
+class RateCardVersionCreate(BaseModel):
+    """Snapshot the current rate card as a new version effective from ``effective_date``"""
+    effective_date: date
+    note: Optional[str] = None
+
+
+class RateCardVersion(BaseModel):
+    version: int
+    effective_date: date
+    note: Optional[str] = None
+    created_by: Optional[str] = None
+    created_on: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RateCardVersionDetail(RateCardVersion):
+    entries: List[PricingDetail] = []
@@ -0,0 +1,15 @@
+import os
+
+# app.config.Settings has required fields; give the tests harmless values
+for name, value in {
+    "DATABASE_URL": "sqlite://",
+    "IBM_CLIENT_ID": "test",
+    "IBM_TENANT_ID": "test",
+    "IBM_CLIENT_SECRET": "test",
+    "IBM_OAUTH_SERVER_URL": "http://localhost",
+    "IBM_DISCOVERY_ENDPOINT": "http://localhost",
+    "SESSION_SECRET": "test",
+    "ADMIN_BLUEGROUP": "admins",
+    "SOLUTION_ARCHITECT_BLUEGROUP": "architects",
+}.items():
+    os.environ.setdefault(name, value)
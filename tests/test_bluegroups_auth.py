@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app import bluegroups_auth
+from app.auth import permissions
+from app.auth.permissions import require_admin
+from app.bluegroups_auth import CircuitBreaker, MembershipCache
+
+
+@pytest.fixture
+def tripped_breaker(monkeypatch):
+    """A breaker that is open and due for its half-open probe"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    breaker._opened_at -= 31
+    monkeypatch.setattr(bluegroups_auth, "breaker", breaker)
+    return breaker
+
+
+def test_cancelled_half_open_probe_releases_the_breaker(monkeypatch, tripped_breaker):
+    cache = MembershipCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=10, stale_seconds=0)
+    started = asyncio.Event()
+
+    async def hang(email, group_name):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def cancel_probe():
+        probe = asyncio.create_task(cache.is_member_async("a@ibm.com", "admins"))
+        await started.wait()
+        assert tripped_breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    monkeypatch.setattr(bluegroups_auth, "_lookup_membership_hedged", hang)
+    asyncio.run(cancel_probe())
+
+    # The next caller gets to probe instead of being rejected forever
+    assert tripped_breaker.allow()
+    assert tripped_breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_half_open_probe_that_never_reports_is_replaced(tripped_breaker):
+    assert tripped_breaker.allow()
+    assert not tripped_breaker.allow()
+
+    tripped_breaker._probe_started_at -= 31
+    assert tripped_breaker.allow()
+    tripped_breaker.record_success()
+    assert tripped_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_member_is_denied(monkeypatch):
+    cache = MembershipCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=10, stale_seconds=0)
+    monkeypatch.setattr(bluegroups_auth, "membership_cache", cache)
+    monkeypatch.setattr(bluegroups_auth, "breaker", CircuitBreaker(failure_threshold=5, reset_seconds=30))
+
+    async def lookup(email, group_name):
+        return email == "member@ibm.com"
+
+    monkeypatch.setattr(bluegroups_auth, "_lookup_membership_hedged", lookup)
+    monkeypatch.setattr(bluegroups_auth, "_lookup_membership", lambda email, group_name: email == "member@ibm.com")
+
+    assert bluegroups_auth.is_user_in_group("member@ibm.com", "admins") is True
+    assert bluegroups_auth.is_user_in_group("outsider@ibm.com", "admins") is False
+    assert asyncio.run(bluegroups_auth.is_user_in_group_async("outsider@ibm.com", "architects")) is False
+
+    with pytest.raises(HTTPException) as denied:
+        asyncio.run(require_admin({"email": "outsider@ibm.com"}))
+    assert denied.value.status_code == 403
+    assert asyncio.run(require_admin({"email": "member@ibm.com"}))["email"] == "member@ibm.com"
+
+
+def test_denied_group_gets_short_ttl_and_is_re_resolved(monkeypatch):
+    answers = {permissions.ADMIN_GROUP: False, permissions.SOLUTION_ARCHITECT_GROUP: True}
+    calls = []
+
+    async def resolve(email, group_names):
+        calls.append(email)
+        return {group: answers[group] for group in group_names}
+
+    monkeypatch.setattr(permissions, "resolve_groups", resolve)
+    monkeypatch.setattr(permissions.settings, "BLUEGROUPS_SESSION_TTL_SECONDS", 900)
+    monkeypatch.setattr(permissions.settings, "BLUEGROUPS_NEGATIVE_TTL_SECONDS", 60)
+    now = [1000.0]
+    monkeypatch.setattr(permissions.time, "time", lambda: now[0])
+    user = {"email": "new-admin@ibm.com"}
+
+    with pytest.raises(HTTPException):
+        asyncio.run(require_admin(user))
+    assert user["groups_expires_at"] == 1060.0
+
+    # Still cached inside the short TTL
+    answers[permissions.ADMIN_GROUP] = True
+    now[0] = 1059.0
+    with pytest.raises(HTTPException):
+        asyncio.run(require_admin(user))
+    assert len(calls) == 1
+
+    # Re-resolved once it expires, and the granted answer keeps the full TTL
+    now[0] = 1060.0
+    assert asyncio.run(require_admin(user)) is user
+    assert len(calls) == 2
+    assert user["groups_expires_at"] == 1960.0
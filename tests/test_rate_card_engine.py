@@ -0,0 +1,138 @@
+"""
+Property tests for the integer-cent rate card engine.
+
+``DenseRateCard.price`` must match the Decimal per-row pricing it replaced,
+value for value, on random rate cards and staffing lists.
+"""
+import random
+from collections import namedtuple
+from decimal import Decimal
+
+import pytest
+
+from app.crud.rate_card_engine import DenseRateCard, MISSING, cents_to_float, to_cents
+
+# Shaped like a PricingDetail row (what DenseRateCard is built from)
+RateCardEntry = namedtuple("RateCardEntry", "country role band cost sale_price")
+
+SEED = 20251201
+ITERATIONS = 500
+
+COUNTRIES = ("US", "India", "Germany", "Brazil")
+ROLES = ("Architect", "Developer", "Project Manager")
+BANDS = (5, 6, 7, 8, 9)
+# Rates whose binary float form sits just off the half cent, plus extremes
+TRICKY_RATES = ("0.01", "0.05", "0.15", "0.29", "1.15", "2.67", "2.68", "999.99", "9999999999.99")
+
+
+def _random_rate(rng: random.Random):
+    """A DECIMAL(12, 2) rate, or None (a NULL column)"""
+    choice = rng.random()
+    if choice < 0.15:
+        return None
+    if choice < 0.35:
+        return Decimal(rng.choice(TRICKY_RATES))
+    return Decimal(rng.randint(0, 5_000_000)).scaleb(-2)
+
+
+def _random_card(rng: random.Random):
+    entries = {}
+    for _ in range(rng.randint(0, 40)):
+        key = (rng.choice(COUNTRIES), rng.choice(ROLES), rng.choice(BANDS))
+        entries[key] = RateCardEntry(*key, cost=_random_rate(rng), sale_price=_random_rate(rng))
+    return entries
+
+
+def _random_staffing(rng: random.Random):
+    keys, hours = [], []
+    for _ in range(rng.randint(0, 60)):
+        # Includes keys with no rate: unknown countries/roles/bands and gaps in the card
+        keys.append((rng.choice(COUNTRIES + ("Atlantis",)), rng.choice(ROLES + ("Intern",)), rng.choice(BANDS + (1,))))
+        hours.append(rng.choice((None, 0, 1, rng.randint(0, 2000))))
+    return keys, hours
+
+
+def _decimal_reference(entries, keys, hours):
+    """The Decimal per-row pricing the engine replaced"""
+    rows = []
+    total_hours, total_cost, total_sale = 0, Decimal(0), Decimal(0)
+    for key, row_hours in zip(keys, hours):
+        row_hours = row_hours or 0
+        total_hours += row_hours
+        entry = entries.get(key)
+        if entry is None:
+            rows.append(None)
+            continue
+        cost = (entry.cost or Decimal(0)) * Decimal(row_hours)
+        sale_price = (entry.sale_price or Decimal(0)) * Decimal(row_hours)
+        total_cost += cost
+        total_sale += sale_price
+        rows.append((
+            float(entry.cost) if entry.cost else 0,
+            float(entry.sale_price) if entry.sale_price else 0,
+            float(cost),
+            float(sale_price),
+        ))
+    return rows, total_hours, float(total_cost), float(total_sale)
+
+
+def test_price_matches_decimal_pricing():
+    rng = random.Random(SEED)
+    for _ in range(ITERATIONS):
+        entries = _random_card(rng)
+        keys, hours = _random_staffing(rng)
+        expected_rows, total_hours, total_cost, total_sale = _decimal_reference(entries, keys, hours)
+
+        priced = DenseRateCard(entries.values()).price(keys, hours)
+
+        assert priced.total_hours == total_hours
+        assert cents_to_float(priced.total_cost_cents) == total_cost
+        assert cents_to_float(priced.total_sale_cents) == total_sale
+        for position, expected in enumerate(expected_rows):
+            assert priced.is_priced(position) == (expected is not None)
+            if expected is None:
+                assert priced.line_cost_cents[position] == 0
+                assert priced.line_sale_cents[position] == 0
+                continue
+            assert (
+                cents_to_float(priced.cost_cents[position]),
+                cents_to_float(priced.sale_cents[position]),
+                cents_to_float(priced.line_cost_cents[position]),
+                cents_to_float(priced.line_sale_cents[position]),
+            ) == expected
+
+
+def test_empty_card_prices_nothing():
+    priced = DenseRateCard([]).price([("US", "Architect", 7)], [10])
+    assert priced.indexes == [MISSING]
+    assert priced.total_hours == 10
+    assert priced.total_cost_cents == priced.total_sale_cents == 0
+
+
+def test_null_rates_and_hours_price_as_zero():
+    card = DenseRateCard([RateCardEntry("US", "Architect", 7, cost=None, sale_price=Decimal("150.33"))])
+    priced = card.price([("US", "Architect", 7), ("US", "Architect", 7)], [None, 4])
+    assert priced.is_priced(0) and priced.is_priced(1)
+    assert priced.hours == [0, 4]
+    assert priced.total_cost_cents == 0
+    assert priced.total_sale_cents == 60132
+
+
+def test_cents_to_float_rounds_like_decimal_at_half_cent_boundaries():
+    rng = random.Random(SEED)
+    candidates = [cents for base in (0, 1, 10**6, 10**12, 2**53) for cents in range(base - 3, base + 4)]
+    candidates += [rng.randint(-(10**15), 10**15) for _ in range(20_000)]
+    for cents in candidates:
+        assert cents_to_float(cents) == float(Decimal(cents) / 100)
+
+
+@pytest.mark.parametrize("value", ["0.005", "1.005", "2.675", "0.001"])
+def test_to_cents_rejects_sub_cent_rates(value):
+    # A rate between two cents must not be silently rounded to either
+    with pytest.raises(ValueError):
+        to_cents(Decimal(value))
+
+
+@pytest.mark.parametrize("value, cents", [(None, 0), ("0", 0), ("0.01", 1), ("150.33", 15033), ("1.50", 150)])
+def test_to_cents(value, cents):
+    assert to_cents(Decimal(value) if value is not None else None) == cents
@@ -0,0 +1,29 @@
+import random
+
+from app.crud import search_index
+from app.crud.search_index import SearchIndex, tokenize
+
+
+def _brute_force(documents, query):
+    words = set(tokenize(query))
+    return {
+        doc_id for doc_id, text in documents.items()
+        if all(any(term.startswith(word) for term in tokenize(text)) for word in words)
+    }
+
+
+def test_unscored_expansions_still_decide_matches(monkeypatch):
+    monkeypatch.setattr(search_index, "MAX_SCORED_EXPANSIONS", 5)
+    rng = random.Random(3)
+    vocabulary = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 7))) for _ in range(400)]
+    index = SearchIndex({"text": 1.0})
+    documents = {}
+    for doc_id in range(300):
+        documents[doc_id] = " ".join(rng.sample(vocabulary, 6))
+        index.add(doc_id, {"text": documents[doc_id]})
+    for doc_id in range(0, 300, 7):
+        index.remove(doc_id)
+        del documents[doc_id]
+
+    for query in ("a", "ab", "abc", "abca", "b a", "cab ab", "abcab c", "a abcabc", "zz"):
+        assert {doc_id for doc_id, _ in index.search(query)} == _brute_force(documents, query), query